@@ -0,0 +1,271 @@
+"""
+Latency and SQL statement counts of the simulated_api hot paths.
+
+Times RestaurantManager.search_restaurants (by text and, when the data has
+coordinates, nearby), reserve_table, _get_available_slots, a week's
+availability calendar, the restaurant listing (first page and a page deep in
+the keyset order) and batches of BATCH_SIZE searches and reservations against
+an existing database, typically one filled by benchmarks.synthetic_data. Each call gets
+its own session, as a request does.
+
+    python -m benchmarks.synthetic_data --database-url sqlite:////tmp/bench.db --reset
+    python -m benchmarks.api_benchmark --database-url sqlite:////tmp/bench.db --json sqlite.json
+    python -m benchmarks.api_benchmark --database-url postgresql://localhost/bench \\
+        --json postgres.json --compare sqlite.json
+
+reserve_table and reserve_tables book real tables, so the database gains a reservation per
+successful call; pass --skip-reserve to leave it untouched. The async
+routers run the same manager through run_sync, so these numbers cover both.
+
+--check-budgets exits with status 1 when an operation issues more statements
+than its query_profiler.STATEMENT_BUDGETS entry, so CI can catch N+1 regressions.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.reporting import (
+    latency_summary, print_comparison, print_latency_table, run_metadata, write_json
+)
+
+# Searches or reservations per call of the batch operations; reserve_tables' statement budget assumes it
+BATCH_SIZE = 10
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="Defaults to DATABASE_URL")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per operation")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed calls per operation first")
+    parser.add_argument("--sample", type=int, default=1000, help="Restaurants sampled for call arguments")
+    parser.add_argument("--days-ahead", type=int, default=30, help="Searches and bookings fall within this window")
+    parser.add_argument("--catalog-index", action="store_true", help="Search through the in-memory catalog index")
+    parser.add_argument("--skip-reserve", action="store_true", help="Do not book tables")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--check-budgets", action="store_true",
+                        help="Exit with status 1 when an operation exceeds its STATEMENT_BUDGETS entry")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--compare", help="Results file of an earlier run to compare against")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Must run before simulated_api is imported, the engines are built at import time"""
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["CATALOG_INDEX_ENABLED"] = "true" if args.catalog_index else "false"
+
+
+def sample_restaurants(db, size: int, rng: random.Random) -> List[Dict]:
+    """Reservoir sample of active restaurants, streamed so large tables fit in memory"""
+    from simulated_api.database.models import Restaurant
+
+    rows = db.query(
+        Restaurant.id, Restaurant.city, Restaurant.locality, Restaurant.cuisine, Restaurant.rating,
+        Restaurant.latitude, Restaurant.longitude
+    ).filter(Restaurant.is_active == True).yield_per(10000)
+
+    sample: List[Dict] = []
+    for seen, row in enumerate(rows):
+        if seen < size:
+            sample.append(row._asdict())
+        else:
+            slot = rng.randrange(seen + 1)
+            if slot < size:
+                sample[slot] = row._asdict()
+    return sample
+
+
+def build_operations(args: argparse.Namespace, sample: List[Dict], rng: random.Random) -> Dict[str, Callable]:
+    """Operation name -> callable taking a session and making one call with fresh arguments"""
+    from simulated_api.app.models.pydantics import AvailabilityRequest, ReservationRequest, RestaurantSearchRequest
+    from simulated_api.app.services.restaurant_manager import RestaurantManager
+    from simulated_api.database.models import Restaurant
+
+    today = date.today()
+    located = [restaurant for restaurant in sample if restaurant["latitude"] is not None]
+
+    def slot() -> Dict:
+        return {
+            "date": (today + timedelta(days=rng.randint(1, args.days_ahead))).isoformat(),
+            "time": f"{rng.randint(12, 21):02d}:00"
+        }
+
+    def search_request() -> RestaurantSearchRequest:
+        restaurant = rng.choice(sample)
+        return RestaurantSearchRequest(
+            city=restaurant["city"], locality=restaurant["locality"], cuisine=restaurant["cuisine"], **slot()
+        )
+
+    def search(db) -> None:
+        RestaurantManager(db).search_restaurants(search_request())
+
+    def search_batch(db) -> None:
+        RestaurantManager(db).search_restaurants_batch([search_request() for _ in range(BATCH_SIZE)])
+
+    def search_nearby(db) -> None:
+        # Nearest restaurants to a point a little way from a sampled one
+        restaurant = rng.choice(located)
+        RestaurantManager(db).search_restaurants(RestaurantSearchRequest(
+            latitude=restaurant["latitude"] + rng.uniform(-0.01, 0.01),
+            longitude=restaurant["longitude"] + rng.uniform(-0.01, 0.01), **slot()
+        ))
+
+    def reservation_request() -> ReservationRequest:
+        return ReservationRequest(
+            restaurant_id=rng.choice(sample)["id"], guests=rng.choice([2, 2, 4, 6]),
+            user_name="Benchmark", user_phone="+919800000000", **slot()
+        )
+
+    def reserve(db) -> None:
+        RestaurantManager(db).reserve_table(reservation_request())
+
+    def reserve_batch(db) -> None:
+        RestaurantManager(db).reserve_tables([reservation_request() for _ in range(BATCH_SIZE)])
+
+    def available_slots(db) -> None:
+        restaurant = db.get(Restaurant, rng.choice(sample)["id"])
+        requested = slot()
+        RestaurantManager(db)._get_available_slots(restaurant, requested["date"], requested["time"], guests=2)
+
+    def availability_calendar(db) -> None:
+        RestaurantManager(db).get_availability_calendar(AvailabilityRequest(
+            restaurant_ids=[rng.choice(sample)["id"]], start_date=today.isoformat(), days=7
+        ))
+
+    def first_page(db) -> None:
+        RestaurantManager(db).get_restaurants_page(limit=20)
+
+    def cursor_page(db) -> None:
+        # A cursor pointing at a random restaurant lands anywhere in the keyset order
+        restaurant = rng.choice(sample)
+        cursor = RestaurantManager.encode_cursor(argparse.Namespace(rating=restaurant["rating"], id=restaurant["id"]))
+        RestaurantManager(db).get_restaurants_page(limit=20, cursor=cursor)
+
+    operations = {
+        "search_restaurants": search,
+        "search_restaurants_batch": search_batch,
+        "_get_available_slots": available_slots,
+        "availability_calendar": availability_calendar,
+        "listing.first_page": first_page,
+        "listing.cursor_page": cursor_page,
+    }
+    if located:
+        operations["search_restaurants.nearby"] = search_nearby
+    if not args.skip_reserve:
+        operations["reserve_table"] = reserve
+        operations["reserve_tables"] = reserve_batch
+    return operations
+
+
+def run_operation(operation: Callable, session_factory, iterations: int, warmup: int) -> Dict:
+    from simulated_api.database.query_profiler import profile_queries
+
+    latencies: List[float] = []
+    statements: List[int] = []
+
+    for iteration in range(warmup + iterations):
+        db = session_factory()
+        try:
+            with profile_queries() as stats:
+                started = time.perf_counter()
+                operation(db)
+                elapsed = time.perf_counter() - started
+        finally:
+            db.close()
+        if iteration >= warmup:
+            latencies.append(elapsed)
+            statements.append(stats.statements)
+
+    return {
+        **latency_summary(latencies),
+        "statements_mean": round(sum(statements) / len(statements), 2) if statements else 0.0,
+        "statements_max": max(statements, default=0)
+    }
+
+
+def table_counts(db) -> Dict[str, int]:
+    from sqlalchemy import func, select
+    from simulated_api.database.models import Reservation, Restaurant, SlotInventory
+
+    return {
+        model.__tablename__: db.scalar(select(func.count()).select_from(model))
+        for model in (Restaurant, Reservation, SlotInventory)
+    }
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not args.database_url:
+        print("Pass --database-url or set DATABASE_URL")
+        return 2
+    configure_environment(args)
+
+    from simulated_api.app.services.catalog_index import catalog_index
+    from simulated_api.database import query_profiler
+    from simulated_api.database.setup import SessionLocal, engine
+
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    try:
+        rows = table_counts(db)
+        sample = sample_restaurants(db, args.sample, rng)
+        catalog_build_seconds: Optional[float] = None
+        if args.catalog_index:
+            started = time.perf_counter()
+            catalog_index.rebuild(db)
+            catalog_build_seconds = round(time.perf_counter() - started, 3)
+    finally:
+        db.close()
+
+    if not sample:
+        print("No active restaurants, fill the database with benchmarks.synthetic_data first")
+        return 2
+
+    print(f"{engine.dialect.name}: " + ", ".join(f"{table} {count:,}" for table, count in rows.items()))
+    query_profiler.install(engine)
+    operations = build_operations(args, sample, rng)
+    results = {
+        **run_metadata(vars(args)),
+        "database": engine.dialect.name,
+        "rows": rows,
+        "catalog_build_seconds": catalog_build_seconds,
+        "operations": {
+            name: run_operation(operation, SessionLocal, args.iterations, args.warmup)
+            for name, operation in operations.items()
+        }
+    }
+
+    print_latency_table(results["operations"])
+    print(f"\n{'':<28}{'statements':>12}{'max':>8}")
+    for name, summary in results["operations"].items():
+        print(f"{name:<28}{summary['statements_mean']:>12.2f}{summary['statements_max']:>8}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} ({baseline.get('database')}, {baseline.get('timestamp')})")
+        print_comparison(results["operations"], baseline.get("operations", {}))
+
+    write_json(args.json, results)
+
+    if args.check_budgets:
+        over_budget = {
+            name: (summary["statements_max"], query_profiler.STATEMENT_BUDGETS[name])
+            for name, summary in results["operations"].items()
+            if summary["statements_max"] > query_profiler.STATEMENT_BUDGETS.get(name, summary["statements_max"])
+        }
+        for name, (statements, budget) in over_budget.items():
+            print(f"{name} issued up to {statements} statements, budget is {budget}")
+        if over_budget:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
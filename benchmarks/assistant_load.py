@@ -0,0 +1,276 @@
+"""
+Offline load test of the assistant pipeline.
+
+Drives concurrent simulated users through Assistant.chat with the OpenAI
+model replaced by a scripted one, chat memory in fakeredis and the tools
+calling an in-process simulated_api on a throwaway SQLite database. Nothing
+leaves the machine.
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.assistant_load --users 20 --turns 5 --llm-latency 0.3
+
+Reports requests/sec, latency percentiles and where each request spent its
+time. --json writes the numbers for comparison between runs, and
+--fail-p95-ms exits non-zero on a regression.
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.reporting import latency_summary, print_latency_table, run_metadata, write_json
+
+
+class StageClock:
+    """
+    Per-request time spent in each pipeline stage.
+
+    Stages nest (the fast path calls the tools), so each stage is charged
+    only its exclusive time and the stages of one request add up to no more
+    than its latency. Whatever is left is agent and framework overhead.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.totals: Dict[str, float] = {}
+
+    def start_request(self) -> None:
+        self._local.stages = {}
+        self._local.stack = []
+
+    def finish_request(self) -> Dict[str, float]:
+        stages = getattr(self._local, "stages", {})
+        with self._lock:
+            for stage, seconds in stages.items():
+                self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+        return stages
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        stack: List[List[float]] = getattr(self._local, "stack", None)
+        if stack is None:
+            yield
+            return
+
+        frame = [time.perf_counter(), 0.0]  # started_at, time spent in nested stages
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            self._local.stages[name] = self._local.stages.get(name, 0.0) + elapsed - frame[1]
+            if stack:
+                stack[-1][1] += elapsed
+
+    def wrap(self, func: Callable, name: str) -> Callable:
+        def timed(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return timed
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument("--turns", type=int, default=5, help="Messages each user sends, one after another")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per scripted LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="Relative +/- jitter on the LLM latency")
+    parser.add_argument("--chat-ratio", type=float, default=0.2, help="Share of messages that are small talk")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds a user waits between messages")
+    parser.add_argument("--fast-path", action="store_true", help="Let the fast path book without the LLM")
+    parser.add_argument("--database-url", help="simulated_api database, a temporary SQLite file by default")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--fail-p95-ms", type=float, help="Exit with status 1 when p95 latency exceeds this")
+    parser.add_argument("--verbose", action="store_true", help="Keep the app's own logging on stdout")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace, workdir: str) -> None:
+    """Must run before the app modules are imported, they read these at import time"""
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'assistant_load.db')}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["TOOL_BACKEND"] = "inprocess"
+    os.environ["FAST_PATH_ENABLED"] = "true" if args.fast_path else "false"
+    os.environ["AGENT_PROMPT_FROM_HUB"] = "false"
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-offline")  # ChatOpenAI is built at import, never called
+
+
+def seed_catalog() -> List[Tuple[str, str, str]]:
+    from simulated_api.database.setup import Base, SessionLocal, engine
+    from simulated_api.app.services.restaurant_manager import RestaurantManager
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        restaurants = RestaurantManager(db).get_all_restaurants() or RestaurantManager(db).populate_sample_restaurants()
+        return sorted({(r.city, r.locality, r.cuisine) for r in restaurants})
+    finally:
+        db.close()
+
+
+def build_conversations(args: argparse.Namespace, catalog: List[Tuple[str, str, str]], scenarios) -> List[List[str]]:
+    """Messages per user, registered with the scripted model"""
+    rng = random.Random(args.seed)
+    today = date.today()
+    conversations = []
+
+    for user in range(args.users):
+        messages = []
+        for turn in range(args.turns):
+            if rng.random() < args.chat_ratio:
+                messages.append(scenarios.add(f"Hi, what can you do? (user {user}, turn {turn})", {"kind": "chat"}))
+                continue
+
+            city, locality, cuisine = rng.choice(catalog)
+            res_date = (today + timedelta(days=rng.randint(1, 30))).isoformat()
+            res_time = f"{rng.randint(12, 21):02d}:00"
+            guests = rng.randint(1, 6)
+            name, phone = f"User{user}", f"+9198{user:08d}"
+            message = (f"Please book a table for {guests} at a {cuisine} restaurant in {locality}, {city} "
+                       f"on {res_date} at {res_time}. Name {name}, phone {phone}. (turn {turn})")
+            messages.append(scenarios.add(message, {
+                "kind": "book",
+                "search": {"city": city, "locality": locality, "cuisine": cuisine, "date": res_date, "time": res_time},
+                "reserve": {"date": res_date, "time": res_time, "guests": guests, "user_name": name, "user_phone": phone}
+            }))
+        conversations.append(messages)
+
+    return conversations
+
+
+def instrument(clock: StageClock) -> None:
+    """Wrap each pipeline stage of the already imported app in the stage clock"""
+    from benchmarks.scripted_model import ScriptedChatModel
+    from services import memory_manager
+    from services.context_budget import ContextAssembler
+    from services.fast_path import FastPathBooker
+    from services.tool_backends import get_tool_backend
+
+    ScriptedChatModel._generate = clock.wrap(ScriptedChatModel._generate, "llm")
+    memory_manager.RedisWindowChatMessageHistory.messages = property(
+        clock.wrap(memory_manager.RedisWindowChatMessageHistory.messages.fget, "memory.load")
+    )
+    memory_manager.RedisWindowChatMessageHistory.add_messages = clock.wrap(
+        memory_manager.RedisWindowChatMessageHistory.add_messages, "memory.save"
+    )
+    ContextAssembler.assemble = clock.wrap(ContextAssembler.assemble, "context")
+    FastPathBooker.try_book = clock.wrap(FastPathBooker.try_book, "fast_path")
+
+    backend = get_tool_backend()
+    backend.search = clock.wrap(backend.search, "tool.search")
+    backend.reserve = clock.wrap(backend.reserve, "tool.reserve")
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="assistant_load_")
+    configure_environment(args, workdir)
+
+    try:
+        import fakeredis
+    except ImportError:
+        print("fakeredis is required: pip install -r benchmarks/requirements.txt")
+        return 2
+
+    from benchmarks.scripted_model import ScenarioBook, ScriptedChatModel
+    from models.assistant_model import ChatPayload
+    from services import assistant as assistant_module
+    from services import memory_manager
+
+    # Chat memory in one in-process fake Redis shared by every user
+    redis_server = fakeredis.FakeServer()
+    memory_manager.get_redis_client = lambda redis_url: fakeredis.FakeRedis(server=redis_server)
+
+    scenarios = ScenarioBook()
+    assistant_module.llm = ScriptedChatModel(scenarios=scenarios, latency=args.llm_latency, jitter=args.llm_jitter)
+    catalog = seed_catalog()
+    conversations = build_conversations(args, catalog, scenarios)
+
+    assistant = assistant_module.Assistant()
+    assistant.agent_executor.verbose = False
+    if assistant.fast_path:
+        # Loaded up front, as a long-running server would have it by the time load arrives
+        assistant.fast_path.load_vocabulary()
+    clock = StageClock()
+    instrument(clock)
+
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    latencies: List[float] = []
+    errors = 0
+    results_lock = threading.Lock()
+
+    def run_user(user: int) -> None:
+        nonlocal errors
+        for message in conversations[user]:
+            clock.start_request()
+            started = time.perf_counter()
+            response = assistant.chat(ChatPayload(id=f"load-user-{user}", query=message))
+            elapsed = time.perf_counter() - started
+            clock.finish_request()
+            with results_lock:
+                latencies.append(elapsed)
+                if response["response"].startswith("Sorry, I encountered an error"):
+                    errors += 1
+            if args.think_time:
+                time.sleep(args.think_time)
+
+    with quiet:
+        # Warm up: tokenizer, tool backend event loop, fast path vocabulary
+        assistant.chat(ChatPayload(id="load-warmup", query=conversations[0][0]))
+        clock.totals.clear()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            list(pool.map(run_user, range(args.users)))
+        wall_seconds = time.perf_counter() - started
+
+    requests = len(latencies)
+    total_latency = sum(latencies)
+    stages = {stage: seconds for stage, seconds in sorted(clock.totals.items())}
+    stages["agent.other"] = max(0.0, total_latency - sum(stages.values()))
+
+    results = {
+        **run_metadata(vars(args)),
+        "requests": requests,
+        "errors": errors,
+        "wall_seconds": round(wall_seconds, 3),
+        "requests_per_second": round(requests / wall_seconds, 3) if wall_seconds else 0.0,
+        "latency": latency_summary(latencies),
+        "stages": {
+            stage: {
+                "mean_ms_per_request": round(seconds / requests * 1000, 3) if requests else 0.0,
+                "share": round(seconds / total_latency, 4) if total_latency else 0.0
+            }
+            for stage, seconds in stages.items()
+        },
+        "fast_path": assistant.fast_path.stats() if assistant.fast_path else None
+    }
+
+    print(f"{requests} requests from {args.users} users in {wall_seconds:.2f} s: "
+          f"{results['requests_per_second']:.2f} req/s, {errors} errors")
+    print_latency_table({"Assistant.chat": results["latency"]})
+    print(f"\n{'stage':<28}{'ms/request':>12}{'share':>10}")
+    for stage, summary in results["stages"].items():
+        print(f"{stage:<28}{summary['mean_ms_per_request']:>12.2f}{summary['share']:>10.1%}")
+    write_json(args.json, results)
+
+    if args.fail_p95_ms is not None and results["latency"]["p95_ms"] > args.fail_p95_ms:
+        print(f"p95 {results['latency']['p95_ms']:.1f} ms is over the {args.fail_p95_ms:.1f} ms limit")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
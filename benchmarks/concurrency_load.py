@@ -0,0 +1,156 @@
+"""
+Throughput of the async simulated_api routes as concurrency grows.
+
+Runs the same request mix at each --concurrency level, with that many clients
+each sending its next request as soon as the last one returns, and reports
+requests per second and latency per level. Routes that block the event loop
+flat-line after one client; async ones keep scaling while the database has
+I/O to overlap.
+
+    python -m benchmarks.synthetic_data --database-url sqlite:////tmp/bench.db --reset
+    python -m benchmarks.concurrency_load --database-url sqlite:////tmp/bench.db
+    uvicorn simulated_api.main:app --workers 1 &
+    python -m benchmarks.concurrency_load --database-url postgresql://localhost/bench \\
+        --base-url http://127.0.0.1:8000 --concurrency 1 4 16 64
+
+Without --base-url the API is served by uvicorn on a thread of this process,
+sharing the interpreter with the clients, so absolute numbers are lower than
+against a separate server; the scaling between levels is what to compare.
+--reserve-share of the requests book real tables.
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+from benchmarks.reporting import latency_summary, run_metadata, write_json
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="Defaults to DATABASE_URL")
+    parser.add_argument("--base-url", help="A running simulated_api on the same database, instead of a local one")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32],
+                        help="Concurrent clients per level")
+    parser.add_argument("--requests", type=int, default=400, help="Requests per level")
+    parser.add_argument("--reserve-share", type=float, default=0.2, help="Share of requests that book a table")
+    parser.add_argument("--sample", type=int, default=1000, help="Restaurants sampled for request arguments")
+    parser.add_argument("--days-ahead", type=int, default=30, help="Searches and bookings fall within this window")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--json", help="Write the results to this file")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Must run before simulated_api is imported, the engines are built at import time"""
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+
+
+def plan_requests(args: argparse.Namespace, sample: List[Dict], rng: random.Random) -> List[Dict]:
+    """(path, JSON body) of every request of one level"""
+    today = date.today()
+    requests = []
+    for _ in range(args.requests):
+        restaurant = rng.choice(sample)
+        slot = {
+            "date": (today + timedelta(days=rng.randint(1, args.days_ahead))).isoformat(),
+            "time": f"{rng.randint(12, 21):02d}:00"
+        }
+        if rng.random() < args.reserve_share:
+            requests.append({"path": "/api/v1/restaurants/reserve", "body": {
+                "restaurant_id": restaurant["id"], "guests": rng.choice([2, 2, 4, 6]),
+                "user_name": "Load test", "user_phone": "+919800000000", **slot
+            }})
+        else:
+            requests.append({"path": "/api/v1/restaurants/search", "body": {
+                "city": restaurant["city"], "locality": restaurant["locality"],
+                "cuisine": restaurant["cuisine"], **slot
+            }})
+    return requests
+
+
+async def run_level(base_url: str, requests: List[Dict], concurrency: int) -> Dict:
+    import httpx
+
+    pending = iter(requests)
+    latencies: List[float] = []
+    errors = 0
+
+    async def client(http: httpx.AsyncClient) -> None:
+        nonlocal errors
+        for request in pending:
+            started = time.perf_counter()
+            response = await http.post(request["path"], json=request["body"])
+            latencies.append(time.perf_counter() - started)
+            # 404 (no match) and 409 (slot full) are answers; anything else is a failure
+            errors += response.status_code >= 500
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(concurrency)))
+        wall_seconds = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "wall_seconds": round(wall_seconds, 3),
+        "requests_per_second": round(len(latencies) / wall_seconds, 1) if wall_seconds else 0.0,
+        "latency": latency_summary(latencies)
+    }
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not args.database_url:
+        print("Pass --database-url or set DATABASE_URL")
+        return 2
+    configure_environment(args)
+
+    from benchmarks.api_benchmark import sample_restaurants
+    from benchmarks.local_api import running_api
+    from simulated_api.database.setup import SessionLocal, engine
+
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    try:
+        sample = sample_restaurants(db, args.sample, rng)
+    finally:
+        db.close()
+    if not sample:
+        print("No active restaurants, fill the database with benchmarks.synthetic_data first")
+        return 2
+
+    levels = []
+    server = contextlib.nullcontext(args.base_url.rstrip("/")) if args.base_url else running_api()
+    with server as base_url:
+        # Warm up connections, caches and the catalog index before the first level
+        asyncio.run(run_level(base_url, plan_requests(args, sample, rng)[:50], max(args.concurrency)))
+        for concurrency in args.concurrency:
+            levels.append(asyncio.run(run_level(base_url, plan_requests(args, sample, rng), concurrency)))
+
+    baseline = levels[0]["requests_per_second"]
+    for level in levels:
+        level["speedup"] = round(level["requests_per_second"] / baseline, 2) if baseline else 0.0
+    results = {**run_metadata(vars(args)), "database": engine.dialect.name, "base_url": base_url, "levels": levels}
+
+    print(f"{engine.dialect.name}: {args.requests} requests per level, {args.reserve_share:.0%} reservations")
+    print(f"{'clients':>8}{'req/s':>10}{'speedup':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'errors':>8}")
+    for level in levels:
+        latency = level["latency"]
+        print(f"{level['concurrency']:>8}{level['requests_per_second']:>10.1f}{level['speedup']:>9.2f}"
+              f"{latency['p50_ms']:>10.2f}{latency['p95_ms']:>10.2f}{latency['p99_ms']:>10.2f}{level['errors']:>8}")
+
+    write_json(args.json, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Ingestion throughput of the bulk restaurant import.
+
+Streams generated restaurants as NDJSON and as CSV to POST
+/api/v1/restaurants/bulk on a simulated_api served by uvicorn on a thread of
+this process, and reports rows per second for each. For comparison it also
+creates --baseline-rows restaurants one at a time with create_restaurant,
+one transaction per row, as populate_sample_restaurants used to.
+
+    python -m benchmarks.ingest_benchmark --rows 100000
+    python -m benchmarks.ingest_benchmark --database-url postgresql://localhost/ingest --rows 200000
+
+Rows are written for real; without --database-url they go to a temporary
+SQLite file. Every --invalid-every'th row fails validation, so the timing
+includes per-row error reporting. Bodies are generated before the clock
+starts.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, Iterator, List
+
+from benchmarks.reporting import run_metadata, write_json
+from benchmarks.synthetic_data import SyntheticDataGenerator
+
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Columns of a restaurant as the import takes it
+IMPORT_COLUMNS = ["name", "address", "city", "locality", "cuisine", "rating", "total_capacity", "phone", "email",
+                  "opening_time", "closing_time", "latitude", "longitude"]
+# Bytes per chunk of the streamed request body
+BODY_CHUNK_SIZE = 64 * 1024
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Database to import into, a temporary SQLite file by default")
+    parser.add_argument("--rows", type=int, default=20000, help="Restaurants per format")
+    parser.add_argument("--formats", nargs="+", choices=sorted(CONTENT_TYPES), default=["ndjson", "csv"])
+    parser.add_argument("--invalid-every", type=int, default=100, help="Every n-th row is invalid (0 disables)")
+    parser.add_argument("--baseline-rows", type=int, default=500,
+                        help="Restaurants created one at a time for comparison (0 skips)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Write the results to this file")
+    return parser.parse_args(argv)
+
+
+def configure_environment(database_url: str) -> None:
+    """Must run before simulated_api is imported, the engines are built at import time"""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["CATALOG_INDEX_ENABLED"] = "false"
+
+
+def generate_rows(count: int, seed: int, invalid_every: int) -> List[Dict]:
+    rows = []
+    for index, restaurant in enumerate(SyntheticDataGenerator(count, 0, seed=seed).restaurants()):
+        row = {column: restaurant[column] for column in IMPORT_COLUMNS}
+        if invalid_every and index % invalid_every == invalid_every - 1:
+            row["total_capacity"] = 0  # Below RestaurantCreate's minimum
+        rows.append(row)
+    return rows
+
+
+def encode_body(rows: List[Dict], body_format: str) -> List[bytes]:
+    """The request body in BODY_CHUNK_SIZE pieces"""
+    buffer = io.StringIO()
+    if body_format == "ndjson":
+        for row in rows:
+            buffer.write(json.dumps(row) + "\n")
+    else:
+        writer = csv.DictWriter(buffer, fieldnames=IMPORT_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    data = buffer.getvalue().encode("utf-8")
+    return [data[start:start + BODY_CHUNK_SIZE] for start in range(0, len(data), BODY_CHUNK_SIZE)]
+
+
+def import_body(base_url: str, chunks: List[bytes], body_format: str) -> Dict:
+    import httpx
+
+    def stream() -> Iterator[bytes]:
+        yield from chunks
+
+    started = time.perf_counter()
+    response = httpx.post(f"{base_url}/api/v1/restaurants/bulk", content=stream(),
+                          headers={"Content-Type": CONTENT_TYPES[body_format]}, timeout=None)
+    seconds = time.perf_counter() - started
+    response.raise_for_status()
+    result = response.json()
+
+    rows = result["inserted"] + result["failed"]
+    return {
+        "rows": rows,
+        "inserted": result["inserted"],
+        "failed": result["failed"],
+        "megabytes": round(sum(len(chunk) for chunk in chunks) / 1e6, 2),
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds, 1) if seconds else 0.0
+    }
+
+
+def create_one_at_a_time(rows: List[Dict]) -> Dict:
+    from simulated_api.app.models.pydantics import RestaurantCreate
+    from simulated_api.app.services.restaurant_manager import RestaurantManager
+    from simulated_api.database.setup import SessionLocal
+
+    db = SessionLocal()
+    try:
+        manager = RestaurantManager(db)
+        started = time.perf_counter()
+        for row in rows:
+            manager.create_restaurant(RestaurantCreate(**row))
+        seconds = time.perf_counter() - started
+    finally:
+        db.close()
+
+    return {
+        "rows": len(rows),
+        "inserted": len(rows),
+        "failed": 0,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(len(rows) / seconds, 1) if seconds else 0.0
+    }
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='ingest_'), 'ingest.db')}"
+    configure_environment(database_url)
+
+    from benchmarks.local_api import running_api
+    from simulated_api.database.setup import engine
+
+    bodies = {
+        body_format: encode_body(generate_rows(args.rows, args.seed + offset, args.invalid_every), body_format)
+        for offset, body_format in enumerate(args.formats)
+    }
+
+    runs: Dict[str, Dict] = {}
+    with running_api() as base_url:
+        for body_format, chunks in bodies.items():
+            runs[f"bulk.{body_format}"] = import_body(base_url, chunks, body_format)
+
+    if args.baseline_rows:
+        rows = generate_rows(args.baseline_rows, args.seed + len(args.formats), invalid_every=0)
+        runs["create_restaurant"] = create_one_at_a_time(rows)
+
+    results = {**run_metadata(vars(args)), "database": engine.dialect.name, "runs": runs}
+
+    print(f"{engine.dialect.name}: {args.rows:,} rows per format")
+    print(f"{'':<20}{'rows':>10}{'inserted':>10}{'failed':>8}{'seconds':>10}{'rows/s':>12}")
+    for name, run in runs.items():
+        print(f"{name:<20}{run['rows']:>10,}{run['inserted']:>10,}{run['failed']:>8,}"
+              f"{run['seconds']:>10.2f}{run['rows_per_second']:>12,.0f}")
+
+    write_json(args.json, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
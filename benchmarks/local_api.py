@@ -0,0 +1,34 @@
+"""
+simulated_api served by uvicorn on a background thread of the benchmark
+process, for the harnesses that measure the HTTP path. Import it only after
+DATABASE_URL is set, the app builds its engines at import time.
+"""
+import contextlib
+import threading
+import time
+from typing import Iterator
+
+
+@contextlib.contextmanager
+def running_api(host: str = "127.0.0.1", port: int = 0, startup_timeout: float = 30.0) -> Iterator[str]:
+    """Base URL of the API while the block runs; port 0 picks a free one"""
+    import uvicorn
+
+    from simulated_api.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, name="local-api", daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + startup_timeout
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("simulated_api did not start")
+        time.sleep(0.05)
+
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{bound_port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
@@ -0,0 +1,70 @@
+import json
+import platform
+import time
+from typing import Dict, List, Optional, Sequence
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    """Count, mean, percentiles and max of a list of durations, in milliseconds"""
+    values = sorted(seconds)
+    summary = {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = round(percentile(values, pct) * 1000, 3)
+    summary["max_ms"] = round(values[-1] * 1000, 3) if values else 0.0
+    return summary
+
+
+def run_metadata(parameters: Dict) -> Dict:
+    """What a result file needs for two runs to be compared"""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters
+    }
+
+
+def write_json(path: Optional[str], results: Dict) -> None:
+    if path:
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {path}")
+
+
+def print_latency_table(rows: Dict[str, Dict[str, float]]) -> None:
+    header = f"{'':<28}{'count':>8}{'mean':>10}" + "".join(f"{f'p{pct}':>10}" for pct in PERCENTILES) + f"{'max':>10}"
+    print(header)
+    for name, summary in rows.items():
+        print(
+            f"{name:<28}{summary['count']:>8}{summary['mean_ms']:>10.2f}"
+            + "".join(f"{summary[f'p{pct}_ms']:>10.2f}" for pct in PERCENTILES)
+            + f"{summary['max_ms']:>10.2f}"
+        )
+
+
+def print_comparison(rows: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                     metrics: Sequence[str] = ("p50_ms", "p95_ms")) -> None:
+    """Change of each metric against an earlier run, for the rows both runs have"""
+    print(f"{'':<28}" + "".join(f"{metric:>22}" for metric in metrics))
+    for name, summary in rows.items():
+        if name not in baseline:
+            continue
+        cells = []
+        for metric in metrics:
+            before, after = baseline[name].get(metric, 0.0), summary[metric]
+            change = f"{(after - before) / before:+.0%}" if before else "n/a"
+            cells.append(f"{before:.2f} -> {after:.2f} {change:>5}")
+        print(f"{name:<28}" + "".join(f"{cell:>22}" for cell in cells))
@@ -0,0 +1,202 @@
+"""
+Concurrent booking stress test for the slot inventory.
+
+Many threads book a handful of contended slots at once through
+RestaurantManager.reserve_table, each call with its own session as a request
+has. Every --off-grid-every'th booking asks for a time off the hourly grid
+(e.g. 19:30) or outside opening hours, which must be refused as invalid_time.
+Afterwards it checks, per slot, that the confirmed guests never exceed the
+capacity and match the seats the inventory has given out.
+
+    python -m benchmarks.synthetic_data --database-url sqlite:////tmp/bench.db --reset
+    python -m benchmarks.reserve_stress --database-url sqlite:////tmp/bench.db
+    python -m benchmarks.reserve_stress --database-url postgresql://localhost/bench --threads 32
+
+Bookings are real and stay in the database; each run books a date --days-ahead
+away, so rerun with another value for an empty date. Exits with status 1 when
+a slot is oversold or an invalid time is booked.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from benchmarks.reporting import latency_summary, print_latency_table, run_metadata, write_json
+
+STRESS_USER_NAME = "Stress test"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="Defaults to DATABASE_URL")
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent bookings")
+    parser.add_argument("--bookings", type=int, default=400, help="Booking attempts in total")
+    parser.add_argument("--restaurants", type=int, default=2, help="Restaurants the bookings are spread over")
+    parser.add_argument("--slots", type=int, default=2, help="Hourly slots per restaurant, contended by every thread")
+    parser.add_argument("--days-ahead", type=int, default=60, help="The booked date is this many days from today")
+    parser.add_argument("--off-grid-every", type=int, default=10,
+                        help="Every n-th booking asks for an invalid time (0 disables)")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--json", help="Write the results to this file")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Must run before simulated_api is imported, the engines are built at import time"""
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["CATALOG_INDEX_ENABLED"] = "false"
+
+
+def plan_bookings(args: argparse.Namespace, restaurants: List, booking_date: date,
+                  rng: random.Random) -> List[Tuple[Dict, bool]]:
+    """Booking requests over the contended slots, each with whether its time is invalid"""
+    from simulated_api.app.services.restaurant_manager import RestaurantManager
+
+    slots = [
+        (restaurant, slot)
+        for restaurant in restaurants
+        for slot in RestaurantManager._hourly_slots(restaurant)[-args.slots:]
+    ]
+
+    bookings = []
+    for attempt in range(args.bookings):
+        restaurant, slot = rng.choice(slots)
+        invalid = bool(args.off_grid_every) and attempt % args.off_grid_every == args.off_grid_every - 1
+        # Half past a grid slot, or an hour the restaurant is closed
+        requested_time = rng.choice([f"{slot[:2]}:30", "03:00"]) if invalid else slot
+        bookings.append(({
+            "restaurant_id": restaurant.id,
+            "date": booking_date.isoformat(),
+            "time": requested_time,
+            "guests": rng.choice([2, 4, 6, 8]),
+            "user_name": STRESS_USER_NAME,
+            "user_phone": "+919800000000"
+        }, invalid))
+    return bookings
+
+
+def book(session_factory, booking: Dict) -> Tuple[str, float]:
+    from simulated_api.app.models.pydantics import ReservationRequest
+    from simulated_api.app.services.restaurant_manager import RestaurantManager
+
+    db = session_factory()
+    started = time.perf_counter()
+    try:
+        result = RestaurantManager(db).reserve_table(ReservationRequest(**booking))
+        return result.status, time.perf_counter() - started
+    except Exception as e:
+        db.rollback()
+        return f"error: {type(e).__name__}", time.perf_counter() - started
+    finally:
+        db.close()
+
+
+def check_slots(db, restaurant_ids: List[str], booking_date: date) -> List[str]:
+    """Violations of the inventory invariants on the booked date"""
+    from sqlalchemy import func, select
+    from simulated_api.database.models import Reservation, SlotInventory
+
+    confirmed = dict(
+        ((restaurant_id, slot_time), guests)
+        for restaurant_id, slot_time, guests in db.execute(
+            select(Reservation.restaurant_id, Reservation.time, func.sum(Reservation.guests))
+            .where(Reservation.restaurant_id.in_(restaurant_ids), Reservation.date == booking_date,
+                   Reservation.status == "confirmed")
+            .group_by(Reservation.restaurant_id, Reservation.time)
+        )
+    )
+    inventory = {
+        (row.restaurant_id, row.time): row
+        for row in db.execute(
+            select(SlotInventory.restaurant_id, SlotInventory.time, SlotInventory.capacity, SlotInventory.remaining)
+            .where(SlotInventory.restaurant_id.in_(restaurant_ids), SlotInventory.date == booking_date)
+        )
+    }
+
+    violations = []
+    for (restaurant_id, slot_time), guests in confirmed.items():
+        slot = f"{restaurant_id} {slot_time.strftime('%H:%M')}"
+        row = inventory.get((restaurant_id, slot_time))
+        if slot_time.minute or row is None:
+            violations.append(f"{slot}: {guests} guests booked at a time with no grid slot")
+        elif guests > row.capacity:
+            violations.append(f"{slot}: {guests} guests booked, capacity is {row.capacity}")
+        elif guests != row.capacity - row.remaining:
+            violations.append(f"{slot}: {guests} guests booked, inventory gave out {row.capacity - row.remaining}")
+    return violations
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not args.database_url:
+        print("Pass --database-url or set DATABASE_URL")
+        return 2
+    configure_environment(args)
+
+    from simulated_api.database.models import Restaurant
+    from simulated_api.database.setup import SessionLocal, engine
+
+    rng = random.Random(args.seed)
+    booking_date = date.today() + timedelta(days=args.days_ahead)
+
+    db = SessionLocal()
+    try:
+        restaurants = db.query(Restaurant).filter(Restaurant.is_active == True).order_by(
+            Restaurant.id
+        ).limit(args.restaurants).all()
+    finally:
+        db.close()
+
+    if not restaurants:
+        print("No active restaurants, fill the database with benchmarks.synthetic_data first")
+        return 2
+    bookings = plan_bookings(args, restaurants, booking_date, rng)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        outcomes = list(pool.map(lambda planned: book(SessionLocal, planned[0]), bookings))
+    elapsed = time.perf_counter() - started
+
+    statuses = Counter(status for status, _ in outcomes)
+    invalid_confirmed = sum(
+        invalid and status == "confirmed" for (_, invalid), (status, _) in zip(bookings, outcomes)
+    )
+
+    db = SessionLocal()
+    try:
+        violations = check_slots(db, [restaurant.id for restaurant in restaurants], booking_date)
+    finally:
+        db.close()
+
+    results = {
+        **run_metadata(vars(args)),
+        "database": engine.dialect.name,
+        "date": booking_date.isoformat(),
+        "bookings_per_second": round(len(bookings) / elapsed, 1),
+        "statuses": dict(statuses),
+        "invalid_times_confirmed": invalid_confirmed,
+        "violations": violations,
+        "latency": latency_summary([seconds for _, seconds in outcomes])
+    }
+
+    print(f"{engine.dialect.name}: {len(bookings)} bookings on {booking_date} with {args.threads} threads, "
+          f"{results['bookings_per_second']} per second")
+    print_latency_table({"reserve_table": results["latency"]})
+    print("\n" + ", ".join(f"{status} {count}" for status, count in statuses.most_common()))
+    for violation in violations:
+        print(violation)
+    if invalid_confirmed:
+        print(f"{invalid_confirmed} bookings at invalid times were confirmed")
+
+    write_json(args.json, results)
+    return 1 if violations or invalid_confirmed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
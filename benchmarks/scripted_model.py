@@ -0,0 +1,118 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, FunctionMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class ScenarioBook:
+    """User messages the load test will send, mapped to what the scripted model should do with them"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scenarios: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, message: str, scenario: Dict[str, Any]) -> str:
+        with self._lock:
+            self._scenarios[message] = scenario
+        return message
+
+    def get(self, message: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._scenarios.get(message)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Offline stand-in for the OpenAI chat model in the openai-functions agent.
+
+    Looks up the latest user message in the ScenarioBook and answers the way
+    gpt-4o-mini does on the happy path: a booking calls search_restaurant,
+    then reserve_table with the top result, then confirms; small talk is
+    answered directly. Every call sleeps latency seconds, +/- jitter.
+
+    When streamed (astream_events, as /assistant/stream does), latency is the
+    wait for the first chunk and answer text then arrives a word at a time,
+    token_interval seconds apart; a function call arrives in one chunk.
+    Unstreamed calls return after the same total time.
+    """
+
+    scenarios: Any
+    latency: float = 0.5
+    jitter: float = 0.2
+    token_interval: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-chat"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        message = self._next_message(messages)
+        time.sleep(self._delay() + self._generation_time(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        message = self._next_message(messages)
+        await asyncio.sleep(self._delay() + self._generation_time(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self._delay())
+        message = self._next_message(messages)
+        if not message.content:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", additional_kwargs=message.additional_kwargs))
+            return
+
+        words = message.content.split(" ")
+        for index, word in enumerate(words):
+            if index:
+                await asyncio.sleep(self.token_interval)
+            token = word if index == len(words) - 1 else word + " "
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def _generation_time(self, message: AIMessage) -> float:
+        """Time the streamed words of an answer take, so both modes finish together"""
+        return max(0, len(message.content.split(" ")) - 1) * self.token_interval if message.content else 0.0
+
+    def _next_message(self, messages: List[BaseMessage]) -> AIMessage:
+        turn_start = max(index for index, message in enumerate(messages) if isinstance(message, HumanMessage))
+        scenario = self.scenarios.get(messages[turn_start].content) or {"kind": "chat"}
+        observations = [message for message in messages[turn_start + 1:] if isinstance(message, FunctionMessage)]
+
+        if scenario["kind"] != "book":
+            return AIMessage(content="I can find restaurants and book tables across India. Where would you like to eat?")
+
+        if not observations:
+            return _function_call("search_restaurant", scenario["search"])
+
+        last = observations[-1]
+        if last.name == "search_restaurant":
+            restaurants = json.loads(last.content).get("restaurants") or []
+            if not restaurants:
+                return AIMessage(content="I could not find a matching restaurant. Could you try another area or time?")
+            return _function_call("reserve_table", {"restaurant_id": restaurants[0]["id"], **scenario["reserve"]})
+
+        result = json.loads(last.content)
+        if result.get("status") == "success":
+            return AIMessage(content=f"Your table is booked. Reservation ID: {result['reservation_id']}.")
+        return AIMessage(content=f"Sorry, I could not book that table: {result.get('message')}")
+
+
+def _function_call(name: str, arguments: Dict[str, Any]) -> AIMessage:
+    return AIMessage(content="", additional_kwargs={"function_call": {"name": name, "arguments": json.dumps(arguments)}})
@@ -0,0 +1,140 @@
+"""
+Time to first token of /assistant/stream against the full reply of /assistant/chat.
+
+Plays the same conversations twice through an offline Assistant, set up as
+benchmarks.assistant_load does it: once through Assistant.astream_chat, timing
+the first token event and the done event, and once through Assistant.chat,
+timing the whole reply. The scripted model streams its answers a word at a
+time, so the first token arrives after the agent's last LLM call starts
+answering rather than after the answer is complete.
+
+    python -m benchmarks.stream_latency --users 5 --turns 4 --llm-latency 0.3 --token-interval 0.03
+
+The fast path is off, every turn goes through the agent.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks.assistant_load import build_conversations, configure_environment, seed_catalog
+from benchmarks.reporting import latency_summary, print_latency_table, run_metadata, write_json
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5, help="Concurrent simulated users")
+    parser.add_argument("--turns", type=int, default=4, help="Messages each user sends, one after another")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Seconds before each LLM call's first chunk")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="Relative +/- jitter on the LLM latency")
+    parser.add_argument("--token-interval", type=float, default=0.03, help="Seconds between streamed words")
+    parser.add_argument("--chat-ratio", type=float, default=0.2, help="Share of messages that are small talk")
+    parser.add_argument("--database-url", help="simulated_api database, a temporary SQLite file by default")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the app's own logging on stdout")
+    args = parser.parse_args(argv)
+    args.fast_path = False
+    return args
+
+
+async def stream_conversations(assistant, conversations: List[List[str]]) -> Dict[str, List[float]]:
+    from models.assistant_model import ChatPayload
+
+    timings = {"first_token": [], "full_reply": []}
+    errors = 0
+
+    async def run_user(user: int) -> None:
+        nonlocal errors
+        for message in conversations[user]:
+            started = time.perf_counter()
+            first_token = None
+            async for event in assistant.astream_chat(ChatPayload(id=f"stream-user-{user}", query=message)):
+                if event["event"] == "token" and first_token is None:
+                    first_token = time.perf_counter() - started
+                elif event["event"] == "error":
+                    errors += 1
+            full_reply = time.perf_counter() - started
+            timings["first_token"].append(first_token if first_token is not None else full_reply)
+            timings["full_reply"].append(full_reply)
+
+    await asyncio.gather(*(run_user(user) for user in range(len(conversations))))
+    timings["errors"] = errors
+    return timings
+
+
+def chat_conversations(assistant, conversations: List[List[str]]) -> List[float]:
+    from models.assistant_model import ChatPayload
+
+    latencies: List[float] = []
+
+    def run_user(user: int) -> None:
+        for message in conversations[user]:
+            started = time.perf_counter()
+            assistant.chat(ChatPayload(id=f"chat-user-{user}", query=message))
+            latencies.append(time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=len(conversations)) as pool:
+        list(pool.map(run_user, range(len(conversations))))
+    return latencies
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    configure_environment(args, tempfile.mkdtemp(prefix="stream_latency_"))
+
+    try:
+        import fakeredis
+    except ImportError:
+        print("fakeredis is required: pip install -r benchmarks/requirements.txt")
+        return 2
+
+    from benchmarks.scripted_model import ScenarioBook, ScriptedChatModel
+    from services import assistant as assistant_module
+    from services import memory_manager
+
+    redis_server = fakeredis.FakeServer()
+    memory_manager.get_redis_client = lambda redis_url: fakeredis.FakeRedis(server=redis_server)
+
+    scenarios = ScenarioBook()
+    assistant_module.llm = ScriptedChatModel(scenarios=scenarios, latency=args.llm_latency, jitter=args.llm_jitter,
+                                             token_interval=args.token_interval)
+    conversations = build_conversations(args, seed_catalog(), scenarios)
+
+    assistant = assistant_module.Assistant()
+    assistant.agent_executor.verbose = False
+
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        streamed = asyncio.run(stream_conversations(assistant, conversations))
+        chat_latencies = chat_conversations(assistant, conversations)
+
+    rows = {
+        "stream.first_token": latency_summary(streamed["first_token"]),
+        "stream.full_reply": latency_summary(streamed["full_reply"]),
+        "chat.full_reply": latency_summary(chat_latencies)
+    }
+    results = {
+        **run_metadata(vars(args)),
+        "errors": streamed["errors"],
+        "latency": rows,
+        # How much sooner the user sees text than the blocking endpoint's reply
+        "first_token_saved_ms": round(rows["chat.full_reply"]["mean_ms"] - rows["stream.first_token"]["mean_ms"], 3)
+    }
+
+    print_latency_table(rows)
+    print(f"\nFirst token arrives {results['first_token_saved_ms']:.1f} ms before the /assistant/chat reply on average")
+    if streamed["errors"]:
+        print(f"{streamed['errors']} streamed turns ended in an error")
+
+    write_json(args.json, results)
+    return 1 if streamed["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
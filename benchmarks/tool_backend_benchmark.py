@@ -0,0 +1,154 @@
+"""
+Per-tool latency of the HTTP and in-process tool backends.
+
+Times the search and reserve tool calls through HttpToolBackend and
+InProcessToolBackend against the same database, alternating between them so
+both see the same data and cache state. Unless --base-url points at a running
+API, simulated_api is served by uvicorn on a thread of this process, so the
+HTTP numbers include loopback networking but no real network hops.
+
+    python -m benchmarks.synthetic_data --database-url sqlite:////tmp/bench.db --reset
+    python -m benchmarks.tool_backend_benchmark --database-url sqlite:////tmp/bench.db --json tools.json
+
+Searches use the same arguments on both backends and must get the same status
+code; a mismatch is counted and exits with status 1. Reservations book real
+tables, so pass --skip-reserve to leave the database untouched.
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+from benchmarks.reporting import latency_summary, print_latency_table, run_metadata, write_json
+
+BACKENDS = ("http", "inprocess")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="Defaults to DATABASE_URL")
+    parser.add_argument("--base-url", help="A running simulated_api on the same database, instead of a local one")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per tool and backend")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed calls per tool and backend first")
+    parser.add_argument("--sample", type=int, default=1000, help="Restaurants sampled for call arguments")
+    parser.add_argument("--days-ahead", type=int, default=30, help="Searches and bookings fall within this window")
+    parser.add_argument("--skip-reserve", action="store_true", help="Do not book tables")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--json", help="Write the results to this file")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Must run before simulated_api is imported, the engines are built at import time"""
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+
+
+def configure_tool_urls(base_url: str) -> None:
+    """Must run before services.tool_backends is imported, it reads the URLs at import time"""
+    os.environ["RESTAURANT_SEARCH_URL"] = f"{base_url}/api/v1/restaurants/search"
+    os.environ["TABLE_RESERVE_URL"] = f"{base_url}/api/v1/restaurants/reserve"
+
+
+def sample_restaurants(size: int, rng: random.Random) -> List[Dict]:
+    from benchmarks.api_benchmark import sample_restaurants as reservoir_sample
+    from simulated_api.database.setup import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return reservoir_sample(db, size, rng)
+    finally:
+        db.close()
+
+
+def run(args: argparse.Namespace, sample: List[Dict], rng: random.Random) -> Dict:
+    from services.tool_backends import HttpToolBackend, InProcessToolBackend
+
+    backends = {"http": HttpToolBackend(), "inprocess": InProcessToolBackend()}
+    today = date.today()
+    latencies: Dict[str, List[float]] = {f"{tool}.{name}": [] for tool in ("search", "reserve") for name in BACKENDS}
+    mismatches = 0
+
+    def slot() -> Dict:
+        return {
+            "date": (today + timedelta(days=rng.randint(1, args.days_ahead))).isoformat(),
+            "time": f"{rng.randint(12, 21):02d}:00"
+        }
+
+    def timed(call, argument):
+        started = time.perf_counter()
+        response = call(argument)
+        return response, time.perf_counter() - started
+
+    for iteration in range(args.warmup + args.iterations):
+        # Alternate which backend goes first, so neither always meets a warm cache
+        order = BACKENDS if iteration % 2 == 0 else BACKENDS[::-1]
+
+        restaurant = rng.choice(sample)
+        params = {"city": restaurant["city"], "locality": restaurant["locality"],
+                  "cuisine": restaurant["cuisine"], **slot()}
+        statuses = set()
+        for name in order:
+            response, elapsed = timed(backends[name].search, params)
+            statuses.add(response.status_code)
+            if iteration >= args.warmup:
+                latencies[f"search.{name}"].append(elapsed)
+        mismatches += len(statuses) > 1
+
+        if args.skip_reserve:
+            continue
+        for name in order:
+            payload = {"restaurant_id": rng.choice(sample)["id"], "guests": rng.choice([2, 2, 4, 6]),
+                       "user_name": "Benchmark", "user_phone": "+919800000000", **slot()}
+            _, elapsed = timed(backends[name].reserve, payload)
+            if iteration >= args.warmup:
+                latencies[f"reserve.{name}"].append(elapsed)
+
+    tools = {name: latency_summary(seconds) for name, seconds in latencies.items() if seconds}
+    saved = {
+        tool: {
+            metric: round(tools[f"{tool}.http"][metric] - tools[f"{tool}.inprocess"][metric], 3)
+            for metric in ("mean_ms", "p50_ms", "p95_ms")
+        }
+        for tool in ("search", "reserve") if f"{tool}.http" in tools
+    }
+    return {"tools": tools, "saved_ms": saved, "search_status_mismatches": mismatches}
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not args.database_url:
+        print("Pass --database-url or set DATABASE_URL")
+        return 2
+    configure_environment(args)
+
+    from benchmarks.local_api import running_api
+
+    rng = random.Random(args.seed)
+    sample = sample_restaurants(args.sample, rng)
+    if not sample:
+        print("No active restaurants, fill the database with benchmarks.synthetic_data first")
+        return 2
+
+    server = contextlib.nullcontext(args.base_url.rstrip("/")) if args.base_url else running_api()
+    with server as base_url:
+        configure_tool_urls(base_url)
+        results = {**run_metadata(vars(args)), "base_url": base_url, **run(args, sample, rng)}
+
+    print_latency_table(results["tools"])
+    print(f"\n{'saved per call':<28}{'mean':>10}{'p50':>10}{'p95':>10}")
+    for tool, saved in results["saved_ms"].items():
+        print(f"{tool:<28}{saved['mean_ms']:>10.2f}{saved['p50_ms']:>10.2f}{saved['p95_ms']:>10.2f}")
+    if results["search_status_mismatches"]:
+        print(f"{results['search_status_mismatches']} searches got different status codes from the two backends")
+
+    write_json(args.json, results)
+    return 1 if results["search_status_mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,25 @@
 from pydantic import BaseModel, Field, model_validator
 from datetime import datetime, date
+from typing import Optional
 
 
 class RestaurantSearchArgs(BaseModel):
-    city: str = Field(..., description="City name, must not be empty")
-    locality: str = Field(..., description="Locality or area within the city")
-    cuisine: str = Field(..., description="Cuisine type (e.g., Italian, Indian)")
+    city: Optional[str] = Field(None, description="City name; required unless latitude and longitude are given")
+    locality: Optional[str] = Field(None, description="Locality or area within the city; required unless latitude and longitude are given")
+    cuisine: Optional[str] = Field(None, description="Cuisine type (e.g., Italian, Indian); required unless latitude and longitude are given")
     date: str = Field(..., description="Reservation date in YYYY-MM-DD format (must be a valid future date)")
     time: str = Field(..., description="Time in HH:MM format (24-hour)")
+    latitude: Optional[float] = Field(None, description="Latitude of the user's location, for restaurants near them")
+    longitude: Optional[float] = Field(None, description="Longitude of the user's location, given with latitude")
+    radius_km: Optional[float] = Field(None, description="Only restaurants within this many km of the location (e.g., 2); omit for the nearest ones")
+
+
+class RestaurantAvailabilityArgs(BaseModel):
+    restaurant_name: str = Field(..., description="Name of the restaurant, or part of it (e.g., Trishna)")
+    city: Optional[str] = Field(None, description="City of the restaurant, to tell apart restaurants with the same name")
+    start_date: str = Field(..., description="First date in YYYY-MM-DD format (today or later)")
+    days: int = Field(7, description="Number of days to check, from start_date (1 to 31)")
+    guests: int = Field(2, description="Party size; only times with enough free seats are returned")
 
 
 class TableReserveArgs(BaseModel):
@@ -1,11 +1,19 @@
+import json
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import Response, StreamingResponse
 from models.assistant_model import ChatPayload
 
 from services.assistant import Assistant
+from simulated_api.app.services.metrics import PROMETHEUS_CONTENT_TYPE, registry
 
 assistant_router = APIRouter(tags=["Assistant"])
 
+@lru_cache(maxsize=1)
 def get_assistant():
+    """One Assistant per process; call at startup to build the agent before the first request"""
     return Assistant()
 
 @assistant_router.post("/assistant")
@@ -17,4 +25,33 @@ def assistant(
     return assistant_service.chat(chat_payload)
 
 
+@assistant_router.get("/assistant/stats")
+def assistant_stats(assistant_service: Assistant = Depends(get_assistant)):
+    """Fast path hit rate, fallback reasons and latency saved against the agent"""
+    return {"fast_path": assistant_service.fast_path.stats() if assistant_service.fast_path else None}
+
+
+@assistant_router.get("/metrics")
+def metrics():
+    """Stage latency histograms in the Prometheus text format"""
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@assistant_router.post("/assistant/stream")
+async def assistant_stream(
+        chat_payload: ChatPayload,
+        assistant_service: Assistant = Depends(get_assistant)
+):
+    """Server-Sent Events: tool_start, tool_end and token events, then done or error"""
+    return StreamingResponse(
+        _sse(assistant_service.astream_chat(chat_payload)),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
+async def _sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for event in events:
+        data = {key: value for key, value in event.items() if key != "event"}
+        yield f"event: {event['event']}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -1,4 +1,8 @@
 # Load environment variables first
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict
+
 from dotenv import load_dotenv
 
 from models.assistant_model import ChatPayload
@@ -7,25 +11,46 @@ load_dotenv()
 
 from langchain_openai import ChatOpenAI
 from langchain.agents import create_openai_functions_agent, AgentExecutor
-from langchain import hub
 from services.memory_manager import MemoryManager
-from services.tools import search_restaurant_tool, reserve_table_tool
+from services.tools import search_restaurant_tool, restaurant_availability_tool, reserve_table_tool
 from services.langsmith_manager import TracingManager
+from services.fast_path import FAST_PATH_ENABLED, FastPathBooker
+from services.tool_memo import tool_result_memo
+from services.context_budget import ContextAssembler, PromptTokenCounter, log_turn_tokens
+from services.metrics import TURN_SECONDS, stage_callbacks
+from utils.prompt_template.agent_prompt import get_agent_prompt
 
 
 # Initialize the LLM
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.02)
 
 class Assistant:
-    """Foody-AI Assistant with reservation workflow"""
+    """
+    Foody-AI Assistant with reservation workflow.
+
+    Build it once per process: the agent and executor hold no per-session state,
+    so concurrent requests share them and only load their own memory and config.
+    """
 
     def __init__(self, project_name: str = "foody-ai"):
         self.tracing_manager = TracingManager(project_name)
 
-        self.tools = [search_restaurant_tool, reserve_table_tool]
-        self.prompt = hub.pull("hwchase17/openai-functions-agent")
+        # Books fully specified requests without the LLM, None when disabled
+        self.fast_path = FastPathBooker() if FAST_PATH_ENABLED else None
+
+        # Fits the stored history into the prompt's token budget each turn
+        self.context_assembler = ContextAssembler()
+
+        self.tools = [search_restaurant_tool, restaurant_availability_tool, reserve_table_tool]
+        self.prompt = get_agent_prompt()
         # Create agent
         self.agent = create_openai_functions_agent(llm=llm, tools=self.tools, prompt=self.prompt)
+        # Memory is loaded and saved per call in chat(), not attached to the executor
+        self.agent_executor = AgentExecutor(agent=self.agent,
+                                            tools=self.tools,
+                                            verbose=True,
+                                            handle_parsing_errors=True,
+                                            max_iterations=5)
 
 
     def chat(self, chat_data: ChatPayload) -> dict:
@@ -39,22 +64,93 @@ class Assistant:
         Returns:
             Agent's response
         """
+        turn_started = time.perf_counter()
+        path = "error"
         try:
-            config = self.tracing_manager.get_config(chat_data.id)
-            memory = MemoryManager(chat_data.id).get_memory()
-
-            agent_executor = AgentExecutor(agent=self.agent,
-                                           tools=self.tools,
-                                           memory = memory,
-                                           verbose=True,
-                                           handle_parsing_errors=True,
-                                           max_iterations=5)
-
-            # Invoke the agent with user input and LangSmith trace config
-            response = agent_executor.invoke({"input": chat_data.query}, config=config)
-            return {"response": response["output"]}
+            # Tool results are memoized per conversation
+            with tool_result_memo.session(chat_data.id):
+                config = self.tracing_manager.get_config(chat_data.id)
+                memory = MemoryManager(chat_data.id).get_memory()
+
+                reply = self.fast_path.try_book(chat_data.query) if self.fast_path else None
+                if reply is not None:
+                    memory.save_context({"input": chat_data.query}, {"output": reply})
+                    path = "fast_path"
+                    return {"response": reply}
+
+                history = memory.load_memory_variables({})["chat_history"]
+                context, context_stats = self.context_assembler.assemble(history)
+                inputs = {"input": chat_data.query, "chat_history": context}
+                token_counter = PromptTokenCounter()
+
+                # Invoke the agent with user input and LangSmith trace config
+                started = time.perf_counter()
+                response = self.agent_executor.invoke(
+                    inputs, config={**config, "callbacks": [token_counter, *stage_callbacks()]})
+                if self.fast_path:
+                    self.fast_path.record_agent_call(time.perf_counter() - started)
+                log_turn_tokens(chat_data.id, context_stats, token_counter)
+                memory.save_context({"input": chat_data.query}, {"output": response["output"]})
+                path = "agent"
+                return {"response": response["output"]}
 
         except Exception as e:
             return {"response": f"Sorry, I encountered an error: {str(e)}"}
+        finally:
+            TURN_SECONDS.observe(time.perf_counter() - turn_started, path=path)
 
+    async def astream_chat(self, chat_data: ChatPayload) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of chat().
 
+        Yields tool_start/tool_end events as the agent calls its tools, token
+        events as the LLM streams its answer, and a final done event carrying
+        the full response (or an error event).
+        """
+        turn_started = time.perf_counter()
+        path = "error"
+        try:
+            with tool_result_memo.session(chat_data.id):
+                config = self.tracing_manager.get_config(chat_data.id)
+                memory = MemoryManager(chat_data.id).get_memory()
+
+                reply = await asyncio.to_thread(self.fast_path.try_book, chat_data.query) if self.fast_path else None
+                if reply is not None:
+                    await asyncio.to_thread(memory.save_context, {"input": chat_data.query}, {"output": reply})
+                    path = "fast_path"
+                    yield {"event": "done", "response": reply}
+                    return
+
+                history = (await asyncio.to_thread(memory.load_memory_variables, {}))["chat_history"]
+                context, context_stats = self.context_assembler.assemble(history)
+                inputs = {"input": chat_data.query, "chat_history": context}
+                token_counter = PromptTokenCounter()
+
+                started = time.perf_counter()
+                output = None
+                async for event in self.agent_executor.astream_events(
+                        inputs, config={**config, "callbacks": [token_counter, *stage_callbacks()]}, version="v2"):
+                    kind = event["event"]
+                    if kind == "on_chat_model_stream":
+                        # Function-call chunks carry no content, only answer text is forwarded
+                        if event["data"]["chunk"].content:
+                            yield {"event": "token", "content": event["data"]["chunk"].content}
+                    elif kind == "on_tool_start":
+                        yield {"event": "tool_start", "name": event["name"], "input": event["data"].get("input")}
+                    elif kind == "on_tool_end":
+                        yield {"event": "tool_end", "name": event["name"], "output": event["data"].get("output"),
+                               "cache": event["metadata"].get("tool_cache")}
+                    elif kind == "on_chain_end" and not event["parent_ids"]:
+                        output = event["data"]["output"]["output"]
+
+                if self.fast_path:
+                    self.fast_path.record_agent_call(time.perf_counter() - started)
+                log_turn_tokens(chat_data.id, context_stats, token_counter)
+                await asyncio.to_thread(memory.save_context, {"input": chat_data.query}, {"output": output})
+                path = "agent"
+                yield {"event": "done", "response": output}
+
+        except Exception as e:
+            yield {"event": "error", "response": f"Sorry, I encountered an error: {str(e)}"}
+        finally:
+            TURN_SECONDS.observe(time.perf_counter() - turn_started, path=path)
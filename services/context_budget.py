@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+# Tokens of chat history sent with each turn
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+# Part of the budget kept for the note that stands in for trimmed turns (0 disables it)
+CONTEXT_SUMMARY_TOKENS = int(os.getenv("CONTEXT_SUMMARY_TOKENS", "150"))
+TOKENIZER_MODEL = os.getenv("TOKENIZER_MODEL", "gpt-4o-mini")
+# Role and separator tokens the chat format adds to every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """tiktoken encoding for TOKENIZER_MODEL, or None when it cannot be loaded"""
+    global _encoding, _encoding_loaded
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                import tiktoken
+                _encoding = tiktoken.encoding_for_model(TOKENIZER_MODEL)
+            except Exception as e:
+                # tiktoken fetches its BPE file once; offline, fall back to an estimate
+                print(f"Could not load the {TOKENIZER_MODEL} tokenizer, estimating tokens from length: {e}")
+            _encoding_loaded = True
+        return _encoding
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages: Sequence[BaseMessage]) -> int:
+    total = 0
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+        # Function calls in the agent scratchpad live outside the content
+        if message.additional_kwargs:
+            content += json.dumps(message.additional_kwargs)
+        total += count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+class ContextAssembler:
+    """
+    Fits chat history into a token budget.
+
+    Keeps the most recent messages that fit, starting on a user message.
+    Trimmed turns are replaced by one system note quoting the user's earlier
+    messages, newest first until summary_tokens, so names or preferences
+    given early in the conversation are not lost outright. It is an extract,
+    not an LLM summary, to keep each turn to the calls the agent makes.
+    """
+
+    def __init__(self, budget_tokens: int = CONTEXT_TOKEN_BUDGET, summary_tokens: int = CONTEXT_SUMMARY_TOKENS):
+        self.budget_tokens = budget_tokens
+        self.summary_tokens = min(summary_tokens, budget_tokens)
+
+    def assemble(self, history: List[BaseMessage]) -> Tuple[List[BaseMessage], Dict[str, int]]:
+        """History to send this turn, and token counts before and after"""
+        history_tokens = count_message_tokens(history)
+        if history_tokens <= self.budget_tokens:
+            return history, {"history_tokens": history_tokens, "context_tokens": history_tokens, "trimmed_messages": 0}
+
+        available = self.budget_tokens - self.summary_tokens
+        kept: List[BaseMessage] = []
+        for message in reversed(history):
+            cost = count_message_tokens([message])
+            if cost > available:
+                break
+            kept.insert(0, message)
+            available -= cost
+
+        # A reply without the question it answers only confuses the agent
+        while kept and not isinstance(kept[0], HumanMessage):
+            kept.pop(0)
+
+        trimmed = history[:len(history) - len(kept)]
+        summary = self._summarize(trimmed)
+        context = ([summary] if summary else []) + kept
+        return context, {
+            "history_tokens": history_tokens,
+            "context_tokens": count_message_tokens(context),
+            "trimmed_messages": len(trimmed)
+        }
+
+    def _summarize(self, trimmed: List[BaseMessage]) -> Optional[SystemMessage]:
+        if not self.summary_tokens:
+            return None
+
+        prefix = "Earlier in this conversation the user said: "
+        budget = self.summary_tokens - MESSAGE_OVERHEAD_TOKENS - count_tokens(prefix)
+        quotes: List[str] = []
+        for message in reversed(trimmed):
+            if not isinstance(message, HumanMessage) or not isinstance(message.content, str):
+                continue
+            quote = f'"{" ".join(message.content.split())}"'
+            cost = count_tokens(quote) + 1
+            if cost > budget:
+                break
+            quotes.insert(0, quote)
+            budget -= cost
+
+        return SystemMessage(content=prefix + " ".join(quotes)) if quotes else None
+
+
+class PromptTokenCounter(BaseCallbackHandler):
+    """Counts, locally, the prompt tokens of each chat model call made during one turn"""
+
+    run_inline = True
+
+    def __init__(self):
+        self.calls: List[int] = []
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[BaseMessage]], **kwargs: Any) -> None:
+        self.calls.extend(count_message_tokens(prompt) for prompt in messages)
+
+
+def log_turn_tokens(session_id: str, context_stats: Dict[str, int], counter: PromptTokenCounter) -> None:
+    print(
+        f"Tokens [{session_id}]: history {context_stats['history_tokens']} -> {context_stats['context_tokens']} "
+        f"({context_stats['trimmed_messages']} messages trimmed), "
+        f"prompt per LLM call {counter.calls}, total {sum(counter.calls)}"
+    )
@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from pydantic import ValidationError
+
+from models.tool_model import RestaurantSearchArgs, TableReserveArgs
+from services.intent_parser import BookingIntent, CatalogVocabulary, IntentParser
+from services.tool_backends import get_tool_backend
+from services.tools import forget_availability
+
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+# Seconds before the catalog vocabulary is reloaded
+FAST_PATH_VOCABULARY_TTL = float(os.getenv("FAST_PATH_VOCABULARY_TTL", "600"))
+
+
+class FastPathBooker:
+    """
+    Books fully specified requests without calling the LLM.
+
+    IntentParser reads the message against the catalog vocabulary. On a
+    confident parse the booker searches and reserves the top choice, which is
+    what the agent would do. Anything it cannot settle alone (no parse, a time
+    off the hourly grid, no results, a full slot) returns None and the caller
+    falls back to the agent. Hit rate and latency against the agent path are
+    kept for stats().
+
+    The vocabulary loads on a background thread, one load at a time, so a
+    chat turn never waits for it; until the first load finishes every message
+    goes to the agent.
+    """
+
+    def __init__(self, backend=None, vocabulary_ttl: float = FAST_PATH_VOCABULARY_TTL):
+        self._backend = backend
+        self.vocabulary_ttl = vocabulary_ttl
+        self._parser: Optional[IntentParser] = None
+        self._parser_loaded_at = 0.0
+        self._loading = False
+        self._lock = threading.Lock()
+        self._attempts = 0
+        self._hits = 0
+        self._fallbacks: Dict[str, int] = {}
+        self._hit_seconds = 0.0
+        self._agent_calls = 0
+        self._agent_seconds = 0.0
+
+    @property
+    def backend(self):
+        return self._backend or get_tool_backend()
+
+    def try_book(self, message: str) -> Optional[str]:
+        """Reply for a booking made without the agent, or None to fall back"""
+        started = time.perf_counter()
+        try:
+            reply, reason = self._book(message)
+        except Exception as e:
+            print(f"Fast path failed, falling back to the agent: {e}")
+            reply, reason = None, "error"
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._attempts += 1
+            if reply is None:
+                self._fallbacks[reason] = self._fallbacks.get(reason, 0) + 1
+            else:
+                self._hits += 1
+                self._hit_seconds += elapsed
+        return reply
+
+    def record_agent_call(self, seconds: float) -> None:
+        """Time taken by a message that went to the agent, the baseline for latency saved"""
+        with self._lock:
+            self._agent_calls += 1
+            self._agent_seconds += seconds
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hit_ms = self._hit_seconds / self._hits * 1000 if self._hits else 0.0
+            agent_ms = self._agent_seconds / self._agent_calls * 1000 if self._agent_calls else 0.0
+            return {
+                "attempts": self._attempts,
+                "hits": self._hits,
+                "hit_rate": round(self._hits / self._attempts, 4) if self._attempts else 0.0,
+                "fallbacks": dict(self._fallbacks),
+                "mean_hit_ms": round(hit_ms, 1),
+                "mean_agent_ms": round(agent_ms, 1),
+                # Estimate: each hit would otherwise have cost a mean agent call
+                "saved_ms": round(self._hits * (agent_ms - hit_ms), 1) if self._agent_calls else None
+            }
+
+    def _book(self, message: str):
+        parser = self._get_parser()
+        if parser is None:
+            return None, "vocabulary_unavailable"
+
+        intent = parser.parse(message)
+        if intent is None:
+            return None, "unparsed"
+        if not intent.time.endswith(":00"):
+            # Tables are booked on the hour; the agent offers the nearest slots instead
+            return None, "off_grid_time"
+
+        try:
+            RestaurantSearchArgs(**intent.search_params())
+            TableReserveArgs(**intent.reserve_payload("pending"))
+        except ValidationError:
+            return None, "invalid_args"
+
+        search = self.backend.search(intent.search_params())
+        if not search.is_success or not search.json():
+            return None, "no_results"
+        restaurant = search.json()[0]
+
+        reservation = self.backend.reserve(intent.reserve_payload(restaurant["id"]))
+        forget_availability()
+        if not reservation.is_success:
+            # A full slot needs the agent to offer the alternatives
+            return None, "not_reserved"
+
+        return self._reply(intent, restaurant, reservation.json()), None
+
+    def _get_parser(self) -> Optional[IntentParser]:
+        """Current parser, possibly stale or None, starting a background reload when it is due"""
+        with self._lock:
+            due = not self._parser_loaded_at or time.monotonic() - self._parser_loaded_at >= self.vocabulary_ttl
+            if due and not self._loading:
+                self._loading = True
+                threading.Thread(target=self.load_vocabulary, name="fast-path-vocabulary", daemon=True).start()
+            return self._parser
+
+    def load_vocabulary(self) -> None:
+        """Load the catalog vocabulary now; the background reload runs this"""
+        try:
+            parser = IntentParser(CatalogVocabulary(self.backend.catalog_terms()))
+        except Exception as e:
+            print(f"Could not load the fast path vocabulary: {e}")
+            parser = None
+        with self._lock:
+            # On failure keep any stale vocabulary and wait a full TTL before retrying
+            if parser is not None:
+                self._parser = parser
+            self._parser_loaded_at = time.monotonic()
+            self._loading = False
+
+    @staticmethod
+    def _reply(intent: BookingIntent, restaurant: Dict, reservation: Dict) -> str:
+        guests = f"{intent.guests} guest" + ("s" if intent.guests > 1 else "")
+        return (
+            f"Your table at **{restaurant['name']}** ({restaurant['address']}) is confirmed for {guests} "
+            f"on {intent.date} at {intent.time}, under {intent.user_name}.\n\n"
+            f"Reservation ID: {reservation['reservation_id']}, table {reservation['table_number']}. "
+            f"{reservation.get('instructions', '')}".rstrip()
+        )
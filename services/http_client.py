@@ -0,0 +1,106 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TOOL_HTTP_CONNECT_TIMEOUT = float(os.getenv("TOOL_HTTP_CONNECT_TIMEOUT", "3"))
+TOOL_HTTP_READ_TIMEOUT = float(os.getenv("TOOL_HTTP_READ_TIMEOUT", "15"))
+TOOL_HTTP_MAX_RETRIES = int(os.getenv("TOOL_HTTP_MAX_RETRIES", "2"))
+TOOL_HTTP_BACKOFF = float(os.getenv("TOOL_HTTP_BACKOFF", "0.2"))  # Base delay in seconds
+TOOL_HTTP_MAX_CONNECTIONS = int(os.getenv("TOOL_HTTP_MAX_CONNECTIONS", "20"))
+
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+DEFAULT_HEADERS = {
+    "accept": "application/json",
+    "Content-Type": "application/json"
+}
+
+
+class ToolHttpClient:
+    """
+    Keep-alive HTTP client shared by the agent tools.
+
+    Idempotent calls are retried on transport errors and 502/503/504 with
+    exponential backoff and full jitter. Other calls are only retried when the
+    connection could not be opened, since the request never reached the server.
+    """
+
+    def __init__(self, connect_timeout: float = TOOL_HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = TOOL_HTTP_READ_TIMEOUT,
+                 max_retries: int = TOOL_HTTP_MAX_RETRIES,
+                 backoff: float = TOOL_HTTP_BACKOFF,
+                 transport: Optional[httpx.BaseTransport] = None,
+                 async_transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=TOOL_HTTP_MAX_CONNECTIONS,
+                                   max_keepalive_connections=TOOL_HTTP_MAX_CONNECTIONS)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._transport = transport
+        self._async_transport = async_transport
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self.timeout, limits=self.limits,
+                                            headers=DEFAULT_HEADERS, transport=self._transport)
+            return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits,
+                                                       headers=DEFAULT_HEADERS, transport=self._async_transport)
+            return self._async_client
+
+    def post(self, url: str, payload: Dict[str, Any], idempotent: bool = False) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self.client.post(url, json=payload)
+                if not (idempotent and response.status_code in RETRYABLE_STATUS_CODES
+                        and attempt < self.max_retries):
+                    return response
+            except httpx.TransportError as e:
+                if not self._should_retry(e, idempotent, attempt):
+                    raise
+            time.sleep(self._delay(attempt))
+            attempt += 1
+
+    async def apost(self, url: str, payload: Dict[str, Any], idempotent: bool = False) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self.async_client.post(url, json=payload)
+                if not (idempotent and response.status_code in RETRYABLE_STATUS_CODES
+                        and attempt < self.max_retries):
+                    return response
+            except httpx.TransportError as e:
+                if not self._should_retry(e, idempotent, attempt):
+                    raise
+            await asyncio.sleep(self._delay(attempt))
+            attempt += 1
+
+    def _should_retry(self, error: httpx.TransportError, idempotent: bool, attempt: int) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return idempotent or isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+    def _delay(self, attempt: int) -> float:
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+
+tool_http_client = ToolHttpClient()
@@ -0,0 +1,306 @@
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12
+}
+CITY_ALIASES = {"bengaluru": "bangalore", "bombay": "mumbai", "madras": "chennai", "new delhi": "delhi", "cochin": "kochi"}
+# Words too generic to identify a cuisine on their own
+GENERIC_CUISINE_WORDS = {"indian", "cuisine", "food", "modern", "street", "coastal", "style"}
+BOOKING_WORDS = {"book", "booking", "reserve", "reservation", "table"}
+# Phrasing the rules cannot interpret safely; these messages go to the agent
+HEDGE_WORDS = {"not", "dont", "don't", "cancel", "change", "instead", "or", "either", "maybe", "unless"}
+
+MONTH_PATTERN = r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*"
+PHONE_PATTERN = re.compile(r"(?<![\w+])(\+\d{1,3}[\s-]?)?\d[\d\s-]{8,13}\d(?!\w)")
+DATE_PATTERNS = [
+    re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b"),
+    re.compile(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b"),
+    re.compile(rf"\b(\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?{MONTH_PATTERN}(?:\s+(\d{{4}}))?\b"),
+    re.compile(rf"\b{MONTH_PATTERN}\s+(\d{{1,2}})(?:st|nd|rd|th)?(?:,?\s+(\d{{4}}))?\b"),
+]
+RELATIVE_DATE_PATTERN = re.compile(r"\b(day after tomorrow|tomorrow|tmrw|tmr|today|tonight)\b")
+WEEKDAY_PATTERN = re.compile(rf"\b(?:(this|coming|next)\s+)?({'|'.join(WEEKDAYS)})\b")
+TIME_PATTERNS = [
+    re.compile(r"\b(\d{1,2})[:.](\d{2})\s*(am|pm)\b"),
+    re.compile(r"\b(\d{1,2})\s*(am|pm)\b"),
+    re.compile(r"\b(\d{1,2}):(\d{2})\b()"),
+    re.compile(r"\b(noon)\b"),
+]
+GUEST_PATTERNS = [
+    re.compile(r"\b(?:party|table|group) of (\d{1,2}|[a-z]+)\b"),
+    re.compile(r"\bfor (\d{1,2}|[a-z]+)(?: (?:people|persons|guests|pax|adults|of us))?\b"),
+    re.compile(r"\b(\d{1,2}|[a-z]+) (?:people|persons|guests|pax|adults)\b"),
+]
+NAME_PATTERN = re.compile(
+    r"\b(my name is|name is|name|under the name|under|i am|i'm|this is)\s*[:\-]?\s*"
+    r"([A-Za-z][A-Za-z'.-]*(?:\s+[A-Z][A-Za-z'.-]*)?)",
+    re.IGNORECASE
+)
+# After these the name must be capitalized, or "I am looking for..." would name "looking"
+CASUAL_NAME_TRIGGERS = {"i am", "i'm", "this is", "under"}
+
+
+@dataclass
+class BookingIntent:
+    """Every argument the search and reserve tools need, read from one message"""
+    city: str
+    locality: str
+    cuisine: str
+    date: str
+    time: str
+    guests: int
+    user_name: str
+    user_phone: str
+
+    def search_params(self) -> Dict:
+        return {"city": self.city, "locality": self.locality, "cuisine": self.cuisine,
+                "date": self.date, "time": self.time}
+
+    def reserve_payload(self, restaurant_id: str) -> Dict:
+        return {"restaurant_id": restaurant_id, "date": self.date, "time": self.time, "guests": self.guests,
+                "user_name": self.user_name, "user_phone": self.user_phone}
+
+
+class CatalogVocabulary:
+    """Known cities, localities and cuisines, indexed by normalized phrase"""
+
+    def __init__(self, terms: Iterable[Tuple[str, str, str]]):
+        self.cities: Dict[str, str] = {}
+        self.localities: Dict[str, Tuple[str, Set[str]]] = {}  # phrase -> (locality, cities)
+        self.cuisines: Dict[str, str] = {}
+
+        for city, locality, cuisine in terms:
+            for phrase in _variants(city):
+                self.cities[phrase] = city
+            for phrase in _variants(locality):
+                self.localities.setdefault(phrase, (locality, set()))[1].add(city)
+            for phrase in _variants(cuisine):
+                self.cuisines[phrase] = cuisine
+
+        for alias, phrase in CITY_ALIASES.items():
+            if phrase in self.cities:
+                self.cities.setdefault(alias, self.cities[phrase])
+
+        # Distinctive single words ("chinese", "biryani") also name a cuisine; the API matches substrings
+        place_words = {word for phrase in list(self.cities) + list(self.localities) for word in phrase.split()}
+        for phrase in list(self.cuisines):
+            for word in phrase.split():
+                if word not in GENERIC_CUISINE_WORDS and word not in place_words:
+                    self.cuisines.setdefault(word, word)
+
+
+class IntentParser:
+    """
+    Rule and dictionary based extractor for fully specified booking requests.
+
+    parse() returns a BookingIntent only when every field is found exactly
+    once and nothing in the message needs interpretation; anything else
+    returns None and the message goes to the agent.
+    """
+
+    def __init__(self, vocabulary: CatalogVocabulary):
+        self.vocabulary = vocabulary
+
+    def parse(self, message: str, today: Optional[date] = None) -> Optional[BookingIntent]:
+        today = today or date.today()
+        text = " ".join(message.split())
+        lowered = text.lower()
+        words = set(re.findall(r"[a-z']+", lowered)) | ({"?"} if "?" in lowered else set())
+
+        if not words & BOOKING_WORDS or words & HEDGE_WORDS or "?" in words:
+            return None
+
+        # Each extractor blanks out what it consumed so later patterns cannot reuse those digits,
+        # dates first since 2026-10-20 would otherwise pass for a phone number
+        res_date, lowered = self._extract_date(lowered, today)
+        user_phone, lowered = self._extract_phone(lowered)
+        res_time, lowered = self._extract_time(lowered)
+        guests, lowered = self._extract_guests(lowered)
+        user_name = self._extract_name(text)
+        place = self._extract_place(lowered)
+        cuisine = self._extract_cuisine(lowered)
+
+        if None in (user_phone, res_date, res_time, guests, user_name, place, cuisine):
+            return None
+
+        city, locality = place
+        return BookingIntent(city=city, locality=locality, cuisine=cuisine, date=res_date, time=res_time,
+                             guests=guests, user_name=user_name, user_phone=user_phone)
+
+    @staticmethod
+    def _extract_phone(text: str) -> Tuple[Optional[str], str]:
+        matches = list(PHONE_PATTERN.finditer(text))
+        if len(matches) != 1:
+            return None, text
+        match = matches[0]
+        digits = re.sub(r"\D", "", match.group(0))
+        if match.group(0).startswith("+"):
+            phone = f"+{digits}"
+        elif len(digits) == 10:
+            phone = f"+91{digits}"
+        else:
+            return None, text
+        return phone, _blank(text, match)
+
+    @staticmethod
+    def _extract_date(text: str, today: date) -> Tuple[Optional[str], str]:
+        found: List[date] = []
+
+        for match in RELATIVE_DATE_PATTERN.finditer(text):
+            offset = {"day after tomorrow": 2, "tomorrow": 1, "tmrw": 1, "tmr": 1}.get(match.group(1), 0)
+            found.append(today + timedelta(days=offset))
+        text = RELATIVE_DATE_PATTERN.sub(" ", text)
+
+        for match in WEEKDAY_PATTERN.finditer(text):
+            if match.group(1) == "next":
+                return None, text  # "next friday" could mean this week's or the one after
+            days_ahead = (WEEKDAYS.index(match.group(2)) - today.weekday()) % 7 or 7
+            found.append(today + timedelta(days=days_ahead))
+        text = WEEKDAY_PATTERN.sub(" ", text)
+
+        for index, pattern in enumerate(DATE_PATTERNS):
+            for match in pattern.finditer(text):
+                parsed = _absolute_date(index, match.groups(), today)
+                if parsed is None:
+                    return None, text
+                found.append(parsed)
+            text = pattern.sub(" ", text)
+
+        if len(set(found)) != 1:
+            return None, text
+        return found[0].isoformat(), text
+
+    @staticmethod
+    def _extract_time(text: str) -> Tuple[Optional[str], str]:
+        found: Set[Tuple[int, int]] = set()
+
+        for pattern in TIME_PATTERNS:
+            for match in pattern.finditer(text):
+                if match.group(1) == "noon":
+                    found.add((12, 0))
+                    continue
+                groups = match.groups()
+                hour = int(groups[0])
+                minute = int(groups[1]) if len(groups) == 3 else 0
+                meridiem = groups[-1]
+                if meridiem:
+                    if not 1 <= hour <= 12:
+                        return None, text
+                    hour = hour % 12 + (12 if meridiem == "pm" else 0)
+                if hour > 23 or minute > 59:
+                    return None, text
+                found.add((hour, minute))
+            text = pattern.sub(" ", text)
+
+        if len(found) != 1:
+            return None, text
+        hour, minute = found.pop()
+        return f"{hour:02d}:{minute:02d}", text
+
+    @staticmethod
+    def _extract_guests(text: str) -> Tuple[Optional[int], str]:
+        found: Set[int] = set()
+
+        def consume(match: re.Match) -> str:
+            value = match.group(1)
+            count = int(value) if value.isdigit() else NUMBER_WORDS.get(value)
+            if count is None:
+                return match.group(0)  # "for dinner", "for chinese": not a count, leave it for the other fields
+            found.add(count)
+            return " "
+
+        for pattern in GUEST_PATTERNS:
+            text = pattern.sub(consume, text)
+
+        if len(found) != 1:
+            return None, text
+        return found.pop(), text
+
+    def _extract_name(self, text: str) -> Optional[str]:
+        names = set()
+        for match in NAME_PATTERN.finditer(text):
+            trigger, name = match.group(1).lower(), match.group(2).strip(".'-")
+            if trigger in CASUAL_NAME_TRIGGERS and not name[:1].isupper():
+                continue
+            normalized = _normalize(name)
+            if normalized.split()[0] in BOOKING_WORDS | {"a", "the"} or normalized in self.vocabulary.cities \
+                    or normalized in self.vocabulary.localities:
+                continue
+            names.add(name)
+        if len(names) != 1:
+            return None
+        return names.pop()
+
+    def _extract_place(self, text: str) -> Optional[Tuple[str, str]]:
+        normalized = f" {_normalize(text)} "
+        cities = {city for phrase, city in self.vocabulary.cities.items() if f" {phrase} " in normalized}
+        phrases = _longest([phrase for phrase in self.vocabulary.localities if f" {phrase} " in normalized])
+        localities = {self.vocabulary.localities[phrase][0]: self.vocabulary.localities[phrase][1] for phrase in phrases}
+
+        if len(localities) != 1 or len(cities) > 1:
+            return None
+        locality, locality_cities = next(iter(localities.items()))
+
+        if cities:
+            city = cities.pop()
+            return (city, locality) if city in locality_cities else None
+        # No city named: the locality is enough when it belongs to one city only
+        return (next(iter(locality_cities)), locality) if len(locality_cities) == 1 else None
+
+    def _extract_cuisine(self, text: str) -> Optional[str]:
+        normalized = f" {_normalize(text)} "
+        phrases = _longest([phrase for phrase in self.vocabulary.cuisines if f" {phrase} " in normalized])
+        cuisines = {self.vocabulary.cuisines[phrase] for phrase in phrases}
+        if len(cuisines) != 1:
+            return None
+        return cuisines.pop()
+
+
+def _normalize(value: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", value.lower()).split())
+
+
+def _variants(term: str) -> Set[str]:
+    """Normalized phrase, plus initials joined up ("m g road" also as "mg road")"""
+    normalized = _normalize(term)
+    joined = re.sub(r"\b(\w) (?=\w\b)", r"\1", normalized)
+    return {normalized, joined} if normalized else set()
+
+
+def _longest(phrases: List[str]) -> List[str]:
+    """Keep only the longest matches, e.g. 'south indian' over a bare 'indian'"""
+    return [phrase for phrase in phrases if not any(phrase != other and f" {phrase} " in f" {other} " for other in phrases)]
+
+
+def _blank(text: str, match: re.Match) -> str:
+    return text[:match.start()] + " " + text[match.end():]
+
+
+def _absolute_date(pattern_index: int, groups: Tuple, today: date) -> Optional[date]:
+    try:
+        if pattern_index == 0:
+            return date(int(groups[0]), int(groups[1]), int(groups[2]))
+        if pattern_index == 1:
+            # Day first, as written in India
+            return date(int(groups[2]), int(groups[1]), int(groups[0]))
+
+        if pattern_index == 2:
+            day, month, year = groups
+        else:
+            month, day, year = groups
+        parsed = date(int(year) if year else today.year, MONTHS[month[:3]], int(day))
+        # "20th july" with no year means the next one
+        if not year and parsed < today:
+            parsed = parsed.replace(year=today.year + 1)
+        return parsed
+    except ValueError:
+        return None
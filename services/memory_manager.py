@@ -1,29 +1,117 @@
+import fnmatch
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
 import redis
 from langchain.memory import ConversationBufferWindowMemory
-from langchain_community.chat_message_histories import SQLChatMessageHistory
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+from services.metrics import MEMORY_SECONDS
+
+# Exchanges kept in the agent's context window
+WINDOW_SIZE = 10
+# Idle sessions expire after this many seconds (0 keeps them forever)
+SESSION_TTL_SECONDS = int(os.getenv("CHAT_SESSION_TTL", str(7 * 24 * 3600)))
+# Keys per SCAN call and per pipelined UNLINK
+SCAN_BATCH_SIZE = 500
+
+_pools: Dict[str, redis.ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_redis_client(redis_url: str) -> redis.Redis:
+    """Redis client backed by one shared connection pool per URL"""
+    with _pools_lock:
+        if redis_url not in _pools:
+            _pools[redis_url] = redis.ConnectionPool.from_url(redis_url)
+        return redis.Redis(connection_pool=_pools[redis_url])
+
+
+class RedisWindowChatMessageHistory(BaseChatMessageHistory):
+    """
+    Chat history in a capped Redis list.
+
+    Writes RPUSH and LTRIM in one pipeline so the list never holds more than
+    max_messages, and reads are a single LRANGE of that window. The cost per
+    turn stays O(window) however long the conversation runs. Each write also
+    refreshes the idle TTL and, when index_key is set, records the session id
+    in that set.
+    """
+
+    def __init__(self, session_id: str, client: redis.Redis, max_messages: int,
+                 key_prefix: str = "message_store:", ttl_seconds: int = SESSION_TTL_SECONDS,
+                 index_key: Optional[str] = None):
+        self.session_id = session_id
+        self.client = client
+        self.max_messages = max_messages
+        self.key_prefix = key_prefix
+        self.key = f"{key_prefix}{session_id}"
+        self.ttl_seconds = ttl_seconds
+        self.index_key = index_key
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        with MEMORY_SECONDS.time(operation="read"):
+            items = self.client.lrange(self.key, -self.max_messages, -1)
+        return messages_from_dict([json.loads(item) for item in items])
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        if not messages:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        pipe.rpush(self.key, *[json.dumps(message_to_dict(message)) for message in messages])
+        pipe.ltrim(self.key, -self.max_messages, -1)
+        if self.ttl_seconds:
+            pipe.expire(self.key, self.ttl_seconds)
+        if self.index_key:
+            pipe.sadd(self.index_key, self.session_id)
+            if self.ttl_seconds:
+                pipe.expire(self.index_key, self.ttl_seconds)
+        with MEMORY_SECONDS.time(operation="write"):
+            pipe.execute()
+
+    def clear(self) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.unlink(self.key)
+        if self.index_key:
+            pipe.srem(self.index_key, self.session_id)
+        pipe.execute()
 
 
 class MemoryManager:
-    def __init__(self, tenant_id: str, redis_url: str = "redis://localhost:6379/0"):
+    """
+    Chat memory for one session.
+
+    Pass owner_id to keep a per-owner set of session ids, so list_sessions can
+    read the set instead of scanning the keyspace.
+    """
+
+    def __init__(self, tenant_id: str, redis_url: str = "redis://localhost:6379/0",
+                 owner_id: Optional[str] = None):
         self.tenant_id = tenant_id
         self.redis_url = redis_url
-        self.redis_client = redis.Redis.from_url(self.redis_url)
+        self.owner_id = owner_id
+        self.redis_client = get_redis_client(self.redis_url)
         self.memory = self._build_memory()
 
     def _build_memory(self):
 
-        history = SQLChatMessageHistory(
+        # The window memory keeps the last k exchanges, i.e. 2k messages
+        history = RedisWindowChatMessageHistory(
             session_id=self.tenant_id,
-            connection_string=self.redis_url
+            client=self.redis_client,
+            max_messages=2 * WINDOW_SIZE,
+            index_key=self._index_key()
         )
 
-        print(history.messages)
-
         return ConversationBufferWindowMemory(
             memory_key="chat_history",
             chat_memory=history,
             return_messages=True,
-            k=10
+            k=WINDOW_SIZE
         )
 
 
@@ -32,14 +120,50 @@ class MemoryManager:
 
     def clear_memory(self):
         """Clear the current tenant's chat history."""
-        keys = self.redis_client.keys(f"{self.tenant_id}*")
-        for key in keys:
-            self.redis_client.delete(key)
+        self.memory.chat_memory.clear()
+        self._unlink(self.redis_client.scan_iter(match=f"{self.tenant_id}*", count=SCAN_BATCH_SIZE))
 
     def list_sessions(self, pattern="*"):
         """List all session keys matching a pattern (default: all)."""
-        return [key.decode("utf-8") for key in self.redis_client.keys(pattern)]
+        if self.owner_id:
+            return self._list_indexed_sessions(pattern)
+        return [key.decode("utf-8") for key in self.redis_client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE)]
 
     def delete_session(self, session_key: str):
         """Delete a specific session key manually."""
-        return self.redis_client.delete(session_key)
+        return self.redis_client.unlink(session_key)
+
+    def _list_indexed_sessions(self, pattern: str) -> List[str]:
+        """Session keys from the owner's index, dropping ids whose history has expired"""
+        key_prefix = self.memory.chat_memory.key_prefix
+        index_key = self._index_key()
+
+        session_ids = [member.decode("utf-8") for member in self.redis_client.sscan_iter(index_key, count=SCAN_BATCH_SIZE)]
+        keys = [f"{key_prefix}{session_id}" for session_id in session_ids]
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.exists(key)
+        alive = pipe.execute() if keys else []
+
+        expired = [session_id for session_id, exists in zip(session_ids, alive) if not exists]
+        if expired:
+            self.redis_client.srem(index_key, *expired)
+
+        return [key for key, exists in zip(keys, alive) if exists and fnmatch.fnmatchcase(key, pattern)]
+
+    def _index_key(self) -> Optional[str]:
+        return f"session_index:{self.owner_id}" if self.owner_id else None
+
+    def _unlink(self, keys: Iterable[bytes]) -> int:
+        """UNLINK keys in batches, one round trip per batch"""
+        removed = 0
+        batch = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                removed += self.redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            removed += self.redis_client.unlink(*batch)
+        return removed
@@ -0,0 +1,96 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from simulated_api.app.services.metrics import METRICS_ENABLED, Histogram, registry
+
+TURN_SECONDS = registry.histogram(
+    "assistant_turn_seconds", "Assistant turn latency by path (fast_path, agent or error)", ("path",)
+)
+AGENT_ITERATION_SECONDS = registry.histogram(
+    "assistant_agent_iteration_seconds", "Agent loop iteration latency: one LLM plan and the tools it called"
+)
+LLM_CALL_SECONDS = registry.histogram(
+    "assistant_llm_call_seconds", "Chat model call latency", ("model",)
+)
+TOOL_CALL_SECONDS = registry.histogram(
+    "assistant_tool_call_seconds", "Tool call latency by tool and memo result", ("tool", "cache")
+)
+MEMORY_SECONDS = registry.histogram(
+    "assistant_memory_seconds", "Redis chat memory latency", ("operation",)
+)
+
+
+class StageTimer(BaseCallbackHandler):
+    """
+    Observes LLM call, tool call and agent iteration latency for one turn.
+
+    An iteration starts when the agent starts or the previous iteration's
+    tools return, and ends when its own tools return or the agent finishes.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, Tuple[Histogram, float, Dict[str, str]]] = {}
+        self._iteration_started: Optional[float] = None
+        self._pending_tools = 0
+
+    def on_chain_start(self, serialized: Dict[str, Any], inputs: Dict[str, Any], *, run_id: UUID,
+                       parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        if parent_run_id is None:
+            self._iteration_started = time.perf_counter()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID,
+                            **kwargs: Any) -> None:
+        model = (kwargs.get("invocation_params") or {}).get("model_name") or (serialized or {}).get("name", "")
+        self._runs[run_id] = (LLM_CALL_SECONDS, time.perf_counter(), {"model": model})
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_agent_action(self, action: Any, **kwargs: Any) -> None:
+        self._pending_tools += 1
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID,
+                      metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        labels = {"tool": (serialized or {}).get("name", ""), "cache": (metadata or {}).get("tool_cache", "none")}
+        self._runs[run_id] = (TOOL_CALL_SECONDS, time.perf_counter(), labels)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+        self._tool_returned()
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+        self._tool_returned()
+
+    def on_agent_finish(self, finish: Any, **kwargs: Any) -> None:
+        self._end_iteration()
+
+    def _finish(self, run_id: UUID) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            histogram, started, labels = run
+            histogram.observe(time.perf_counter() - started, **labels)
+
+    def _tool_returned(self) -> None:
+        self._pending_tools = max(0, self._pending_tools - 1)
+        if not self._pending_tools:
+            self._end_iteration()
+
+    def _end_iteration(self) -> None:
+        if self._iteration_started is not None:
+            now = time.perf_counter()
+            AGENT_ITERATION_SECONDS.observe(now - self._iteration_started)
+            self._iteration_started = now
+
+
+def stage_callbacks() -> List[BaseCallbackHandler]:
+    """Callbacks timing one agent turn, none when metrics are disabled"""
+    return [StageTimer()] if METRICS_ENABLED else []
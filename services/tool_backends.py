@@ -0,0 +1,205 @@
+import asyncio
+import json
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from services.http_client import tool_http_client
+
+load_dotenv()
+
+
+RESTAURANT_SEARCH_URL = os.getenv('RESTAURANT_SEARCH_URL')
+TABLE_RESERVE_URL = os.getenv('TABLE_RESERVE_URL')
+# Distinct (city, locality, cuisine), read by the fast path for its vocabulary; defaults to the search URL's collection
+RESTAURANT_TERMS_URL = os.getenv('RESTAURANT_TERMS_URL') or (
+    RESTAURANT_SEARCH_URL.rsplit("/search", 1)[0] + "/terms" if RESTAURANT_SEARCH_URL else None
+)
+# Availability calendar; defaults to the search URL's collection
+RESTAURANT_AVAILABILITY_URL = os.getenv('RESTAURANT_AVAILABILITY_URL') or (
+    RESTAURANT_SEARCH_URL.rsplit("/search", 1)[0] + "/availability" if RESTAURANT_SEARCH_URL else None
+)
+# "http" calls the simulated API over the network, "inprocess" calls RestaurantManager directly
+TOOL_BACKEND = os.getenv("TOOL_BACKEND", "http")
+
+
+@dataclass
+class ToolResponse:
+    """Status code and decoded JSON body, whichever backend produced them"""
+    status_code: int
+    body: Any
+
+    @property
+    def is_success(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    def json(self) -> Any:
+        return self.body
+
+
+class HttpToolBackend:
+    """Calls the simulated API endpoints through the shared tool HTTP client"""
+
+    def search(self, params: Dict) -> ToolResponse:
+        return self._to_response(tool_http_client.post(RESTAURANT_SEARCH_URL, params, idempotent=True))
+
+    async def asearch(self, params: Dict) -> ToolResponse:
+        return self._to_response(await tool_http_client.apost(RESTAURANT_SEARCH_URL, params, idempotent=True))
+
+    def availability(self, params: Dict) -> ToolResponse:
+        return self._to_response(tool_http_client.post(RESTAURANT_AVAILABILITY_URL, params, idempotent=True))
+
+    async def aavailability(self, params: Dict) -> ToolResponse:
+        return self._to_response(await tool_http_client.apost(RESTAURANT_AVAILABILITY_URL, params, idempotent=True))
+
+    def reserve(self, payload: Dict) -> ToolResponse:
+        # Not idempotent: only retried when the connection could not be opened
+        return self._to_response(tool_http_client.post(TABLE_RESERVE_URL, payload))
+
+    async def areserve(self, payload: Dict) -> ToolResponse:
+        return self._to_response(await tool_http_client.apost(TABLE_RESERVE_URL, payload))
+
+    def catalog_terms(self) -> List[Tuple[str, str, str]]:
+        """Distinct (city, locality, cuisine) of active restaurants"""
+        response = tool_http_client.client.get(RESTAURANT_TERMS_URL)
+        response.raise_for_status()
+        return [(term["city"], term["locality"], term["cuisine"]) for term in response.json()]
+
+    @staticmethod
+    def _to_response(response) -> ToolResponse:
+        return ToolResponse(response.status_code, response.json())
+
+
+class InProcessToolBackend:
+    """
+    Calls AsyncRestaurantManager directly when the assistant and simulated_api
+    share a deployment, skipping HTTP and JSON round trips.
+
+    Responses mirror the status codes and bodies of restaurant_router, and the
+    search cache and catalog index behave as they do behind the API. All calls
+    run on one background event loop, because async engine connections belong
+    to the loop that opened them.
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        from simulated_api.database.setup import AsyncSessionLocal
+
+        self.session_factory = session_factory or AsyncSessionLocal
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="tool-backend-loop", daemon=True).start()
+
+    def search(self, params: Dict) -> ToolResponse:
+        return asyncio.run_coroutine_threadsafe(self._search(params), self._loop).result()
+
+    async def asearch(self, params: Dict) -> ToolResponse:
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._search(params), self._loop))
+
+    def availability(self, params: Dict) -> ToolResponse:
+        return asyncio.run_coroutine_threadsafe(self._availability(params), self._loop).result()
+
+    async def aavailability(self, params: Dict) -> ToolResponse:
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._availability(params), self._loop))
+
+    def reserve(self, payload: Dict) -> ToolResponse:
+        return asyncio.run_coroutine_threadsafe(self._reserve(payload), self._loop).result()
+
+    async def areserve(self, payload: Dict) -> ToolResponse:
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._reserve(payload), self._loop))
+
+    def catalog_terms(self) -> List[Tuple[str, str, str]]:
+        """Distinct (city, locality, cuisine) of active restaurants"""
+        return asyncio.run_coroutine_threadsafe(self._catalog_terms(), self._loop).result()
+
+    async def _catalog_terms(self) -> List[Tuple[str, str, str]]:
+        from simulated_api.app.services.async_restaurant_manager import AsyncRestaurantManager
+
+        async with self.session_factory() as db:
+            terms = await AsyncRestaurantManager(db).get_catalog_terms()
+        return [(term.city, term.locality, term.cuisine) for term in terms]
+
+    async def _search(self, params: Dict) -> ToolResponse:
+        from pydantic import ValidationError
+        from simulated_api.app.models.pydantics import RestaurantSearchRequest
+        from simulated_api.app.services.async_restaurant_manager import AsyncRestaurantManager
+
+        try:
+            search_params = RestaurantSearchRequest(**params)
+        except ValidationError as e:
+            return self._validation_error(e)
+
+        async with self.session_factory() as db:
+            try:
+                restaurants = await AsyncRestaurantManager(db).search_restaurants(search_params)
+            except ValueError as e:
+                return ToolResponse(400, {"detail": {"error": "Bad request", "details": str(e)}})
+            except Exception as e:
+                return ToolResponse(500, {"detail": {"error": "Server error", "details": str(e)}})
+
+        if not restaurants:
+            return ToolResponse(404, {"detail": {"restaurants": []}})
+        return ToolResponse(200, [restaurant.model_dump(mode="json") for restaurant in restaurants])
+
+    async def _availability(self, params: Dict) -> ToolResponse:
+        from pydantic import ValidationError
+        from simulated_api.app.models.pydantics import AvailabilityRequest
+        from simulated_api.app.services.async_restaurant_manager import AsyncRestaurantManager
+
+        try:
+            request = AvailabilityRequest(**params)
+        except ValidationError as e:
+            return self._validation_error(e)
+
+        async with self.session_factory() as db:
+            try:
+                calendar = await AsyncRestaurantManager(db).get_availability_calendar(request)
+            except ValueError as e:
+                return ToolResponse(400, {"detail": {"error": "Bad request", "details": str(e)}})
+            except Exception as e:
+                return ToolResponse(500, {"detail": {"error": "Server error", "details": str(e)}})
+
+        if not calendar:
+            return ToolResponse(404, {"detail": {"restaurants": []}})
+        return ToolResponse(200, [restaurant.model_dump(mode="json") for restaurant in calendar])
+
+    async def _reserve(self, payload: Dict) -> ToolResponse:
+        from pydantic import ValidationError
+        from simulated_api.app.models.pydantics import ReservationRequest, ReservationErrorResponse
+        from simulated_api.app.services.async_restaurant_manager import AsyncRestaurantManager
+
+        try:
+            reservation = ReservationRequest(**payload)
+        except ValidationError as e:
+            return self._validation_error(e)
+
+        async with self.session_factory() as db:
+            try:
+                result = await AsyncRestaurantManager(db).reserve_table(reservation)
+            except ValueError as e:
+                return ToolResponse(400, {"detail": {"error": "Bad request", "details": str(e)}})
+            except Exception as e:
+                return ToolResponse(500, {"detail": {"error": "Server error", "details": str(e)}})
+
+        if isinstance(result, ReservationErrorResponse):
+            status_code = {"invalid_restaurant": 404, "invalid_time": 400}.get(result.status, 409)
+            return ToolResponse(status_code, {"detail": result.model_dump(mode="json")})
+        return ToolResponse(200, result.model_dump(mode="json"))
+
+    @staticmethod
+    def _validation_error(error) -> ToolResponse:
+        """422 body in the shape FastAPI gives request body validation errors"""
+        errors = [{**detail, "loc": ["body", *detail["loc"]]} for detail in json.loads(error.json())]
+        return ToolResponse(422, {"detail": errors})
+
+
+@lru_cache(maxsize=1)
+def get_tool_backend():
+    """The tool backend selected by TOOL_BACKEND"""
+    if TOOL_BACKEND == "inprocess":
+        return InProcessToolBackend()
+    if TOOL_BACKEND == "http":
+        return HttpToolBackend()
+    raise ValueError(f"Unknown TOOL_BACKEND: {TOOL_BACKEND}")
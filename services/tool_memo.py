@@ -0,0 +1,183 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool, StructuredTool
+from pydantic import ValidationError
+
+TOOL_MEMO_ENABLED = os.getenv("TOOL_MEMO_ENABLED", "true").lower() == "true"
+TOOL_MEMO_TTL = float(os.getenv("TOOL_MEMO_TTL", "60"))
+# Conversations with live entries kept per process; the least recently used are dropped
+TOOL_MEMO_MAX_SESSIONS = int(os.getenv("TOOL_MEMO_MAX_SESSIONS", "10000"))
+
+MISS = object()
+
+# AgentExecutor does not pass a config to tools, so the conversation travels in a context variable
+_session_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("tool_memo_session", default=None)
+# Result found by MemoizedTool.run/arun, returned by _run/_arun in place of calling the function
+_memo_hit: contextvars.ContextVar[Any] = contextvars.ContextVar("tool_memo_hit", default=MISS)
+
+
+class ToolResultMemo:
+    """Tool outputs per conversation, keyed on tool name and validated arguments, with a short TTL"""
+
+    def __init__(self, ttl_seconds: float = TOOL_MEMO_TTL, max_sessions: int = TOOL_MEMO_MAX_SESSIONS):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, Dict[Tuple[str, str], Tuple[float, Any]]]" = OrderedDict()
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator[None]:
+        """Memoize tool calls made inside the block under session_id"""
+        token = _session_id.set(session_id)
+        try:
+            yield
+        finally:
+            _session_id.reset(token)
+
+    def get(self, tool_name: str, args_key: str) -> Any:
+        session_id = _session_id.get()
+        if session_id is None:
+            return MISS
+
+        with self._lock:
+            entries = self._sessions.get(session_id)
+            item = entries.get((tool_name, args_key)) if entries else None
+            if item is None:
+                return MISS
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del entries[(tool_name, args_key)]
+                return MISS
+            self._sessions.move_to_end(session_id)
+            return value
+
+    def set(self, tool_name: str, args_key: str, value: Any) -> None:
+        session_id = _session_id.get()
+        if session_id is None:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            entries = self._sessions.setdefault(session_id, {})
+            # Drop this session's expired entries while we hold it
+            for key in [key for key, (expires_at, _) in entries.items() if expires_at < now]:
+                del entries[key]
+            entries[(tool_name, args_key)] = (now + self.ttl_seconds, value)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def invalidate(self, tool_name: str) -> None:
+        """Forget the current session's results of one tool"""
+        session_id = _session_id.get()
+        if session_id is None:
+            return
+
+        with self._lock:
+            entries = self._sessions.get(session_id)
+            if entries:
+                for key in [key for key in entries if key[0] == tool_name]:
+                    del entries[key]
+
+
+tool_result_memo = ToolResultMemo()
+
+
+class MemoizedTool(StructuredTool):
+    """
+    StructuredTool whose outputs are memoized per conversation.
+
+    The key is the arguments after validation by args_schema, with text
+    fields case-folded, so "Mumbai" and " mumbai" share an entry. Each run
+    carries tool_cache=hit|miss in its metadata, which shows up in traces and
+    in astream_events. Only outputs accepted by should_cache are stored.
+    """
+
+    should_cache: Callable[[Any], bool] = lambda output: True
+
+    def run(self, tool_input, *args, metadata: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        args_key = self._args_key(tool_input)
+        if args_key is None:
+            return super().run(tool_input, *args, metadata=metadata, **kwargs)
+
+        cached = tool_result_memo.get(self.name, args_key)
+        token = _memo_hit.set(cached)
+        try:
+            output = super().run(tool_input, *args, metadata=self._memo_metadata(metadata, cached), **kwargs)
+        finally:
+            _memo_hit.reset(token)
+
+        if cached is MISS and self.should_cache(output):
+            tool_result_memo.set(self.name, args_key, output)
+        return output
+
+    async def arun(self, tool_input, *args, metadata: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        args_key = self._args_key(tool_input)
+        if args_key is None:
+            return await super().arun(tool_input, *args, metadata=metadata, **kwargs)
+
+        cached = tool_result_memo.get(self.name, args_key)
+        token = _memo_hit.set(cached)
+        try:
+            output = await super().arun(tool_input, *args, metadata=self._memo_metadata(metadata, cached), **kwargs)
+        finally:
+            _memo_hit.reset(token)
+
+        if cached is MISS and self.should_cache(output):
+            tool_result_memo.set(self.name, args_key, output)
+        return output
+
+    # BaseTool inspects these signatures for config and run_manager, so they stay explicit
+    def _run(self, *args, config: RunnableConfig,
+             run_manager: Optional[CallbackManagerForToolRun] = None, **kwargs) -> Any:
+        cached = _memo_hit.get()
+        if cached is not MISS:
+            return cached
+        return super()._run(*args, config=config, run_manager=run_manager, **kwargs)
+
+    async def _arun(self, *args, config: RunnableConfig,
+                    run_manager: Optional[AsyncCallbackManagerForToolRun] = None, **kwargs) -> Any:
+        cached = _memo_hit.get()
+        if cached is not MISS:
+            return cached
+        return await super()._arun(*args, config=config, run_manager=run_manager, **kwargs)
+
+    def _args_key(self, tool_input) -> Optional[str]:
+        """Validated arguments as a stable string, or None when the call cannot be memoized"""
+        if not TOOL_MEMO_ENABLED or _session_id.get() is None or not isinstance(tool_input, dict):
+            return None
+        try:
+            validated = self.args_schema(**tool_input).model_dump()
+        except ValidationError:
+            return None  # Let the tool report the error as usual
+        normalized = {
+            key: " ".join(value.casefold().split()) if isinstance(value, str) else value
+            for key, value in validated.items()
+        }
+        return json.dumps(normalized, sort_keys=True, default=str)
+
+    @staticmethod
+    def _memo_metadata(metadata: Optional[Dict[str, Any]], cached: Any) -> Dict[str, Any]:
+        return {**(metadata or {}), "tool_cache": "miss" if cached is MISS else "hit"}
+
+
+def memoized(tool: BaseTool, should_cache: Callable[[Any], bool] = lambda output: True) -> MemoizedTool:
+    """Copy of a @tool StructuredTool with per-conversation memoization"""
+    return MemoizedTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        return_direct=tool.return_direct,
+        func=tool.func,
+        coroutine=tool.coroutine,
+        should_cache=should_cache
+    )
@@ -1,23 +1,28 @@
-import os
-from typing import Dict
+from typing import Any, Dict, List, Optional
 
-from dotenv import load_dotenv
-import requests
 from langchain.tools import tool
 from datetime import date as dt_date
-from models.tool_model import RestaurantSearchArgs, TableReserveArgs
+from models.tool_model import RestaurantAvailabilityArgs, RestaurantSearchArgs, TableReserveArgs
+from services.tool_backends import ToolResponse, get_tool_backend
+from services.tool_memo import memoized, tool_result_memo
 
-load_dotenv()
-
-
-RESTAURANT_SEARCH_URL = os.getenv('RESTAURANT_SEARCH_URL')
-TABLE_RESERVE_URL = os.getenv('TABLE_RESERVE_URL')
+# Fields of a search result the agent needs to present and book a restaurant
+SEARCH_RESULT_FIELDS = ("id", "name", "address", "rating", "available_slots")
+# Present only in nearby searches
+NEARBY_RESULT_FIELDS = ("distance_km",)
+# Fields of a restaurant in an availability result, besides its free times
+AVAILABILITY_RESULT_FIELDS = ("id", "name", "address")
+# Fields of a confirmed reservation worth repeating to the user
+RESERVATION_FIELDS = ("reservation_id", "table_number", "instructions")
 
 
 @tool("search_restaurant",
       args_schema=RestaurantSearchArgs,
-      description=f"Search for available restaurants based on city, locality, cuisine, date, and time: Note: Today's date is {dt_date.today().isoformat()})")
-def search_restaurant_tool(city: str, locality: str, cuisine: str, date: str, time: str) -> Dict:
+      description=f"Search for available restaurants based on city, locality, cuisine, date, and time, "
+                  f"or near the user's latitude and longitude: Note: Today's date is {dt_date.today().isoformat()})")
+def search_restaurant_tool(date: str, time: str, city: Optional[str] = None, locality: Optional[str] = None,
+                           cuisine: Optional[str] = None, latitude: Optional[float] = None,
+                           longitude: Optional[float] = None, radius_km: Optional[float] = None) -> Dict:
     """
         This tool searches for available restaurants based on the user's preferences.
 
@@ -27,39 +32,161 @@ def search_restaurant_tool(city: str, locality: str, cuisine: str, date: str, ti
             - cuisine: Preferred cuisine type (e.g., Italian, Indian)
             - date: Reservation date in YYYY-MM-DD format (must be a valid future date)
             - time: Reservation time in 24-hour HH:MM format
+            - latitude, longitude: User's location, to search nearby instead of by city and locality
+            - radius_km: Maximum distance from the location; the nearest restaurants when omitted
 
         Returns:
-            dict: JSON response from the restaurant search API or an error message.
+            dict: Matching restaurants with the fields needed to book, or an error message.
 
         Raises:
             Exception: If the external API call fails or response parsing fails
         """
     try:
-        params = {
-            "city": city,
-            "locality": locality,
-            "cuisine": cuisine,
-            "date": date,
-            "time": time
-        }
+        params = _search_params(city, locality, cuisine, date, time, latitude, longitude, radius_km)
+        response = get_tool_backend().search(params)
+        return _search_result(response)
+
+    except Exception as e:
+        return {"error": "Exception", "details": str(e)}
+
+
+async def _asearch_restaurant(date: str, time: str, city: Optional[str] = None, locality: Optional[str] = None,
+                              cuisine: Optional[str] = None, latitude: Optional[float] = None,
+                              longitude: Optional[float] = None, radius_km: Optional[float] = None) -> Dict:
+    """Async variant of search_restaurant_tool, used by ainvoke"""
+    try:
+        params = _search_params(city, locality, cuisine, date, time, latitude, longitude, radius_km)
+        response = await get_tool_backend().asearch(params)
+        return _search_result(response)
+
+    except Exception as e:
+        return {"error": "Exception", "details": str(e)}
+
+
+def _search_params(city: Optional[str], locality: Optional[str], cuisine: Optional[str], date: str, time: str,
+                   latitude: Optional[float] = None, longitude: Optional[float] = None,
+                   radius_km: Optional[float] = None) -> Dict:
+    params = {
+        "city": city,
+        "locality": locality,
+        "cuisine": cuisine,
+        "date": date,
+        "time": time
+    }
+    # Sent only when set, so text searches keep their original request body
+    nearby = {"latitude": latitude, "longitude": longitude, "radius_km": radius_km}
+    params.update({key: value for key, value in nearby.items() if value is not None})
+    return params
 
-        headers = {
-            "accept": "application/json",
-            "Content-Type": "application/json"
+
+def _search_result(response: ToolResponse) -> Dict:
+    """Only the fields the agent uses, to keep tool observations short in the prompt"""
+    if response.is_success:
+        return {
+            "restaurants": [{**{field: restaurant.get(field) for field in SEARCH_RESULT_FIELDS},
+                             **{field: restaurant[field] for field in NEARBY_RESULT_FIELDS
+                                if restaurant.get(field) is not None}}
+                            for restaurant in response.json()],
+            # available_slots are other open times; the requested one is checked when reserving
+            "next_action": "Reserve the best match with reserve_table, using its id and the user's details."
         }
+    if response.status_code == 404:
+        return {"restaurants": [], "next_action": "Ask the user to change the locality, cuisine, date or time."}
+    return {"error": _error_message(response.json())}
+
 
-        response = requests.post(RESTAURANT_SEARCH_URL, json=params, headers=headers)
-        tool_motive = {
-                        "top_choice": response.json(),
-                        "next_action": "Please use the reserve_table tool using this restaurant_id and user details from the query. "
-                                        "as your final goal is to reserve a table."
-                      }
-        return tool_motive
+@tool("restaurant_availability",
+      args_schema=RestaurantAvailabilityArgs,
+      description="Find when a restaurant has free tables over several days in one call "
+                  "(e.g., 'when is Trishna free this week?'). Returns the free start times per date. "
+                  f"Note: Today's date is {dt_date.today().isoformat()})")
+def restaurant_availability_tool(restaurant_name: str, start_date: str, city: Optional[str] = None,
+                                 days: int = 7, guests: int = 2) -> Dict:
+    """
+    Free times of a restaurant over a range of dates.
+
+    Args:
+        - restaurant_name: Name of the restaurant, or part of it
+        - start_date: First date in YYYY-MM-DD format
+        - city: City of the restaurant, when the name is ambiguous
+        - days: Number of days to check from start_date
+        - guests: Party size; times with fewer free seats are left out
+
+    Returns:
+        dict: Free start times per date for each matching restaurant, or an error message.
+    """
+    try:
+        params = _availability_params(restaurant_name, start_date, city, days)
+        response = get_tool_backend().availability(params)
+        return _availability_result(response, guests)
 
     except Exception as e:
         return {"error": "Exception", "details": str(e)}
 
 
+async def _arestaurant_availability(restaurant_name: str, start_date: str, city: Optional[str] = None,
+                                    days: int = 7, guests: int = 2) -> Dict:
+    """Async variant of restaurant_availability_tool, used by ainvoke"""
+    try:
+        params = _availability_params(restaurant_name, start_date, city, days)
+        response = await get_tool_backend().aavailability(params)
+        return _availability_result(response, guests)
+
+    except Exception as e:
+        return {"error": "Exception", "details": str(e)}
+
+
+def _availability_params(restaurant_name: str, start_date: str, city: Optional[str], days: int) -> Dict:
+    params = {"name": restaurant_name, "start_date": start_date, "days": days}
+    if city:
+        params["city"] = city
+    return params
+
+
+def _availability_result(response: ToolResponse, guests: int) -> Dict:
+    """Free times per date as hour ranges, e.g. "12:00-15:00, 21:00", to keep the observation short"""
+    if response.is_success:
+        return {
+            "restaurants": [
+                {
+                    **{field: restaurant.get(field) for field in AVAILABILITY_RESULT_FIELDS},
+                    "free_times": {
+                        day["date"]: _hour_ranges([slot for slot, seats in day["slots"].items() if seats >= guests])
+                        for day in restaurant["days"]
+                    }
+                }
+                for restaurant in response.json()
+            ],
+            "next_action": "Times are hourly start times and ranges include both ends. "
+                           "Offer them to the user, then book with reserve_table."
+        }
+    if response.status_code == 404:
+        return {"restaurants": [], "next_action": "Ask the user to check the restaurant name or city."}
+    return {"error": _error_message(response.json())}
+
+
+def _hour_ranges(slots: List[str]) -> str:
+    """Collapse runs of consecutive hourly "HH:00" slots into "start-end" ranges"""
+    hours = sorted(int(slot.split(":")[0]) for slot in slots)
+    if not hours:
+        return "full"
+
+    runs = [[hours[0], hours[0]]]
+    for hour in hours[1:]:
+        if hour == runs[-1][1] + 1:
+            runs[-1][1] = hour
+        else:
+            runs.append([hour, hour])
+    ranges = [f"{start:02d}:00" if start == end else f"{start:02d}:00-{end:02d}:00" for start, end in runs]
+    return ", ".join(ranges)
+
+
+def forget_availability() -> None:
+    """Drop this conversation's memoized search and availability results once a booking is attempted"""
+    tool_result_memo.invalidate(search_restaurant_tool.name)
+    tool_result_memo.invalidate(restaurant_availability_tool.name)
+
+
 @tool(
     "reserve_table",
     return_direct=False,
@@ -87,45 +214,77 @@ def reserve_table_tool(
         - user_phone: User's phone number (e.g., +91XXXXXXXXXX)
 
     Returns:
-        dict: JSON response from the restaurant reservation API with confirmation or error details.
+        dict: Reservation id, table and instructions, or the reason it could not be booked.
 
     Raises:
         Exception: If the external API call fails or the response is invalid.
     """
     try:
-        payload = {
-            "restaurant_id": restaurant_id,
-            "date": date,
-            "time": time,
-            "guests": guests,
-            "user_name": user_name,
-            "user_phone": user_phone
-        }
+        payload = _reserve_payload(restaurant_id, date, time, guests, user_name, user_phone)
+        # Availability changes once a booking is attempted, so this conversation's searches are stale
+        forget_availability()
+        response = get_tool_backend().reserve(payload)
+        return _reserve_result(response)
 
-        headers = {
-            "accept": "application/json",
-            "Content-Type": "application/json"
-        }
+    except Exception as e:
+        return {"error": "Exception", "details": str(e)}
 
-        response = requests.post(TABLE_RESERVE_URL, json=payload, headers=headers)
-        if response.ok:
-            tool_motive = {
-                "status": "success",
-                "reservation_response": response.json()
-            }
-            return f"{tool_motive}"
-        else:
-            tool_motive = {
-                "status": "error",
-                "reservation_response": response.json()
-            }
-            return f"{tool_motive}"
 
+async def _areserve_table(restaurant_id: str, date: str, time: str, guests: int, user_name: str, user_phone: str):
+    """Async variant of reserve_table_tool, used by ainvoke"""
+    try:
+        payload = _reserve_payload(restaurant_id, date, time, guests, user_name, user_phone)
+        forget_availability()
+        response = await get_tool_backend().areserve(payload)
+        return _reserve_result(response)
 
     except Exception as e:
         return {"error": "Exception", "details": str(e)}
 
 
+def _is_cacheable_search(result: Dict) -> bool:
+    # Only results listing restaurants; errors and empty searches or calendars run again
+    return isinstance(result, dict) and bool(result.get("restaurants"))
+
+
+def _reserve_payload(restaurant_id: str, date: str, time: str, guests: int, user_name: str, user_phone: str) -> Dict:
+    return {
+        "restaurant_id": restaurant_id,
+        "date": date,
+        "time": time,
+        "guests": guests,
+        "user_name": user_name,
+        "user_phone": user_phone
+    }
+
+
+def _reserve_result(response: ToolResponse) -> Dict:
+    body = response.json()
+    if response.is_success:
+        return {"status": "success", **{field: body.get(field) for field in RESERVATION_FIELDS}}
+
+    detail = body.get("detail") if isinstance(body, dict) else None
+    if isinstance(detail, dict) and "error_message" in detail:
+        # no_availability / invalid_restaurant / invalid_time, with the alternatives in the message
+        return {"status": detail.get("status", "error"), "message": detail["error_message"]}
+    return {"status": "error", "message": _error_message(body)}
+
+
+def _error_message(body: Any) -> str:
+    """One line out of an API error body, FastAPI validation errors included"""
+    detail = body.get("detail", body) if isinstance(body, dict) else body
+    if isinstance(detail, list):
+        return "; ".join(f"{error['loc'][-1]}: {error['msg']}" for error in detail if isinstance(error, dict))
+    if isinstance(detail, dict):
+        return str(detail.get("details") or detail.get("error_message") or detail.get("error") or detail)
+    return str(detail)
 
 
+# Native coroutines so ainvoke does not fall back to a worker thread
+search_restaurant_tool.coroutine = _asearch_restaurant
+restaurant_availability_tool.coroutine = _arestaurant_availability
+reserve_table_tool.coroutine = _areserve_table
 
+# Repeated searches within a conversation reuse the first result; reserve_table is never memoized
+search_restaurant_tool = memoized(search_restaurant_tool, should_cache=_is_cacheable_search)
+restaurant_availability_tool = memoized(restaurant_availability_tool, should_cache=_is_cacheable_search)
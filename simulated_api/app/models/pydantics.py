@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Dict, List, Optional, Union
 from datetime import datetime, date
 
+from simulated_api.app.services.geo import GEO_MAX_RADIUS_KM
+
 
 class RestaurantBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=200)
@@ -15,10 +17,17 @@ class RestaurantBase(BaseModel):
     email: Optional[str] = None
     opening_time: Optional[str] = Field(default="09:00", pattern=r"^([01]?[0-9]|2[0-3]):[0-5][0-9]$")
     closing_time: Optional[str] = Field(default="23:00", pattern=r"^([01]?[0-9]|2[0-3]):[0-5][0-9]$")
+    latitude: Optional[float] = Field(default=None, ge=-90.0, le=90.0)
+    longitude: Optional[float] = Field(default=None, ge=-180.0, le=180.0)
 
 
 class RestaurantCreate(RestaurantBase):
-    pass
+
+    @model_validator(mode="after")
+    def validate_coordinates(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be given together")
+        return self
 
 
 class RestaurantResponse(RestaurantBase):
@@ -32,12 +41,56 @@ class RestaurantResponse(RestaurantBase):
     }
 
 
+class RestaurantPage(BaseModel):
+    items: List[RestaurantResponse]
+    next_cursor: Optional[str] = None
+
+
+class CatalogTerm(BaseModel):
+    city: str
+    locality: str
+    cuisine: str
+
+
+class BulkImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkImportRowError] = []
+    errors_truncated: bool = False
+
+
 class RestaurantSearchRequest(BaseModel):
-    city: str = Field(..., min_length=1)
-    locality: str = Field(..., min_length=1)
-    cuisine: str = Field(..., min_length=1)
+    # Required for a text search; with coordinates they only narrow the nearby results
+    city: Optional[str] = Field(default=None, min_length=1)
+    locality: Optional[str] = Field(default=None, min_length=1)
+    cuisine: Optional[str] = Field(default=None, min_length=1)
     date: str = Field(..., pattern=r"^\d{4}-\d{2}-\d{2}$")
     time: str = Field(..., pattern=r"^([01]?[0-9]|2[0-3]):[0-5][0-9]$")
+    # "Near me": restaurants within radius_km, or the nearest ones when it is omitted
+    latitude: Optional[float] = Field(default=None, ge=-90.0, le=90.0)
+    longitude: Optional[float] = Field(default=None, ge=-180.0, le=180.0)
+    radius_km: Optional[float] = Field(default=None, gt=0.0, le=GEO_MAX_RADIUS_KM)
+    limit: int = Field(default=5, ge=1, le=20)
+
+    @property
+    def is_nearby(self) -> bool:
+        return self.latitude is not None
+
+    @model_validator(mode="after")
+    def validate_mode(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be given together")
+        if not self.is_nearby:
+            if self.radius_km is not None:
+                raise ValueError("radius_km needs latitude and longitude")
+            if not (self.city and self.locality and self.cuisine):
+                raise ValueError("city, locality and cuisine are required unless latitude and longitude are given")
+        return self
 
     @field_validator('date')
     @classmethod
@@ -57,6 +110,54 @@ class RestaurantSearchResponse(BaseModel):
     rating: float
     cuisine: str
     available_slots: Optional[List[str]] = []
+    distance_km: Optional[float] = None  # Set by nearby searches
+
+
+class BatchSearchRequest(BaseModel):
+    searches: List[RestaurantSearchRequest] = Field(..., min_length=1, max_length=20)
+
+
+class BatchSearchResponse(BaseModel):
+    results: List[List[RestaurantSearchResponse]]  # One list per search, in request order
+
+
+class AvailabilityRequest(BaseModel):
+    # Either restaurant ids, or a name matched like search terms (best rated matches first)
+    restaurant_ids: Optional[List[str]] = Field(default=None, min_length=1, max_length=20)
+    name: Optional[str] = Field(default=None, min_length=1)
+    city: Optional[str] = Field(default=None, min_length=1)
+    start_date: str = Field(..., pattern=r"^\d{4}-\d{2}-\d{2}$")
+    days: int = Field(default=7, ge=1, le=31)
+
+    @field_validator('start_date')
+    @classmethod
+    def validate_date(cls, v):
+        try:
+            parsed_date = datetime.strptime(v, "%Y-%m-%d").date()
+            if parsed_date < date.today():
+                raise ValueError("Date must be today or in the future")
+            return v
+        except ValueError as e:
+            raise ValueError(f"Invalid date format or date in past: {e}")
+
+    @model_validator(mode="after")
+    def validate_restaurants(self):
+        if not self.restaurant_ids and not self.name:
+            raise ValueError("restaurant_ids or name is required")
+        return self
+
+
+class DayAvailability(BaseModel):
+    date: str
+    slots: Dict[str, int]  # "HH:MM" -> seats left
+
+
+class RestaurantAvailability(BaseModel):
+    id: str
+    name: str
+    address: str
+    total_capacity: int
+    days: List[DayAvailability]
 
 
 class ReservationRequest(BaseModel):
@@ -92,6 +193,20 @@ class ReservationErrorResponse(BaseModel):
     error_message: str
 
 
+class BatchReservationRequest(BaseModel):
+    reservations: List[ReservationRequest] = Field(..., min_length=1, max_length=50)
+    # all_or_nothing books every reservation or none; best_effort books those that fit
+    mode: str = Field(default="best_effort", pattern=r"^(all_or_nothing|best_effort)$")
+
+
+class BatchReservationResponse(BaseModel):
+    mode: str
+    confirmed: int
+    failed: int
+    # Per reservation, in request order: a confirmed reservation or why it was not booked
+    results: List[Union[ReservationResponse, ReservationErrorResponse]]
+
+
 class ErrorResponse(BaseModel):
     error: str
     details: str
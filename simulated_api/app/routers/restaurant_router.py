@@ -1,14 +1,19 @@
-from typing import List
+from typing import AsyncIterator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from simulated_api.app.models.pydantics import (
     RestaurantCreate, RestaurantResponse, RestaurantSearchRequest,
-    RestaurantSearchResponse, ReservationRequest, ReservationErrorResponse
+    RestaurantSearchResponse, ReservationRequest, ReservationErrorResponse, BulkImportResponse,
+    RestaurantPage, AvailabilityRequest, RestaurantAvailability, BatchSearchRequest, BatchSearchResponse,
+    BatchReservationRequest, BatchReservationResponse, ReservationResponse, CatalogTerm
 )
+from simulated_api.app.services.async_restaurant_manager import AsyncRestaurantManager
+from simulated_api.app.services.bulk_import import import_restaurants, is_supported_content_type
 from simulated_api.app.services.restaurant_manager import RestaurantManager
-from simulated_api.database.setup import get_db
+from simulated_api.database.setup import AsyncSessionLocal, get_async_db
 
 restaurant_router = APIRouter(prefix="/api/v1", tags=["restaurants"])
 
@@ -16,12 +21,12 @@ restaurant_router = APIRouter(prefix="/api/v1", tags=["restaurants"])
 @restaurant_router.post("/restaurants", response_model=RestaurantResponse)
 async def create_restaurant(
         restaurant: RestaurantCreate,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new restaurant"""
     try:
-        manager = RestaurantManager(db)
-        db_restaurant = manager.create_restaurant(restaurant)
+        manager = AsyncRestaurantManager(db)
+        db_restaurant = await manager.create_restaurant(restaurant)
         return db_restaurant
     except Exception as e:
         raise HTTPException(
@@ -30,13 +35,73 @@ async def create_restaurant(
         )
 
 
-@restaurant_router.get("/restaurants", response_model=List[RestaurantResponse])
-async def get_restaurants(db: Session = Depends(get_db)):
-    """Get all restaurants"""
+@restaurant_router.post("/restaurants/bulk", response_model=BulkImportResponse)
+async def bulk_import_restaurants(
+        request: Request,
+        db: AsyncSession = Depends(get_async_db)
+):
+    """Import restaurants from a streamed NDJSON (application/x-ndjson) or CSV (text/csv) body"""
+    content_type = request.headers.get("content-type", "")
+    if not is_supported_content_type(content_type):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail={"error": "Unsupported media type", "details": "Use application/x-ndjson or text/csv"}
+        )
+
     try:
-        manager = RestaurantManager(db)
-        restaurants = manager.get_all_restaurants()
-        return restaurants
+        manager = AsyncRestaurantManager(db)
+        return await import_restaurants(manager, request.stream(), content_type)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "Server error", "details": str(e)}
+        )
+
+
+@restaurant_router.get("/restaurants", response_model=RestaurantPage)
+async def get_restaurants(
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        format: str = Query("json", pattern="^(json|ndjson)$"),
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get restaurants a page at a time, ordered by rating.
+
+    Pass next_cursor back as cursor for the following page. format=ndjson
+    streams every restaurant from the cursor onwards, one JSON object per line.
+    """
+    try:
+        if cursor:
+            RestaurantManager.decode_cursor(cursor)
+
+        if format == "ndjson":
+            return StreamingResponse(_stream_restaurants_ndjson(cursor), media_type="application/x-ndjson")
+
+        manager = AsyncRestaurantManager(db)
+        rows, next_cursor = await manager.get_restaurants_page(limit, cursor)
+        return RestaurantPage(
+            items=[RestaurantResponse.model_validate(row) for row in rows],
+            next_cursor=next_cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Bad request", "details": str(e)}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "Server error", "details": str(e)}
+        )
+
+
+@restaurant_router.get("/restaurants/terms", response_model=List[CatalogTerm])
+async def get_catalog_terms(db: AsyncSession = Depends(get_async_db)):
+    """Distinct (city, locality, cuisine) of active restaurants, the vocabulary searches are matched against"""
+    try:
+        manager = AsyncRestaurantManager(db)
+        return await manager.get_catalog_terms()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -47,12 +112,12 @@ async def get_restaurants(db: Session = Depends(get_db)):
 @restaurant_router.post("/restaurants/search", response_model=List[RestaurantSearchResponse])
 async def search_restaurants(
         search_params: RestaurantSearchRequest,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """Search restaurants based on criteria"""
     try:
-        manager = RestaurantManager(db)
-        restaurants = manager.search_restaurants(search_params)
+        manager = AsyncRestaurantManager(db)
+        restaurants = await manager.search_restaurants(search_params)
 
         if not restaurants:
             raise HTTPException(
@@ -75,15 +140,68 @@ async def search_restaurants(
         )
 
 
+@restaurant_router.post("/restaurants/search:batch", response_model=BatchSearchResponse)
+async def search_restaurants_batch(
+        request: BatchSearchRequest,
+        db: AsyncSession = Depends(get_async_db)
+):
+    """Run several searches in one request; a search with no matches gets an empty list"""
+    try:
+        manager = AsyncRestaurantManager(db)
+        return BatchSearchResponse(results=await manager.search_restaurants_batch(request.searches))
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Bad request", "details": str(e)}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "Server error", "details": str(e)}
+        )
+
+
+@restaurant_router.post("/restaurants/availability", response_model=List[RestaurantAvailability])
+async def get_availability(
+        request: AvailabilityRequest,
+        db: AsyncSession = Depends(get_async_db)
+):
+    """Seats left in every hourly slot of the matching restaurants over a date range"""
+    try:
+        manager = AsyncRestaurantManager(db)
+        calendar = await manager.get_availability_calendar(request)
+
+        if not calendar:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"restaurants": []}
+            )
+        return calendar
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Bad request", "details": str(e)}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "Server error", "details": str(e)}
+        )
+
+
 @restaurant_router.post("/restaurants/reserve")
 async def reserve_table(
         reservation: ReservationRequest,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """Reserve a table at a restaurant"""
     try:
-        manager = RestaurantManager(db)
-        result = manager.reserve_table(reservation)
+        manager = AsyncRestaurantManager(db)
+        result = await manager.reserve_table(reservation)
 
         if isinstance(result, ReservationErrorResponse):
             if result.status == "invalid_restaurant":
@@ -91,6 +209,11 @@ async def reserve_table(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=result.model_dump()
                 )
+            elif result.status == "invalid_time":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=result.model_dump()
+                )
             else:
                 raise HTTPException(
                     status_code=status.HTTP_409_CONFLICT,
@@ -112,12 +235,46 @@ async def reserve_table(
         )
 
 
+@restaurant_router.post("/restaurants/reserve:batch", response_model=BatchReservationResponse)
+async def reserve_tables(
+        request: BatchReservationRequest,
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Reserve several tables in one transaction.
+
+    Responds 200 with a result per reservation; in all_or_nothing mode either
+    every result is confirmed or none is.
+    """
+    try:
+        manager = AsyncRestaurantManager(db)
+        results = await manager.reserve_tables(request.reservations, request.mode == "all_or_nothing")
+        confirmed = sum(isinstance(result, ReservationResponse) for result in results)
+        return BatchReservationResponse(
+            mode=request.mode,
+            confirmed=confirmed,
+            failed=len(results) - confirmed,
+            results=results
+        )
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Bad request", "details": str(e)}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "Server error", "details": str(e)}
+        )
+
+
 @restaurant_router.post("/restaurants/populate", response_model=List[RestaurantResponse])
-async def populate_restaurants(db: Session = Depends(get_db)):
+async def populate_restaurants(db: AsyncSession = Depends(get_async_db)):
     """Populate database with sample restaurants"""
     try:
-        manager = RestaurantManager(db)
-        restaurants = manager.populate_sample_restaurants()
+        manager = AsyncRestaurantManager(db)
+        restaurants = await manager.populate_sample_restaurants()
         return restaurants
     except Exception as e:
         raise HTTPException(
@@ -125,3 +282,10 @@ async def populate_restaurants(db: Session = Depends(get_db)):
             detail={"error": "Server error", "details": str(e)}
         )
 
+
+async def _stream_restaurants_ndjson(cursor: Optional[str]) -> AsyncIterator[str]:
+    # The stream outlives the request dependency, so it owns its session
+    async with AsyncSessionLocal() as db:
+        manager = AsyncRestaurantManager(db)
+        async for batch in manager.stream_restaurant_batches(cursor):
+            yield "".join(RestaurantResponse.model_validate(row).model_dump_json() + "\n" for row in batch)
@@ -0,0 +1,138 @@
+from typing import AsyncIterator, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from simulated_api.app.models.pydantics import (
+    RestaurantCreate, RestaurantSearchRequest, RestaurantSearchResponse,
+    ReservationRequest, ReservationResponse, ReservationErrorResponse,
+    AvailabilityRequest, RestaurantAvailability, CatalogTerm
+)
+from simulated_api.app.services.catalog_index import CatalogIndex, get_catalog_index
+from simulated_api.app.services.restaurant_manager import RestaurantManager
+from simulated_api.app.services.search_cache import SearchCache, get_search_cache
+from simulated_api.database.models import Restaurant
+
+
+class AsyncRestaurantManager:
+    """
+    Async facade over RestaurantManager.
+
+    Each call runs the sync manager through AsyncSession.run_sync, so its
+    statements go through the async driver and the event loop is free while
+    they wait on the database. Search responses go through the search cache
+    when it is enabled, and writes invalidate it.
+    """
+
+    def __init__(self, db: AsyncSession, catalog: Optional[CatalogIndex] = None,
+                 search_cache: Optional[SearchCache] = None):
+        self.db = db
+        self.catalog = catalog if catalog is not None else get_catalog_index()
+        self.search_cache = search_cache if search_cache is not None else get_search_cache()
+
+    async def create_restaurant(self, restaurant_data: RestaurantCreate) -> Restaurant:
+        """Create a new restaurant"""
+        restaurant = await self.db.run_sync(lambda db: self._manager(db).create_restaurant(restaurant_data))
+        if self.search_cache:
+            await self.search_cache.invalidate_catalog()
+        return restaurant
+
+    async def bulk_create_restaurants(self, restaurants_data: List[RestaurantCreate]) -> List[Restaurant]:
+        """Create many restaurants in one transaction"""
+        restaurants = await self.db.run_sync(lambda db: self._manager(db).bulk_create_restaurants(restaurants_data))
+        if self.search_cache:
+            await self.search_cache.invalidate_catalog()
+        return restaurants
+
+    async def search_restaurants(self, search_params: RestaurantSearchRequest) -> List[RestaurantSearchResponse]:
+        """Search restaurants based on criteria"""
+        snapshot = None
+        if self.search_cache:
+            snapshot = await self.search_cache.snapshot()
+            cached = await self.search_cache.get(search_params)
+            if cached is not None:
+                return cached
+
+        results = await self.db.run_sync(lambda db: self._manager(db).search_restaurants(search_params))
+
+        if self.search_cache:
+            await self.search_cache.set(search_params, results, snapshot)
+        return results
+
+    async def search_restaurants_batch(self, searches: List[RestaurantSearchRequest]) -> List[
+        List[RestaurantSearchResponse]]:
+        """Run several searches; those missing from the search cache share one database round"""
+        results: List[Optional[List[RestaurantSearchResponse]]] = [None] * len(searches)
+        snapshot = None
+        if self.search_cache:
+            snapshot = await self.search_cache.snapshot()
+            for position, search_params in enumerate(searches):
+                results[position] = await self.search_cache.get(search_params)
+
+        missing = [position for position, cached in enumerate(results) if cached is None]
+        if missing:
+            found = await self.db.run_sync(
+                lambda db: self._manager(db).search_restaurants_batch([searches[position] for position in missing])
+            )
+            for position, restaurants in zip(missing, found):
+                results[position] = restaurants
+                if self.search_cache:
+                    await self.search_cache.set(searches[position], restaurants, snapshot)
+        return results
+
+    async def get_availability_calendar(self, request: AvailabilityRequest) -> List[RestaurantAvailability]:
+        """Seats left in every hourly slot of each restaurant over a date range"""
+        return await self.db.run_sync(lambda db: self._manager(db).get_availability_calendar(request))
+
+    async def reserve_table(self, reservation_data: ReservationRequest) -> Union[
+        ReservationResponse, ReservationErrorResponse]:
+        """Reserve a table at a restaurant"""
+        result = await self.db.run_sync(lambda db: self._manager(db).reserve_table(reservation_data))
+        if self.search_cache and isinstance(result, ReservationResponse):
+            await self.search_cache.invalidate_availability(reservation_data.restaurant_id, reservation_data.date)
+        return result
+
+    async def reserve_tables(self, reservations: List[ReservationRequest], all_or_nothing: bool = False) -> List[
+        Union[ReservationResponse, ReservationErrorResponse]]:
+        """Book several reservations in one transaction"""
+        results = await self.db.run_sync(lambda db: self._manager(db).reserve_tables(reservations, all_or_nothing))
+        if self.search_cache:
+            booked = {
+                (reservation_data.restaurant_id, reservation_data.date)
+                for reservation_data, result in zip(reservations, results)
+                if isinstance(result, ReservationResponse)
+            }
+            for restaurant_id, res_date in booked:
+                await self.search_cache.invalidate_availability(restaurant_id, res_date)
+        return results
+
+    async def get_all_restaurants(self) -> List[Restaurant]:
+        """Get all restaurants"""
+        return await self.db.run_sync(lambda db: self._manager(db).get_all_restaurants())
+
+    async def get_catalog_terms(self) -> List[CatalogTerm]:
+        """Distinct (city, locality, cuisine) of active restaurants"""
+        return await self.db.run_sync(lambda db: self._manager(db).get_catalog_terms())
+
+    async def get_restaurants_page(self, limit: int, cursor: Optional[str] = None) -> Tuple[
+        Sequence[Row], Optional[str]]:
+        """Get one page of active restaurants and the cursor for the next page"""
+        return await self.db.run_sync(lambda db: self._manager(db).get_restaurants_page(limit, cursor))
+
+    async def stream_restaurant_batches(self, cursor: Optional[str] = None,
+                                        batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """Yield active restaurants in batches from a server-side cursor"""
+        query = RestaurantManager.restaurant_listing_query(cursor).execution_options(yield_per=batch_size)
+        result = await self.db.stream(query)
+        async for batch in result.partitions():
+            yield batch
+
+    async def populate_sample_restaurants(self) -> List[Restaurant]:
+        """Populate database with sample restaurant data"""
+        restaurants = await self.db.run_sync(lambda db: self._manager(db).populate_sample_restaurants())
+        if self.search_cache:
+            await self.search_cache.invalidate_catalog()
+        return restaurants
+
+    def _manager(self, db) -> RestaurantManager:
+        return RestaurantManager(db, catalog=self.catalog)
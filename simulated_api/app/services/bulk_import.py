@@ -0,0 +1,200 @@
+import codecs
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from simulated_api.app.models.pydantics import BulkImportResponse, BulkImportRowError, RestaurantCreate
+from simulated_api.app.services.async_restaurant_manager import AsyncRestaurantManager
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+CSV_CONTENT_TYPES = ("text/csv",)
+
+# Rows validated and inserted per transaction
+CHUNK_SIZE = 1000
+# Row errors echoed back in the response; the failed count is always exact
+MAX_REPORTED_ERRORS = 1000
+
+
+class NdjsonRowParser:
+    """One JSON object per line, blank lines skipped"""
+
+    def parse(self, line_number: int, line: str) -> Optional[Tuple[int, Union[dict, str]]]:
+        """(line number, record or error message) for a line, None for a blank one"""
+        if not line.strip():
+            return None
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            return line_number, f"Invalid JSON: {e}"
+        if not isinstance(record, dict):
+            return line_number, "Expected a JSON object"
+        return line_number, record
+
+    def finish(self) -> Optional[Tuple[int, str]]:
+        return None
+
+
+class _LineFeed:
+    """Iterator the CSV reader pulls lines from, refilled before each record"""
+
+    def __init__(self):
+        self.lines = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+class CsvRowParser:
+    """
+    Header row first, then one record per row; empty cells fall back to defaults.
+
+    One csv.reader reads the whole body. Lines are held back until the quotes
+    seen so far balance, so a quoted field spanning lines (e.g. a multi-line
+    address) reaches the reader as one record.
+    """
+
+    def __init__(self):
+        self.header: Optional[List[str]] = None
+        self._feed = _LineFeed()
+        self._reader = csv.reader(self._feed)
+        self._record_line: Optional[int] = None
+        self._open_quotes = False
+
+    def parse(self, line_number: int, line: str) -> Optional[Tuple[int, Union[dict, str]]]:
+        """(first line number, record or error message) once a record is complete, else None"""
+        if self._record_line is None:
+            if not line.strip():
+                return None
+            self._record_line = line_number
+
+        self._feed.lines.append(line + "\n")
+        # A doubled "" escape flips the state twice, so parity tells whether a quoted field is still open
+        self._open_quotes ^= line.count('"') % 2 == 1
+        if self._open_quotes:
+            return None
+
+        record_line, self._record_line = self._record_line, None
+        return record_line, self._to_record(next(self._reader))
+
+    def finish(self) -> Optional[Tuple[int, str]]:
+        """Error for a quoted field still open at the end of the body"""
+        if self._record_line is None:
+            return None
+        return self._record_line, "Unterminated quoted field"
+
+    def _to_record(self, cells: List[str]) -> Optional[Union[dict, str]]:
+        if self.header is None:
+            self.header = [cell.strip() for cell in cells]
+            return None
+
+        if len(cells) != len(self.header):
+            return f"Expected {len(self.header)} columns, got {len(cells)}"
+        return {column: value for column, value in zip(self.header, cells) if value != ""}
+
+
+async def import_restaurants(manager: AsyncRestaurantManager, body: AsyncIterator[bytes],
+                             content_type: str, chunk_size: int = CHUNK_SIZE) -> BulkImportResponse:
+    """
+    Stream restaurants from an NDJSON or CSV body into the database.
+
+    Rows are validated with RestaurantCreate and written in chunks, one
+    transaction per chunk, so only the current chunk is held in memory.
+    Invalid rows are reported by line number and do not stop the import.
+    """
+    parser = NdjsonRowParser() if _media_type(content_type) in NDJSON_CONTENT_TYPES else CsvRowParser()
+
+    result = BulkImportResponse(inserted=0, failed=0)
+    chunk: List[Tuple[int, RestaurantCreate]] = []
+
+    async for line_number, line in _iter_lines(body):
+        parsed = parser.parse(line_number, line)
+        if parsed is None:
+            continue
+        line_number, record = parsed
+        if record is None:
+            continue
+        if isinstance(record, str):
+            _record_error(result, line_number, record)
+            continue
+
+        try:
+            chunk.append((line_number, RestaurantCreate(**record)))
+        except ValidationError as e:
+            _record_error(result, line_number, _format_validation_error(e))
+            continue
+
+        if len(chunk) >= chunk_size:
+            await _flush(manager, chunk, result)
+            chunk = []
+
+    await _flush(manager, chunk, result)
+    unfinished = parser.finish()
+    if unfinished:
+        _record_error(result, *unfinished)
+    return result
+
+
+def is_supported_content_type(content_type: str) -> bool:
+    return _media_type(content_type) in NDJSON_CONTENT_TYPES + CSV_CONTENT_TYPES
+
+
+async def _flush(manager: AsyncRestaurantManager, chunk: List[Tuple[int, RestaurantCreate]],
+                 result: BulkImportResponse) -> None:
+    if not chunk:
+        return
+
+    try:
+        created = await manager.bulk_create_restaurants([restaurant for _, restaurant in chunk])
+        result.inserted += len(created)
+    except Exception as e:
+        await manager.db.rollback()
+        if len(chunk) == 1:
+            _record_error(result, chunk[0][0], f"Database error: {e}")
+            return
+        # One bad row fails the whole chunk; retry row by row so only the offending rows are reported
+        for row in chunk:
+            await _flush(manager, [row], result)
+
+
+async def _iter_lines(body: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Split a byte stream into numbered text lines without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    line_number = 0
+
+    async for data in body:
+        pending += decoder.decode(data)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line.rstrip("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield line_number + 1, pending.rstrip("\r")
+
+
+def _record_error(result: BulkImportResponse, line_number: int, message: str) -> None:
+    result.failed += 1
+    if len(result.errors) < MAX_REPORTED_ERRORS:
+        result.errors.append(BulkImportRowError(line=line_number, error=message))
+    else:
+        result.errors_truncated = True
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(";")[0].strip().lower()
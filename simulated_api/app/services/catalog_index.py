@@ -0,0 +1,244 @@
+import bisect
+import heapq
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from simulated_api.app.services import geo
+from simulated_api.database.models import Restaurant
+
+SEARCH_FIELDS = ("city", "locality", "cuisine")
+
+# Minimum share of the query's trigrams a value must contain to count as a typo match
+FUZZY_THRESHOLD = 0.6
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Catalog fields needed to answer a search without touching the restaurants table"""
+    id: str
+    name: str
+    address: str
+    city: str
+    locality: str
+    cuisine: str
+    rating: float
+    total_capacity: int
+    opening_time: str
+    closing_time: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+    @classmethod
+    def from_restaurant(cls, restaurant: Restaurant) -> "CatalogEntry":
+        return cls(
+            id=restaurant.id,
+            name=restaurant.name,
+            address=restaurant.address,
+            city=restaurant.city,
+            locality=restaurant.locality,
+            cuisine=restaurant.cuisine,
+            rating=restaurant.rating or 0.0,
+            total_capacity=restaurant.total_capacity,
+            opening_time=restaurant.opening_time,
+            closing_time=restaurant.closing_time,
+            latitude=restaurant.latitude,
+            longitude=restaurant.longitude
+        )
+
+
+class CatalogIndex:
+    """
+    In-process inverted index over restaurant city, locality and cuisine.
+
+    Each field maps normalized values to posting lists of restaurant ids kept in
+    rating order, and trigrams to the values containing them. A query term is
+    resolved to matching values (substring match, falling back to trigram
+    similarity for typos), and candidates are read from the most selective
+    field's postings in rating order until the limit is reached. Restaurants
+    with coordinates are also filed under their geo grid cell for nearby
+    searches.
+
+    The index is per process: restaurants created through another worker are
+    only picked up on the next rebuild. Searches and additions hold the lock;
+    a rebuild loads into fresh structures without it and swaps them in, so
+    searches keep being served from the old ones meanwhile.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._added_during_rebuild: Optional[List[CatalogEntry]] = None
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._keys: Dict[str, Dict[str, str]] = {}  # restaurant id -> normalized field values
+        self._postings: Dict[str, Dict[str, List[Tuple[float, str]]]] = {field: {} for field in SEARCH_FIELDS}
+        self._grams: Dict[str, Dict[str, Set[str]]] = {field: {} for field in SEARCH_FIELDS}
+        self._cells: Dict[str, List[str]] = {}  # geo grid cell -> restaurant ids
+        self.is_ready = False
+
+    def rebuild(self, db: Session, batch_size: int = 1000) -> int:
+        """Load every searchable restaurant from the database"""
+        restaurants = db.query(Restaurant).filter(
+            Restaurant.is_active == True,
+            Restaurant.vacancy > 0
+        ).yield_per(batch_size)
+
+        with self._rebuild_lock:
+            with self._lock:
+                self._added_during_rebuild = []
+
+            fresh = CatalogIndex()
+            for restaurant in restaurants:
+                fresh._add(CatalogEntry.from_restaurant(restaurant))
+
+            with self._lock:
+                # Restaurants created while loading may or may not have been read
+                for entry in self._added_during_rebuild:
+                    if entry.id not in fresh._entries:
+                        fresh._add(entry)
+                self._added_during_rebuild = None
+
+                self._entries, self._keys, self._cells = fresh._entries, fresh._keys, fresh._cells
+                self._postings, self._grams = fresh._postings, fresh._grams
+                self.is_ready = True
+                return len(self._entries)
+
+    def add(self, restaurant: Restaurant) -> None:
+        """Index a newly created restaurant"""
+        if not restaurant.is_active or restaurant.vacancy <= 0:
+            return
+
+        self.add_entries([CatalogEntry.from_restaurant(restaurant)])
+
+    def add_entries(self, entries: Iterable[CatalogEntry]) -> None:
+        """Index a batch of newly created restaurants"""
+        with self._lock:
+            for entry in entries:
+                self._add(entry)
+                if self._added_during_rebuild is not None:
+                    self._added_during_rebuild.append(entry)
+
+    def search(self, city: str, locality: str, cuisine: str, limit: int = 5) -> List[CatalogEntry]:
+        """Get the top rated restaurants matching every criterion"""
+        with self._lock:
+            return self._search(city, locality, cuisine, limit)
+
+    def nearby(self, latitude: float, longitude: float, limit: int = 5, radius_km: Optional[float] = None,
+               city: Optional[str] = None, locality: Optional[str] = None,
+               cuisine: Optional[str] = None) -> List[Tuple[float, CatalogEntry]]:
+        """Get (distance_km, entry) of the nearest restaurants matching the criteria given, closest first"""
+        with self._lock:
+            return self._nearby(latitude, longitude, limit, radius_km, city, locality, cuisine)
+
+    def _search(self, city: str, locality: str, cuisine: str, limit: int) -> List[CatalogEntry]:
+        terms = {"city": city, "locality": locality, "cuisine": cuisine}
+
+        matched_values = {}
+        for field, term in terms.items():
+            values = self._match_values(field, _normalize(term))
+            if not values:
+                return []
+            matched_values[field] = values
+
+        # Walk the field with the fewest postings and probe the others per entry
+        driver = min(SEARCH_FIELDS, key=lambda field: sum(
+            len(self._postings[field][value]) for value in matched_values[field]
+        ))
+        postings = [self._postings[driver][value] for value in matched_values[driver]]
+
+        result = []
+        for _, restaurant_id in _merge_by_rating(postings):
+            keys = self._keys[restaurant_id]
+            if all(keys[field] in matched_values[field] for field in SEARCH_FIELDS if field != driver):
+                result.append(self._entries[restaurant_id])
+                if len(result) == limit:
+                    break
+
+        return result
+
+    def _nearby(self, latitude: float, longitude: float, limit: int, radius_km: Optional[float],
+                city: Optional[str], locality: Optional[str], cuisine: Optional[str]) -> List[Tuple[float, CatalogEntry]]:
+        terms = {"city": city, "locality": locality, "cuisine": cuisine}
+        matched_values = {field: self._match_values(field, _normalize(term)) for field, term in terms.items() if term}
+        if not all(matched_values.values()):
+            return []
+
+        def fetch(cells: List[str]) -> List[CatalogEntry]:
+            return [
+                self._entries[restaurant_id]
+                for cell in cells
+                for restaurant_id in self._cells.get(cell, ())
+                if all(self._keys[restaurant_id][field] in values for field, values in matched_values.items())
+            ]
+
+        return geo.nearest(latitude, longitude, limit, radius_km, fetch)
+
+    def _add(self, entry: CatalogEntry) -> None:
+        if entry.latitude is not None and entry.longitude is not None:
+            self._cells.setdefault(geo.cell_key(entry.latitude, entry.longitude), []).append(entry.id)
+        self._entries[entry.id] = entry
+        self._keys[entry.id] = {field: _normalize(getattr(entry, field)) for field in SEARCH_FIELDS}
+        for field, value in self._keys[entry.id].items():
+            if value not in self._postings[field]:
+                self._postings[field][value] = []
+                for gram in _trigrams(f" {value} "):
+                    self._grams[field].setdefault(gram, set()).add(value)
+            bisect.insort(self._postings[field][value], (-entry.rating, entry.id))
+
+    def _match_values(self, field: str, term: str) -> Set[str]:
+        """Resolve a query term to the indexed values of a field"""
+        grams = _trigrams(term)
+        if not grams:
+            # Too short for trigrams, the distinct value set is small enough to scan
+            return {value for value in self._postings[field] if term in value}
+
+        candidates = None
+        for gram in grams:
+            values = self._grams[field].get(gram, set())
+            candidates = set(values) if candidates is None else candidates & values
+            if not candidates:
+                break
+
+        matches = {value for value in candidates or () if term in value}
+        return matches or self._fuzzy_match_values(field, term)
+
+    def _fuzzy_match_values(self, field: str, term: str) -> Set[str]:
+        """Typo tolerant match on the share of the term's trigrams a value contains"""
+        grams = _trigrams(f" {term} ")
+        counts: Dict[str, int] = {}
+        for gram in grams:
+            for value in self._grams[field].get(gram, ()):
+                counts[value] = counts.get(value, 0) + 1
+
+        return {value for value, count in counts.items() if count / len(grams) >= FUZZY_THRESHOLD}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _merge_by_rating(postings: List[List[Tuple[float, str]]]) -> Iterable[Tuple[float, str]]:
+    if len(postings) == 1:
+        return postings[0]
+    return heapq.merge(*postings)
+
+
+def is_catalog_index_enabled() -> bool:
+    return os.getenv("CATALOG_INDEX_ENABLED", "false").lower() == "true"
+
+
+catalog_index = CatalogIndex()
+
+
+def get_catalog_index() -> Optional[CatalogIndex]:
+    """The shared catalog index, or None when disabled or not built yet"""
+    if not is_catalog_index_enabled() or not catalog_index.is_ready:
+        return None
+    return catalog_index
@@ -0,0 +1,73 @@
+import math
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Grid cell edge in degrees (0.05 is about 5.5 km north-south). Restaurants store their
+# cell in restaurants.geo_cell; rerun the migration after changing it.
+GEO_CELL_DEGREES = float(os.getenv("GEO_CELL_DEGREES", "0.05"))
+# Largest radius a search may ask for, and where a k-nearest search stops widening
+GEO_MAX_RADIUS_KM = 50.0
+# First radius tried by a k-nearest search, doubled until k restaurants are found
+GEO_KNN_START_KM = 2.0
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LATITUDE = 111.32
+
+
+def haversine_km(latitude: float, longitude: float, other_latitude: float, other_longitude: float) -> float:
+    """Great-circle distance between two points"""
+    lat1, lat2 = math.radians(latitude), math.radians(other_latitude)
+    d_lat = lat2 - lat1
+    d_lon = math.radians(other_longitude - longitude)
+    a = math.sin(d_lat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(d_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def cell_key(latitude: float, longitude: float) -> str:
+    """Grid cell of a point, as stored in restaurants.geo_cell"""
+    return _key(math.floor(latitude / GEO_CELL_DEGREES), math.floor(longitude / GEO_CELL_DEGREES))
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    """Cells of the bounding box of a circle, so every point within radius_km lies in one of them"""
+    d_lat = radius_km / KM_PER_DEGREE_LATITUDE
+    # Degrees of longitude shrink towards the poles; the box is sized at its widest latitude
+    widest = min(89.9, abs(latitude) + d_lat)
+    d_lon = min(180.0, radius_km / (KM_PER_DEGREE_LATITUDE * math.cos(math.radians(widest))))
+
+    rows = range(math.floor((latitude - d_lat) / GEO_CELL_DEGREES), math.floor((latitude + d_lat) / GEO_CELL_DEGREES) + 1)
+    columns = range(math.floor((longitude - d_lon) / GEO_CELL_DEGREES), math.floor((longitude + d_lon) / GEO_CELL_DEGREES) + 1)
+    return [_key(row, column) for row in rows for column in columns]
+
+
+def nearest(latitude: float, longitude: float, k: int, radius_km: Optional[float],
+            fetch: Callable[[List[str]], Iterable[Any]]) -> List[Tuple[float, Any]]:
+    """
+    Up to k (distance_km, item) pairs nearest to a point, closest first.
+
+    fetch returns the candidates (objects with id, latitude and longitude) in
+    the given cells, and is only asked for cells it has not seen yet.
+    With radius_km the search covers that
+    circle once; without it the radius starts at GEO_KNN_START_KM and doubles
+    until k items lie within it or GEO_MAX_RADIUS_KM is reached.
+    """
+    max_radius = radius_km if radius_km is not None else GEO_MAX_RADIUS_KM
+    search_radius = radius_km if radius_km is not None else min(GEO_KNN_START_KM, max_radius)
+
+    found: Dict[str, Tuple[float, Any]] = {}
+    fetched: Set[str] = set()
+    while True:
+        cells = [cell for cell in covering_cells(latitude, longitude, search_radius) if cell not in fetched]
+        fetched.update(cells)
+        if cells:
+            for item in fetch(cells):
+                found[item.id] = (haversine_km(latitude, longitude, item.latitude, item.longitude), item)
+
+        within = sorted((distance, item_id) for item_id, (distance, _) in found.items() if distance <= search_radius)
+        if len(within) >= k or search_radius >= max_radius:
+            return [found[item_id] for _, item_id in within[:k]]
+        search_radius = min(search_radius * 2, max_radius)
+
+
+def _key(row: int, column: int) -> str:
+    return f"{row}:{column}"
@@ -1,67 +1,275 @@
+import base64
+import json
 import uuid
-from datetime import datetime, timedelta
-from typing import List, Union
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, and_, insert, literal, select, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
 
 from simulated_api.app.models.pydantics import (
-    RestaurantCreate, RestaurantSearchRequest, RestaurantSearchResponse,
-    ReservationRequest, ReservationResponse, ReservationErrorResponse
+    RestaurantCreate, RestaurantResponse, RestaurantSearchRequest, RestaurantSearchResponse,
+    ReservationRequest, ReservationResponse, ReservationErrorResponse,
+    AvailabilityRequest, DayAvailability, RestaurantAvailability, CatalogTerm
 )
-from simulated_api.database.models import Restaurant, Reservation
+from simulated_api.app.services import geo
+from simulated_api.app.services.catalog_index import CatalogEntry, CatalogIndex, get_catalog_index
+from simulated_api.app.services.metrics import REPOSITORY_SECONDS, timed
+from simulated_api.database.models import Restaurant, Reservation, SlotInventory
+
+# Restaurants a name lookup in the availability calendar returns
+CALENDAR_NAME_MATCHES = 5
+
+# Columns selected for listings, so rows map straight onto RestaurantResponse
+RESTAURANT_RESPONSE_COLUMNS = tuple(getattr(Restaurant, field) for field in RestaurantResponse.model_fields)
 
 
 class RestaurantManager:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, catalog: Optional[CatalogIndex] = None):
         self.db = db
+        self.catalog = catalog if catalog is not None else get_catalog_index()
 
+    @timed(REPOSITORY_SECONDS, method="create_restaurant")
     def create_restaurant(self, restaurant_data: RestaurantCreate) -> Restaurant:
         """Create a new restaurant"""
-        restaurant_id = f"res_{uuid.uuid4().hex[:8]}"
-
-        db_restaurant = Restaurant(
-            id=restaurant_id,
-            **restaurant_data.model_dump(),
-            vacancy=restaurant_data.total_capacity
-        )
+        db_restaurant = Restaurant(**self._restaurant_row(restaurant_data))
         self.db.add(db_restaurant)
         self.db.commit()
         self.db.refresh(db_restaurant)
+
+        if self.catalog:
+            self.catalog.add(db_restaurant)
         return db_restaurant
 
+    @timed(REPOSITORY_SECONDS, method="bulk_create_restaurants")
+    def bulk_create_restaurants(self, restaurants_data: List[RestaurantCreate]) -> List[Restaurant]:
+        """Create many restaurants in one transaction with batched multi-row INSERTs"""
+        if not restaurants_data:
+            return []
+
+        rows = [self._restaurant_row(restaurant_data) for restaurant_data in restaurants_data]
+        db_restaurants = list(self.db.scalars(insert(Restaurant).returning(Restaurant), rows))
+
+        # Snapshot before commit expires the loaded attributes
+        entries = [CatalogEntry.from_restaurant(restaurant) for restaurant in db_restaurants] if self.catalog else []
+        self.db.commit()
+
+        if self.catalog:
+            self.catalog.add_entries(entries)
+        return db_restaurants
+
+    @staticmethod
+    def _restaurant_row(restaurant_data: RestaurantCreate) -> dict:
+        """Column values for a new restaurant"""
+        return {
+            "id": f"res_{uuid.uuid4().hex[:12]}",
+            **restaurant_data.model_dump(),
+            "rating": restaurant_data.rating or 0.0,  # Keyset pagination needs a non-null rating
+            "vacancy": restaurant_data.total_capacity,
+            "geo_cell": geo.cell_key(restaurant_data.latitude, restaurant_data.longitude)
+            if restaurant_data.latitude is not None else None,
+            "is_active": True
+        }
+
+    @timed(REPOSITORY_SECONDS, method="search_restaurants")
     def search_restaurants(self, search_params: RestaurantSearchRequest) -> List[RestaurantSearchResponse]:
-        """Search restaurants based on criteria"""
-        query = self.db.query(Restaurant).filter(
-            and_(
-                Restaurant.city.ilike(f"%{search_params.city}%"),
-                Restaurant.locality.ilike(f"%{search_params.locality}%"),
-                Restaurant.cuisine.ilike(f"%{search_params.cuisine}%"),
+        """Search restaurants by city, locality and cuisine, or by distance from a point"""
+        distances: Dict[str, float] = {}
+        if search_params.is_nearby:
+            nearby = self._find_nearby(search_params)
+            restaurants = [restaurant for _, restaurant in nearby]
+            distances = {restaurant.id: distance for distance, restaurant in nearby}
+        elif self.catalog:
+            # Candidates come from the in-memory index, the database is only asked for availability
+            restaurants = self.catalog.search(search_params.city, search_params.locality, search_params.cuisine,
+                                              limit=search_params.limit)
+        else:
+            query = self.db.query(Restaurant).filter(
+                and_(
+                    *self._text_filters(search_params),
+                    Restaurant.is_active == True,
+                    Restaurant.vacancy > 0
+                )
+            ).order_by(Restaurant.rating.desc()).limit(search_params.limit)
+
+            restaurants = query.all()
+
+        # One grouped query for every candidate instead of one per restaurant per hour
+        slots_by_restaurant = self._get_available_slots_for(
+            restaurants, search_params.date, search_params.time
+        )
+
+        return [
+            self._search_response(restaurant, slots_by_restaurant.get(restaurant.id, []), distances.get(restaurant.id))
+            for restaurant in restaurants
+        ]
+
+    @timed(REPOSITORY_SECONDS, method="search_restaurants_batch")
+    def search_restaurants_batch(self, searches: List[RestaurantSearchRequest]) -> List[List[RestaurantSearchResponse]]:
+        """
+        Run several searches, returning one result list per search in order.
+
+        Searches with the same criteria share their candidates, text searches
+        against the database load theirs with one UNION ALL query, and the
+        slots of every candidate on every requested date come from one query.
+        """
+        criteria: Dict[tuple, RestaurantSearchRequest] = {}
+        for search_params in searches:
+            criteria.setdefault(self._candidate_key(search_params), search_params)
+
+        candidates: Dict[tuple, List[Tuple[Optional[float], Union[Restaurant, CatalogEntry]]]] = {}
+        text_criteria: Dict[tuple, RestaurantSearchRequest] = {}
+        for key, search_params in criteria.items():
+            if search_params.is_nearby:
+                candidates[key] = self._find_nearby(search_params)
+            elif self.catalog:
+                candidates[key] = [
+                    (None, restaurant) for restaurant in self.catalog.search(
+                        search_params.city, search_params.locality, search_params.cuisine, limit=search_params.limit
+                    )
+                ]
+            else:
+                text_criteria[key] = search_params
+        candidates.update(self._find_matching_batch(text_criteria))
+
+        restaurant_ids = list({restaurant.id for found in candidates.values() for _, restaurant in found})
+        days = sorted({self._parse_date(search_params.date) for search_params in searches})
+        full = self._get_full_slots(restaurant_ids, days) if restaurant_ids else set()
+
+        return [
+            [
+                self._search_response(
+                    restaurant,
+                    self._open_slots(restaurant, self._parse_date(search_params.date), search_params.time, full),
+                    distance
+                )
+                for distance, restaurant in candidates[self._candidate_key(search_params)]
+            ]
+            for search_params in searches
+        ]
+
+    @staticmethod
+    def _candidate_key(search_params: RestaurantSearchRequest) -> tuple:
+        """Everything but the date and time, which only affect availability"""
+        return tuple(sorted(search_params.model_dump(exclude={"date", "time"}).items()))
+
+    def _find_matching_batch(self, criteria: Dict[tuple, RestaurantSearchRequest]) -> Dict[
+        tuple, List[Tuple[None, Restaurant]]]:
+        """Best rated matches of several text searches, loaded with one UNION ALL query"""
+        if not criteria:
+            return {}
+
+        keys = list(criteria)
+        members = [
+            select(literal(position).label("search_position"), *Restaurant.__table__.columns).where(
+                *self._text_filters(search_params),
                 Restaurant.is_active == True,
                 Restaurant.vacancy > 0
+            ).order_by(Restaurant.rating.desc()).limit(search_params.limit).subquery()
+            for position, search_params in enumerate(criteria.values())
+        ]
+        # Each member is wrapped in its own SELECT, as SQLite rejects LIMIT inside a compound query
+        matches = union_all(*(select(member) for member in members)).subquery()
+        matched_restaurant = aliased(Restaurant, matches)
+
+        found: Dict[tuple, List[Tuple[None, Restaurant]]] = {key: [] for key in keys}
+        rows = self.db.execute(
+            select(matches.c.search_position, matched_restaurant).order_by(
+                matches.c.search_position, matches.c.rating.desc()
             )
-        ).order_by(Restaurant.rating.desc()).limit(5)
-
-        restaurants = query.all()
+        ).all()
+        for position, restaurant in rows:
+            found[keys[position]].append((None, restaurant))
+        return found
+
+    @staticmethod
+    def _search_response(restaurant: Union[Restaurant, CatalogEntry], available_slots: List[str],
+                         distance: Optional[float]) -> RestaurantSearchResponse:
+        return RestaurantSearchResponse(
+            id=restaurant.id,
+            name=restaurant.name,
+            address=restaurant.address,
+            rating=restaurant.rating,
+            cuisine=restaurant.cuisine,
+            available_slots=available_slots,
+            distance_km=round(distance, 2) if distance is not None else None
+        )
 
-        result = []
-        for restaurant in restaurants:
-            # Get available time slots if requested time is not available
-            available_slots = self._get_available_slots(
-                restaurant.id, search_params.date, search_params.time
+    def _find_nearby(self, search_params: RestaurantSearchRequest) -> List[Tuple[float, Union[Restaurant, CatalogEntry]]]:
+        """Nearest restaurants matching the given text criteria, read only from grid cells around the point"""
+        if self.catalog:
+            return self.catalog.nearby(
+                search_params.latitude, search_params.longitude, search_params.limit, search_params.radius_km,
+                search_params.city, search_params.locality, search_params.cuisine
             )
 
-            result.append(RestaurantSearchResponse(
+        def fetch(cells: List[str]) -> List[Restaurant]:
+            return self.db.query(Restaurant).filter(
+                and_(
+                    Restaurant.geo_cell.in_(cells),
+                    *self._text_filters(search_params),
+                    Restaurant.is_active == True,
+                    Restaurant.vacancy > 0
+                )
+            ).all()
+
+        return geo.nearest(search_params.latitude, search_params.longitude, search_params.limit,
+                           search_params.radius_km, fetch)
+
+    @staticmethod
+    def _text_filters(search_params: RestaurantSearchRequest) -> list:
+        """Substring filters for the city, locality and cuisine given"""
+        return [
+            getattr(Restaurant, field).ilike(f"%{getattr(search_params, field)}%")
+            for field in ("city", "locality", "cuisine")
+            if getattr(search_params, field)
+        ]
+
+    @timed(REPOSITORY_SECONDS, method="get_availability_calendar")
+    def get_availability_calendar(self, request: AvailabilityRequest) -> List[RestaurantAvailability]:
+        """Seats left in every hourly slot of each restaurant over a date range, from one inventory query"""
+        query = self.db.query(Restaurant).filter(Restaurant.is_active == True)
+        if request.restaurant_ids:
+            query = query.filter(Restaurant.id.in_(request.restaurant_ids))
+        else:
+            query = query.filter(Restaurant.name.ilike(f"%{request.name}%"))
+        if request.city:
+            query = query.filter(Restaurant.city.ilike(f"%{request.city}%"))
+        restaurants = query.order_by(Restaurant.rating.desc(), Restaurant.id).limit(
+            len(request.restaurant_ids) if request.restaurant_ids else CALENDAR_NAME_MATCHES
+        ).all()
+        if not restaurants:
+            return []
+
+        first_day = self._parse_date(request.start_date)
+        dates = [first_day + timedelta(days=offset) for offset in range(request.days)]
+        remaining = self._get_slot_remaining([restaurant.id for restaurant in restaurants], dates[0], dates[-1])
+
+        return [
+            RestaurantAvailability(
                 id=restaurant.id,
                 name=restaurant.name,
                 address=restaurant.address,
-                rating=restaurant.rating,
-                cuisine=restaurant.cuisine,
-                available_slots=available_slots
-            ))
-
-        return result
+                total_capacity=restaurant.total_capacity,
+                days=[
+                    DayAvailability(
+                        date=day.isoformat(),
+                        # Slots nobody has booked yet have no inventory row and are fully free
+                        slots={
+                            time_slot: remaining.get((restaurant.id, day, time_slot), restaurant.total_capacity)
+                            for time_slot in self._hourly_slots(restaurant)
+                        }
+                    )
+                    for day in dates
+                ]
+            )
+            for restaurant in restaurants
+        ]
 
+    @timed(REPOSITORY_SECONDS, method="reserve_table")
     def reserve_table(self, reservation_data: ReservationRequest) -> Union[
         ReservationResponse, ReservationErrorResponse]:
         """Reserve a table at a restaurant"""
@@ -72,56 +280,136 @@ class RestaurantManager:
         ).first()
 
         if not restaurant:
-            return ReservationErrorResponse(
-                status="invalid_restaurant",
-                error_message=f"Restaurant with ID {reservation_data.restaurant_id} not found."
-            )
+            return self._invalid_restaurant_error(reservation_data)
 
-        # Check if restaurant has capacity
-        if restaurant.vacancy < reservation_data.guests:
-            # Get alternative time slots
-            alt_slots = self._get_available_slots(
-                reservation_data.restaurant_id,
-                reservation_data.date,
-                reservation_data.time
-            )
+        invalid_time = self._invalid_time_error(restaurant, reservation_data)
+        if invalid_time:
+            return invalid_time
 
-            return ReservationErrorResponse(
-                status="no_availability",
-                error_message=f"Not enough seats available. Required: {reservation_data.guests}, Available: {restaurant.vacancy}. Try these times: {', '.join(alt_slots) if alt_slots else 'No alternatives'}"
+        res_date = self._parse_date(reservation_data.date)
+        res_time = self._parse_time(reservation_data.time)
+
+        # Atomically claim seats in the requested slot
+        remaining = self._claim_capacity(restaurant, res_date, res_time, reservation_data.guests)
+
+        if remaining is None:
+            error = self._no_availability_error(
+                restaurant, reservation_data, self._get_slot_remaining([restaurant.id], res_date, res_date)
             )
+            self.db.rollback()  # Release the slot row lock early
+            return error
 
-        # Check for existing reservation at same time (table conflict)
-        existing_reservation = self.db.query(Reservation).filter(
-            and_(
-                Reservation.restaurant_id == reservation_data.restaurant_id,
-                Reservation.date == reservation_data.date,
-                Reservation.time == reservation_data.time,
-                Reservation.status == "confirmed"
+        db_reservation = self._new_reservation(reservation_data, res_date, res_time)
+        self.db.add(db_reservation)
+        self.db.commit()
+        self.db.refresh(db_reservation)
+
+        return self._reservation_response(db_reservation)
+
+    @timed(REPOSITORY_SECONDS, method="reserve_tables")
+    def reserve_tables(self, reservations: List[ReservationRequest], all_or_nothing: bool = False) -> List[
+        Union[ReservationResponse, ReservationErrorResponse]]:
+        """
+        Book several reservations in one transaction, returning a result per reservation in order.
+
+        Restaurants are loaded with one query and missing slot inventory rows
+        created with one INSERT; each reservation then claims its seats with a
+        conditional UPDATE, and the bookings are inserted and committed together.
+        With all_or_nothing the first reservation that cannot be booked rolls
+        back the batch and the others are reported as not_booked.
+        """
+        restaurant_ids = {reservation_data.restaurant_id for reservation_data in reservations}
+        restaurants = {
+            restaurant.id: restaurant
+            for restaurant in self.db.query(Restaurant).filter(Restaurant.id.in_(restaurant_ids))
+        }
+
+        results: List[Optional[Union[ReservationResponse, ReservationErrorResponse]]] = [None] * len(reservations)
+        slots: Dict[int, Tuple[date, time]] = {}
+        for position, reservation_data in enumerate(reservations):
+            if reservation_data.restaurant_id not in restaurants:
+                results[position] = self._invalid_restaurant_error(reservation_data)
+            else:
+                results[position] = self._invalid_time_error(restaurants[reservation_data.restaurant_id],
+                                                             reservation_data)
+            if results[position]:
+                if all_or_nothing:
+                    return self._not_booked_except(results, position)
+            else:
+                slots[position] = (self._parse_date(reservation_data.date), self._parse_time(reservation_data.time))
+
+        # Claim in slot order so concurrent batches lock inventory rows in the same order;
+        # the sort is stable, so reservations for the same slot keep their request order
+        claim_order = sorted(slots, key=lambda position: (reservations[position].restaurant_id, *slots[position]))
+        self._ensure_slot_inventories([
+            (restaurants[restaurant_id], res_date, res_time)
+            for restaurant_id, res_date, res_time in dict.fromkeys(
+                (reservations[position].restaurant_id, *slots[position]) for position in claim_order
             )
-        ).first()
+        ])
+
+        unseated = []
+        for position in claim_order:
+            reservation_data = reservations[position]
+            if self._claim_seats(reservation_data.restaurant_id, *slots[position], reservation_data.guests) is None:
+                unseated.append(position)
+                if all_or_nothing:
+                    break
+
+        if unseated and all_or_nothing:
+            # Seats left once this batch's claims are undone
+            self.db.rollback()
+            failed = unseated[0]
+            res_date = slots[failed][0]
+            restaurant = restaurants[reservations[failed].restaurant_id]
+            results[failed] = self._no_availability_error(
+                restaurant, reservations[failed], self._get_slot_remaining([restaurant.id], res_date, res_date)
+            )
+            return self._not_booked_except(results, failed)
 
-        if existing_reservation:
-            alt_slots = self._get_available_slots(
-                reservation_data.restaurant_id,
-                reservation_data.date,
-                reservation_data.time
+        if unseated:
+            days = [slots[position][0] for position in unseated]
+            remaining = self._get_slot_remaining(
+                list({reservations[position].restaurant_id for position in unseated}), min(days), max(days)
             )
+            for position in unseated:
+                results[position] = self._no_availability_error(
+                    restaurants[reservations[position].restaurant_id], reservations[position], remaining
+                )
+
+        booked = {
+            position: self._new_reservation(reservations[position], *slots[position])
+            for position in claim_order if position not in unseated
+        }
+        self.db.add_all(booked.values())
+        # Build the responses before commit expires the new rows
+        for position, db_reservation in booked.items():
+            results[position] = self._reservation_response(db_reservation)
+        self.db.commit()
+
+        return results
 
-            return ReservationErrorResponse(
-                status="time_unavailable",
-                error_message=f"Time slot {reservation_data.time} is already booked. Available times: {', '.join(alt_slots) if alt_slots else 'No alternatives'}"
+    @staticmethod
+    def _not_booked_except(results: List[Optional[Union[ReservationResponse, ReservationErrorResponse]]],
+                           failed: int) -> List[ReservationErrorResponse]:
+        """Results of an all_or_nothing batch that failed at one reservation"""
+        return [
+            results[failed] if position == failed else ReservationErrorResponse(
+                status="not_booked",
+                error_message=f"Not booked because reservation {failed + 1} of the batch could not be made."
             )
+            for position in range(len(results))
+        ]
 
-        # Create reservation
-        reservation_id = f"rev_{uuid.uuid4().hex[:8]}"
+    def _new_reservation(self, reservation_data: ReservationRequest, res_date: date, res_time: time) -> Reservation:
+        """Confirmed reservation for seats already claimed"""
         table_number = str(uuid.uuid4().int % 20 + 1)  # Random table 1-20
 
-        db_reservation = Reservation(
-            id=reservation_id,
+        return Reservation(
+            id=f"rev_{uuid.uuid4().hex[:8]}",
             restaurant_id=reservation_data.restaurant_id,
-            date=reservation_data.date,
-            time=reservation_data.time,
+            date=res_date,
+            time=res_time,
             guests=reservation_data.guests,
             user_name=reservation_data.user_name,
             user_phone=reservation_data.user_phone,
@@ -130,50 +418,199 @@ class RestaurantManager:
             instructions=f"Arrive by {self._subtract_10_minutes(reservation_data.time)}. Table {table_number} reserved for {reservation_data.guests} guests."
         )
 
-        # Update restaurant vacancy
-        restaurant.vacancy -= reservation_data.guests
-
-        self.db.add(db_reservation)
-        self.db.commit()
-        self.db.refresh(db_reservation)
-
+    @staticmethod
+    def _reservation_response(db_reservation: Reservation) -> ReservationResponse:
         return ReservationResponse(
-            reservation_id=reservation_id,
-            table_number=table_number,
+            reservation_id=db_reservation.id,
+            table_number=db_reservation.table_number,
             status="confirmed",
             instructions=db_reservation.instructions,
             alternate_slots=[]
         )
 
-    def _get_available_slots(self, restaurant_id: str, date: str, requested_time: str) -> List[str]:
+    @staticmethod
+    def _invalid_restaurant_error(reservation_data: ReservationRequest) -> ReservationErrorResponse:
+        return ReservationErrorResponse(
+            status="invalid_restaurant",
+            error_message=f"Restaurant with ID {reservation_data.restaurant_id} not found."
+        )
+
+    def _invalid_time_error(self, restaurant: Restaurant,
+                            reservation_data: ReservationRequest) -> Optional[ReservationErrorResponse]:
+        """
+        Error for a time off the hourly grid or outside opening hours, None if it is bookable.
+
+        The slot inventory is keyed by grid slot, so any other time would be
+        seeded with the full capacity and oversell the hour it falls in.
+        """
+        slots = self._hourly_slots(restaurant)
+        if self._parse_time(reservation_data.time).strftime("%H:%M") in slots:
+            return None
+
+        return ReservationErrorResponse(
+            status="invalid_time",
+            error_message=f"{restaurant.name} takes bookings on the hour from {slots[0]} to {slots[-1]}, not at {reservation_data.time}."
+            if slots else f"{restaurant.name} takes no bookings."
+        )
+
+    def _no_availability_error(self, restaurant: Restaurant, reservation_data: ReservationRequest,
+                               remaining: Dict[Tuple[str, date, str], int]) -> ReservationErrorResponse:
+        """Error naming the seats left and up to 3 other times, from _get_slot_remaining rows covering the date"""
+        res_date = self._parse_date(reservation_data.date)
+        requested_time = self._parse_time(reservation_data.time).strftime("%H:%M")
+
+        # Get alternative time slots
+        full = {
+            (restaurant.id, res_date, time_slot) for time_slot in self._hourly_slots(restaurant)
+            if remaining.get((restaurant.id, res_date, time_slot), restaurant.total_capacity) < reservation_data.guests
+        }
+        alt_slots = self._open_slots(restaurant, res_date, reservation_data.time, full, guests=reservation_data.guests)
+        available = remaining.get((restaurant.id, res_date, requested_time), restaurant.total_capacity)
+
+        return ReservationErrorResponse(
+            status="no_availability",
+            error_message=f"Not enough seats available at {reservation_data.time}. Required: {reservation_data.guests}, Available: {available}. Try these times: {', '.join(alt_slots) if alt_slots else 'No alternatives'}"
+        )
+
+    @timed(REPOSITORY_SECONDS, method="_claim_capacity")
+    def _claim_capacity(self, restaurant: Restaurant, res_date: date, res_time: time,
+                        guests: int) -> Optional[int]:
+        """
+        Claim seats from the slot inventory with a single conditional UPDATE.
+
+        Returns the seats left in the slot, or None if the slot cannot take the party.
+        """
+        self._ensure_slot_inventories([(restaurant, res_date, res_time)])
+        return self._claim_seats(restaurant.id, res_date, res_time, guests)
+
+    def _claim_seats(self, restaurant_id: str, res_date: date, res_time: time, guests: int) -> Optional[int]:
+        """Conditional UPDATE of an existing inventory row; None if it cannot take the party"""
+        claim = update(SlotInventory).where(
+            and_(
+                SlotInventory.restaurant_id == restaurant_id,
+                SlotInventory.date == res_date,
+                SlotInventory.time == res_time,
+                SlotInventory.remaining >= guests
+            )
+        ).values(
+            remaining=SlotInventory.remaining - guests
+        ).returning(SlotInventory.remaining).execution_options(synchronize_session=False)
+
+        return self.db.execute(claim).scalar_one_or_none()
+
+    def _ensure_slot_inventories(self, slots: List[Tuple[Restaurant, date, time]]) -> None:
+        """Create the inventory rows of slots that do not exist yet, with one INSERT where the dialect allows"""
+        if not slots:
+            return
+
+        rows = [
+            {
+                "restaurant_id": restaurant.id,
+                "date": res_date,
+                "time": res_time,
+                "capacity": restaurant.total_capacity,
+                "remaining": restaurant.total_capacity
+            }
+            for restaurant, res_date, res_time in slots
+        ]
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            self.db.execute(postgresql_insert(SlotInventory).values(rows).on_conflict_do_nothing())
+        elif dialect == "sqlite":
+            self.db.execute(sqlite_insert(SlotInventory).values(rows).on_conflict_do_nothing())
+        else:
+            for values in rows:
+                try:
+                    with self.db.begin_nested():
+                        self.db.execute(insert(SlotInventory).values(**values))
+                except IntegrityError:
+                    pass  # Another booking created the row first
+
+    def _get_available_slots(self, restaurant: Restaurant, res_date: str, requested_time: str,
+                             guests: int = 1) -> List[str]:
         """Get available time slots for a restaurant on a specific date"""
-        # Get restaurant opening hours
-        restaurant = self.db.query(Restaurant).filter(Restaurant.id == restaurant_id).first()
-        if not restaurant:
-            return []
+        return self._get_available_slots_for([restaurant], res_date, requested_time, guests).get(restaurant.id, [])
 
-        # Generate time slots (every hour from opening to closing)
-        opening_hour = int(restaurant.opening_time.split(':')[0])
-        closing_hour = int(restaurant.closing_time.split(':')[0])
+    @timed(REPOSITORY_SECONDS, method="_get_available_slots_for")
+    def _get_available_slots_for(self, restaurants: List[Restaurant], res_date: str,
+                                 requested_time: str, guests: int = 1) -> Dict[str, List[str]]:
+        """Get time slots that can seat the party for several restaurants with a single query"""
+        if not restaurants:
+            return {}
+
+        day = self._parse_date(res_date)
+        full = self._get_full_slots([restaurant.id for restaurant in restaurants], [day], guests)
+
+        return {
+            restaurant.id: self._open_slots(restaurant, day, requested_time, full, guests)
+            for restaurant in restaurants
+        }
+
+    def _open_slots(self, restaurant: Union[Restaurant, CatalogEntry], day: date, requested_time: str,
+                    full: Set[Tuple[str, date, str]], guests: int = 1) -> List[str]:
+        """Up to 3 slots other than the requested one that are not in full"""
+        requested_time = self._parse_time(requested_time).strftime("%H:%M")
 
         available_slots = []
-        for hour in range(opening_hour, min(closing_hour, 23)):  # Don't go past 23:00
-            time_slot = f"{hour:02d}:00"
+        if restaurant.total_capacity >= guests:
+            for time_slot in self._hourly_slots(restaurant):
+                if (restaurant.id, day, time_slot) not in full and time_slot != requested_time:
+                    available_slots.append(time_slot)
+                    if len(available_slots) == 3:  # Return max 3 alternatives
+                        break
+        return available_slots
+
+    def _get_full_slots(self, restaurant_ids: List[str], days: List[date],
+                        guests: int = 1) -> Set[Tuple[str, date, str]]:
+        """Get (restaurant_id, date, "HH:MM") triples whose inventory cannot seat the party on the given dates"""
+        rows = self.db.query(SlotInventory.restaurant_id, SlotInventory.date, SlotInventory.time).filter(
+            and_(
+                SlotInventory.restaurant_id.in_(restaurant_ids),
+                SlotInventory.date.in_(days),
+                SlotInventory.remaining < guests
+            )
+        ).all()
+
+        return {
+            (restaurant_id, slot_date, slot_time.strftime("%H:%M")) for restaurant_id, slot_date, slot_time in rows
+        }
+
+    def _get_slot_remaining(self, restaurant_ids: List[str], first_day: date,
+                            last_day: date) -> Dict[Tuple[str, date, str], int]:
+        """Get seats left per (restaurant_id, date, "HH:MM") for every inventory row in a date range"""
+        rows = self.db.query(
+            SlotInventory.restaurant_id, SlotInventory.date, SlotInventory.time, SlotInventory.remaining
+        ).filter(
+            and_(
+                SlotInventory.restaurant_id.in_(restaurant_ids),
+                SlotInventory.date.between(first_day, last_day)
+            )
+        ).all()
 
-            # Check if this slot is available (no existing reservations)
-            existing = self.db.query(Reservation).filter(
-                and_(
-                    Reservation.restaurant_id == restaurant_id,
-                    Reservation.date == date,
-                    Reservation.time == time_slot,
-                    Reservation.status == "confirmed"
-                )
-            ).first()
+        return {
+            (restaurant_id, slot_date, slot_time.strftime("%H:%M")): slot_remaining
+            for restaurant_id, slot_date, slot_time, slot_remaining in rows
+        }
+
+    @staticmethod
+    def _hourly_slots(restaurant: Restaurant) -> List[str]:
+        """Generate time slots (every hour from opening to closing)"""
+        opening_hour = int(restaurant.opening_time.split(':')[0])
+        closing_hour = int(restaurant.closing_time.split(':')[0])
+
+        # Don't go past 23:00
+        return [f"{hour:02d}:00" for hour in range(opening_hour, min(closing_hour, 23))]
 
-            if not existing and time_slot != requested_time:
-                available_slots.append(time_slot)
+    @staticmethod
+    def _parse_date(date_str: str) -> date:
+        """Parse a YYYY-MM-DD string"""
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
 
-        return available_slots[:3]  # Return max 3 alternatives
+    @staticmethod
+    def _parse_time(time_str: str) -> time:
+        """Parse an HH:MM string"""
+        return datetime.strptime(time_str, "%H:%M").time()
 
     def _subtract_10_minutes(self, time_str: str) -> str:
         """Subtract 10 minutes from time string"""
@@ -184,10 +621,52 @@ class RestaurantManager:
         except:
             return time_str
 
+    @timed(REPOSITORY_SECONDS, method="get_all_restaurants")
     def get_all_restaurants(self) -> List[Restaurant]:
         """Get all restaurants"""
         return self.db.query(Restaurant).filter(Restaurant.is_active == True).all()
 
+    @timed(REPOSITORY_SECONDS, method="get_catalog_terms")
+    def get_catalog_terms(self) -> List[CatalogTerm]:
+        """Distinct (city, locality, cuisine) of active restaurants"""
+        rows = self.db.query(Restaurant.city, Restaurant.locality, Restaurant.cuisine).filter(
+            Restaurant.is_active == True
+        ).distinct().order_by(Restaurant.city, Restaurant.locality, Restaurant.cuisine).all()
+        return [CatalogTerm(city=city, locality=locality, cuisine=cuisine) for city, locality, cuisine in rows]
+
+    @timed(REPOSITORY_SECONDS, method="get_restaurants_page")
+    def get_restaurants_page(self, limit: int, cursor: Optional[str] = None) -> Tuple[Sequence[Row], Optional[str]]:
+        """Get one page of active restaurants and the cursor for the next page"""
+        rows = self.db.execute(self.restaurant_listing_query(cursor).limit(limit + 1)).all()
+
+        next_cursor = self.encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    @classmethod
+    def restaurant_listing_query(cls, cursor: Optional[str] = None) -> Select:
+        """Active restaurants projected to response columns, in (rating, id) descending keyset order"""
+        query = select(*RESTAURANT_RESPONSE_COLUMNS).where(Restaurant.is_active == True)
+
+        if cursor:
+            rating, restaurant_id = cls.decode_cursor(cursor)
+            query = query.where(tuple_(Restaurant.rating, Restaurant.id) < tuple_(rating, restaurant_id))
+
+        return query.order_by(Restaurant.rating.desc(), Restaurant.id.desc())
+
+    @staticmethod
+    def encode_cursor(row: Row) -> str:
+        """Opaque cursor pointing just past a listing row"""
+        return base64.urlsafe_b64encode(json.dumps([row.rating, row.id]).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[float, str]:
+        """Parse a cursor from encode_cursor, raising ValueError if it is malformed"""
+        try:
+            rating, restaurant_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return float(rating), str(restaurant_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
     def populate_sample_restaurants(self) -> List[Restaurant]:
         """Populate database with sample restaurant data"""
         sample_restaurants = [
@@ -200,7 +679,9 @@ class RestaurantManager:
                 "rating": 4.5,
                 "total_capacity": 60,
                 "phone": "+91 22 2202 0000",
-                "email": "info@swaadkitchen.com"
+                "email": "info@swaadkitchen.com",
+                "latitude": 18.9067,
+                "longitude": 72.8147
             },
             {
                 "name": "Punjab Grill",
@@ -211,7 +692,9 @@ class RestaurantManager:
                 "rating": 4.7,
                 "total_capacity": 80,
                 "phone": "+91 22 6671 7666",
-                "email": "reservations@punjabgrill.com"
+                "email": "reservations@punjabgrill.com",
+                "latitude": 18.9946,
+                "longitude": 72.8258
             },
             {
                 "name": "Trishna",
@@ -222,7 +705,9 @@ class RestaurantManager:
                 "rating": 4.8,
                 "total_capacity": 45,
                 "phone": "+91 22 2270 3213",
-                "email": "bookings@trishna.com"
+                "email": "bookings@trishna.com",
+                "latitude": 18.9293,
+                "longitude": 72.8327
             },
             {
                 "name": "Mainland China",
@@ -233,7 +718,9 @@ class RestaurantManager:
                 "rating": 4.3,
                 "total_capacity": 70,
                 "phone": "+91 22 2640 3456",
-                "email": "bandra@mainlandchina.co.in"
+                "email": "bandra@mainlandchina.co.in",
+                "latitude": 19.0636,
+                "longitude": 72.8347
             },
             {
                 "name": "The Bombay Canteen",
@@ -244,7 +731,9 @@ class RestaurantManager:
                 "rating": 4.6,
                 "total_capacity": 90,
                 "phone": "+91 22 4966 6666",
-                "email": "hello@thebombaycanteen.com"
+                "email": "hello@thebombaycanteen.com",
+                "latitude": 19.0048,
+                "longitude": 72.8273
             },
             {
                 "name": "Dakshin",
@@ -255,7 +744,9 @@ class RestaurantManager:
                 "rating": 4.7,
                 "total_capacity": 100,
                 "phone": "+91 44 2499 4101",
-                "email": "contact@dakshinchennai.com"
+                "email": "contact@dakshinchennai.com",
+                "latitude": 13.0336,
+                "longitude": 80.2517
             },
             {
                 "name": "Paragon Restaurant",
@@ -266,7 +757,9 @@ class RestaurantManager:
                 "rating": 4.8,
                 "total_capacity": 85,
                 "phone": "+91 484 238 1432",
-                "email": "info@paragonkochi.com"
+                "email": "info@paragonkochi.com",
+                "latitude": 9.9763,
+                "longitude": 76.2836
             },
             {
                 "name": "Truffles",
@@ -277,7 +770,9 @@ class RestaurantManager:
                 "rating": 4.6,
                 "total_capacity": 75,
                 "phone": "+91 80 4146 6677",
-                "email": "info@trufflesbangalore.com"
+                "email": "info@trufflesbangalore.com",
+                "latitude": 12.9334,
+                "longitude": 77.6143
             },
             {
                 "name": "Karim's",
@@ -288,7 +783,9 @@ class RestaurantManager:
                 "rating": 4.8,
                 "total_capacity": 60,
                 "phone": "+91 11 2326 4981",
-                "email": "reservations@karimsdelhi.com"
+                "email": "reservations@karimsdelhi.com",
+                "latitude": 28.6497,
+                "longitude": 77.2338
             },
             {
                 "name": "Bawarchi",
@@ -299,7 +796,9 @@ class RestaurantManager:
                 "rating": 4.7,
                 "total_capacity": 90,
                 "phone": "+91 40 2763 9797",
-                "email": "info@bawarchihyd.com"
+                "email": "info@bawarchihyd.com",
+                "latitude": 17.4062,
+                "longitude": 78.4985
             },
             {
                 "name": "Copper Chimney",
@@ -310,7 +809,9 @@ class RestaurantManager:
                 "rating": 4.5,
                 "total_capacity": 70,
                 "phone": "+91 44 4231 4111",
-                "email": "chennai@copperchimney.in"
+                "email": "chennai@copperchimney.in",
+                "latitude": 13.0339,
+                "longitude": 80.2547
             },
             {
                 "name": "Kochi Kitchen",
@@ -321,7 +822,9 @@ class RestaurantManager:
                 "rating": 4.6,
                 "total_capacity": 80,
                 "phone": "+91 484 666 3333",
-                "email": "reservations@kochikitchen.com"
+                "email": "reservations@kochikitchen.com",
+                "latitude": 10.0261,
+                "longitude": 76.3083
             },
             {
                 "name": "Airlines Hotel",
@@ -332,7 +835,9 @@ class RestaurantManager:
                 "rating": 4.4,
                 "total_capacity": 60,
                 "phone": "+91 80 2227 6291",
-                "email": "info@airlinesbangalore.com"
+                "email": "info@airlinesbangalore.com",
+                "latitude": 12.9700,
+                "longitude": 77.5976
             },
             {
                 "name": "Dilli Haat",
@@ -343,7 +848,9 @@ class RestaurantManager:
                 "rating": 4.5,
                 "total_capacity": 50,
                 "phone": "+91 11 2611 0050",
-                "email": "contact@dillihaat.com"
+                "email": "contact@dillihaat.com",
+                "latitude": 28.5733,
+                "longitude": 77.2078
             },
             {
                 "name": "Shah Ghouse",
@@ -354,14 +861,12 @@ class RestaurantManager:
                 "rating": 4.7,
                 "total_capacity": 85,
                 "phone": "+91 40 2356 7777",
-                "email": "shahghouse@hyd.com"
+                "email": "shahghouse@hyd.com",
+                "latitude": 17.3986,
+                "longitude": 78.4158
             }
         ]
 
-        created_restaurants = []
-        for restaurant_data in sample_restaurants:
-            restaurant = RestaurantCreate(**restaurant_data)
-            db_restaurant = self.create_restaurant(restaurant)
-            created_restaurants.append(db_restaurant)
-
-        return created_restaurants
+        return self.bulk_create_restaurants(
+            [RestaurantCreate(**restaurant_data) for restaurant_data in sample_restaurants]
+        )
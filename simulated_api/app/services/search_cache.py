@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from simulated_api.app.models.pydantics import RestaurantSearchRequest, RestaurantSearchResponse
+
+CATALOG_VERSION_KEY = "catalog"
+
+
+class InMemorySearchCacheBackend:
+    """Per-process LRU with TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._versions: Dict[str, Tuple[int, float]] = {}  # key -> (version, bumped_at)
+        self._sequence = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_versions(self, keys: List[str]) -> List[int]:
+        with self._lock:
+            return [self._versions.get(key, (0, 0.0))[0] for key in keys]
+
+    async def get_sequence(self) -> int:
+        with self._lock:
+            return self._sequence
+
+    async def bump_version(self, key: str, expires: bool = True) -> None:
+        with self._lock:
+            self._sequence += 1
+            now = time.monotonic()
+            self._versions[key] = (self._sequence, now if expires else float("inf"))
+
+            if len(self._versions) > self.max_entries:
+                # Entries cached before a bump are gone after one TTL, so older bumps can be dropped
+                cutoff = now - 2 * self.ttl_seconds
+                self._versions = {k: v for k, v in self._versions.items() if v[1] >= cutoff}
+
+
+class RedisSearchCacheBackend:
+    """Shared across workers; entries and version keys expire in Redis"""
+
+    def __init__(self, redis_url: str, ttl_seconds: float, prefix: str = "search_cache"):
+        import redis.asyncio as redis  # Optional dependency, only needed for this backend
+
+        self.client = redis.Redis.from_url(redis_url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.client.get(f"{self.prefix}:entry:{key}")
+        return value.decode("utf-8") if value is not None else None
+
+    async def set(self, key: str, value: str) -> None:
+        await self.client.set(f"{self.prefix}:entry:{key}", value, ex=int(self.ttl_seconds))
+
+    async def get_versions(self, keys: List[str]) -> List[int]:
+        values = await self.client.mget([f"{self.prefix}:version:{key}" for key in keys])
+        return [int(value) if value is not None else 0 for value in values]
+
+    async def get_sequence(self) -> int:
+        value = await self.client.get(f"{self.prefix}:sequence")
+        return int(value) if value is not None else 0
+
+    async def bump_version(self, key: str, expires: bool = True) -> None:
+        # Versions come from one sequence so an expired and recreated key never repeats a value
+        version = await self.client.incr(f"{self.prefix}:sequence")
+        await self.client.set(
+            f"{self.prefix}:version:{key}", version,
+            ex=int(2 * self.ttl_seconds) if expires else None
+        )
+
+
+class SearchCache:
+    """
+    Search response cache keyed by normalized search parameters.
+
+    Each entry records the catalog version and the availability version of
+    every (restaurant, date) it returned. create_restaurant bumps the catalog
+    version and reserve_table bumps the availability version of the restaurant
+    and date it booked, so only the entries that could have changed miss.
+
+    Versions are drawn from one increasing sequence. A caller takes a
+    snapshot of it before reading the database and passes it to set, which
+    skips storing results whose versions were bumped after the snapshot, as
+    the read may predate the booking or restaurant that bumped them.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._skipped = 0
+
+    async def get(self, search_params: RestaurantSearchRequest) -> Optional[List[RestaurantSearchResponse]]:
+        raw = await self.backend.get(self._key(search_params))
+        if raw is None:
+            self._count(misses=1)
+            return None
+
+        entry = json.loads(raw)
+        current = await self.backend.get_versions(self._version_keys(search_params.date, entry["results"]))
+        if current != entry["versions"]:
+            self._count(misses=1, stale=1)
+            return None
+
+        self._count(hits=1)
+        return [RestaurantSearchResponse(**result) for result in entry["results"]]
+
+    async def snapshot(self) -> int:
+        """Version sequence to pass to set, taken before the database is read"""
+        return await self.backend.get_sequence()
+
+    async def set(self, search_params: RestaurantSearchRequest, results: List[RestaurantSearchResponse],
+                  snapshot: int) -> None:
+        dumped = [result.model_dump() for result in results]
+        versions = await self.backend.get_versions(self._version_keys(search_params.date, dumped))
+        if max(versions) > snapshot:
+            # Invalidated while the search ran, so the results may already be stale
+            self._count(skipped=1)
+            return
+        await self.backend.set(self._key(search_params), json.dumps({"versions": versions, "results": dumped}))
+
+    async def invalidate_availability(self, restaurant_id: str, date: str) -> None:
+        await self.backend.bump_version(self._availability_key(restaurant_id, date))
+
+    async def invalidate_catalog(self) -> None:
+        await self.backend.bump_version(CATALOG_VERSION_KEY, expires=False)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": type(self.backend).__name__,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale": self._stale,
+                "skipped": self._skipped,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _count(self, hits: int = 0, misses: int = 0, stale: int = 0, skipped: int = 0) -> None:
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._stale += stale
+            self._skipped += skipped
+
+    def _version_keys(self, date: str, results: List[dict]) -> List[str]:
+        return [CATALOG_VERSION_KEY] + [self._availability_key(result["id"], date) for result in results]
+
+    @staticmethod
+    def _availability_key(restaurant_id: str, date: str) -> str:
+        return f"availability:{restaurant_id}:{date}"
+
+    @staticmethod
+    def _key(search_params: RestaurantSearchRequest) -> str:
+        hour, minute = search_params.time.split(":")
+        parts = [
+            " ".join(search_params.city.casefold().split()) if search_params.city else None,
+            " ".join(search_params.locality.casefold().split()) if search_params.locality else None,
+            " ".join(search_params.cuisine.casefold().split()) if search_params.cuisine else None,
+            search_params.date,
+            f"{int(hour):02d}:{minute}",
+            search_params.limit
+        ]
+        if search_params.is_nearby:
+            # About 10 m, so requests from the same spot share an entry
+            parts += [round(search_params.latitude, 4), round(search_params.longitude, 4), search_params.radius_km]
+        return json.dumps(parts)
+
+
+def is_search_cache_enabled() -> bool:
+    return os.getenv("SEARCH_CACHE_ENABLED", "false").lower() == "true"
+
+
+_search_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """The shared search cache, or None when disabled"""
+    global _search_cache
+    if not is_search_cache_enabled():
+        return None
+
+    if _search_cache is None:
+        ttl_seconds = float(os.getenv("SEARCH_CACHE_TTL", "60"))
+        redis_url = os.getenv("SEARCH_CACHE_REDIS_URL")
+        if redis_url:
+            backend = RedisSearchCacheBackend(redis_url, ttl_seconds)
+        else:
+            backend = InMemorySearchCacheBackend(int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "10000")), ttl_seconds)
+        _search_cache = SearchCache(backend)
+
+    return _search_cache
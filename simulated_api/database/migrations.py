@@ -0,0 +1,185 @@
+"""
+Schema migrations for databases created before the typed reservation columns,
+the slot inventory, the restaurant coordinates, non-null ratings and the
+indexes added since.
+
+Run once against an existing database:
+    python -m simulated_api.database.migrations
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import Engine, String, and_, bindparam, delete, func, inspect, insert, select, text, update
+
+from simulated_api.app.services import geo
+from simulated_api.database.models import Reservation, Restaurant, SlotInventory
+from simulated_api.database.setup import engine
+
+# Tables whose date/time columns used to be stored as YYYY-MM-DD / HH:MM strings
+TYPED_TABLES = (Reservation.__table__, SlotInventory.__table__)
+# Tables whose indexes create_all does not add to existing databases
+INDEXED_TABLES = (Restaurant.__table__, Reservation.__table__, SlotInventory.__table__)
+
+
+def migrate_date_time_columns(bind: Engine = engine) -> None:
+    """Convert string date/time columns to DATE/TIME and create missing indexes"""
+    inspector = inspect(bind)
+
+    with bind.begin() as conn:
+        for table in TYPED_TABLES:
+            if not inspector.has_table(table.name):
+                continue
+
+            if bind.dialect.name == "postgresql":
+                columns = {column["name"]: column["type"] for column in inspector.get_columns(table.name)}
+                if isinstance(columns["date"], String):
+                    conn.execute(text(
+                        f"ALTER TABLE {table.name} ALTER COLUMN date TYPE DATE USING date::date"
+                    ))
+                if isinstance(columns["time"], String):
+                    conn.execute(text(
+                        f"ALTER TABLE {table.name} ALTER COLUMN time TYPE TIME USING time::time"
+                    ))
+            elif bind.dialect.name == "sqlite":
+                _rewrite_sqlite_times(conn, table.name)
+
+    # Added after typed columns, so they must exist before the indexes below
+    add_geo_columns(bind)
+    if inspector.has_table(Reservation.__tablename__):
+        # Otherwise create_all makes it empty on startup and the existing bookings are never counted
+        SlotInventory.__table__.create(bind, checkfirst=True)
+    backfill_slot_inventory(bind)
+    backfill_ratings(bind)
+
+    for table in INDEXED_TABLES:
+        if not inspector.has_table(table.name):
+            continue
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
+def add_geo_columns(bind: Engine = engine) -> None:
+    """Add the restaurant coordinate columns and (re)compute geo_cell for the current GEO_CELL_DEGREES"""
+    inspector = inspect(bind)
+    if not inspector.has_table(Restaurant.__tablename__):
+        return
+
+    existing = {column["name"] for column in inspector.get_columns(Restaurant.__tablename__)}
+    with bind.begin() as conn:
+        for column in (Restaurant.latitude, Restaurant.longitude, Restaurant.geo_cell):
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {Restaurant.__tablename__} ADD COLUMN {column.name} {column_type}"))
+
+        located = conn.execute(
+            select(Restaurant.id, Restaurant.latitude, Restaurant.longitude)
+            .where(Restaurant.latitude.is_not(None), Restaurant.longitude.is_not(None))
+        ).all()
+        if located:
+            conn.execute(
+                update(Restaurant.__table__).where(Restaurant.__table__.c.id == bindparam("restaurant_id")),
+                [{"restaurant_id": row.id, "geo_cell": geo.cell_key(row.latitude, row.longitude)} for row in located]
+            )
+
+
+def backfill_ratings(bind: Engine = engine) -> None:
+    """Rate unrated restaurants 0, as create_restaurant now does, so the (rating, id) keyset never meets NULL"""
+    inspector = inspect(bind)
+    if not inspector.has_table(Restaurant.__tablename__):
+        return
+
+    with bind.begin() as conn:
+        conn.execute(update(Restaurant.__table__).where(Restaurant.rating.is_(None)).values(rating=0.0))
+        if bind.dialect.name == "postgresql":
+            conn.execute(text(f"ALTER TABLE {Restaurant.__tablename__} ALTER COLUMN rating SET NOT NULL"))
+
+
+def backfill_slot_inventory(bind: Engine = engine) -> None:
+    """
+    Set every slot's remaining seats to its capacity minus the guests of its confirmed reservations.
+
+    Bookings made before the slot inventory existed are counted, and those at
+    times off the hourly grid (e.g. 19:30) count against the hour they fall in.
+    Rows for slots that were already oversold are clamped to 0 seats left.
+    """
+    inspector = inspect(bind)
+    if not (inspector.has_table(Reservation.__tablename__) and inspector.has_table(SlotInventory.__tablename__)):
+        return
+
+    with bind.begin() as conn:
+        booked = conn.execute(
+            select(Reservation.restaurant_id, Reservation.date, Reservation.time, func.sum(Reservation.guests),
+                   Restaurant.total_capacity)
+            .join(Restaurant, Restaurant.id == Reservation.restaurant_id)
+            .where(Reservation.status == "confirmed")
+            .group_by(Reservation.restaurant_id, Reservation.date, Reservation.time, Restaurant.total_capacity)
+        ).all()
+
+        guests_by_slot = defaultdict(int)
+        capacity = {}
+        for restaurant_id, res_date, res_time, guests, total_capacity in booked:
+            key = (restaurant_id, res_date, res_time.replace(minute=0, second=0, microsecond=0))
+            guests_by_slot[key] += guests
+            capacity[key] = total_capacity
+
+        existing = {
+            (row.restaurant_id, row.date, row.time): row.capacity
+            for row in conn.execute(select(SlotInventory.restaurant_id, SlotInventory.date, SlotInventory.time,
+                                           SlotInventory.capacity))
+        }
+
+        # Rows at off-grid times were seeded with the full capacity before bookings were kept on the grid
+        off_grid = [key for key in existing if key[2].minute or key[2].second]
+        for key in off_grid:
+            del existing[key]
+
+        updates = [
+            {"key_restaurant_id": key[0], "key_date": key[1], "key_time": key[2],
+             "remaining": max(0, existing[key] - guests_by_slot.get(key, 0))}
+            for key in existing
+        ]
+        inserts = [
+            {"restaurant_id": key[0], "date": key[1], "time": key[2], "capacity": capacity[key],
+             "remaining": max(0, capacity[key] - guests)}
+            for key, guests in guests_by_slot.items() if key not in existing
+        ]
+
+        table = SlotInventory.__table__
+        if off_grid:
+            conn.execute(
+                delete(table).where(and_(
+                    table.c.restaurant_id == bindparam("key_restaurant_id"),
+                    table.c.date == bindparam("key_date"),
+                    table.c.time == bindparam("key_time")
+                )),
+                [{"key_restaurant_id": key[0], "key_date": key[1], "key_time": key[2]} for key in off_grid]
+            )
+        if updates:
+            conn.execute(
+                update(table).where(and_(
+                    table.c.restaurant_id == bindparam("key_restaurant_id"),
+                    table.c.date == bindparam("key_date"),
+                    table.c.time == bindparam("key_time")
+                )),
+                updates
+            )
+        if inserts:
+            conn.execute(insert(table), inserts)
+
+
+def _rewrite_sqlite_times(conn, table_name: str) -> None:
+    """SQLite keeps TIME as text, so rewrite HH:MM values into the format SQLAlchemy binds"""
+    legacy_times = conn.execute(text(
+        f"SELECT DISTINCT time FROM {table_name} WHERE length(time) <= 5"
+    )).scalars().all()
+
+    for legacy_time in legacy_times:
+        parsed = datetime.strptime(legacy_time, "%H:%M").time()
+        conn.execute(
+            text(f"UPDATE {table_name} SET time = :new_time WHERE time = :old_time"),
+            {"new_time": parsed.strftime("%H:%M:%S.%f"), "old_time": legacy_time}
+        )
+
+
+if __name__ == "__main__":
+    migrate_date_time_columns()
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import (
+    Column, Integer, String, Float, Date, DateTime, Time, ForeignKey, Boolean, Text, CheckConstraint, Index
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from simulated_api.database.setup import Base
@@ -6,6 +8,9 @@ from simulated_api.database.setup import Base
 
 class Restaurant(Base):
     __tablename__ = "restaurants"
+    __table_args__ = (
+        Index("ix_restaurants_rating_id", "rating", "id"),  # Keyset pagination order
+    )
 
     id = Column(String, primary_key=True, index=True)
     name = Column(String(200), nullable=False, index=True)
@@ -13,28 +18,35 @@ class Restaurant(Base):
     city = Column(String(100), nullable=False, index=True)
     locality = Column(String(100), nullable=False, index=True)
     cuisine = Column(String(100), nullable=False, index=True)
-    rating = Column(Float, default=0.0)
+    rating = Column(Float, nullable=False, default=0.0)  # Keyset pagination compares it, so never NULL
     total_capacity = Column(Integer, default=50)
     vacancy = Column(Integer, default=50)  # Available seats
     phone = Column(String(20))
     email = Column(String(100))
     opening_time = Column(String(5), default="09:00")  # HH:MM format
     closing_time = Column(String(5), default="23:00")  # HH:MM format
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geo_cell = Column(String(32), index=True)  # Grid cell of (latitude, longitude), see services.geo
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationship
     reservations = relationship("Reservation", back_populates="restaurant")
+    slot_inventory = relationship("SlotInventory", back_populates="restaurant")
 
 
 class Reservation(Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        Index("ix_reservations_restaurant_date_time_status", "restaurant_id", "date", "time", "status"),
+    )
 
     id = Column(String, primary_key=True, index=True)
     restaurant_id = Column(String, ForeignKey("restaurants.id"), nullable=False)
-    date = Column(String(10), nullable=False)  # YYYY-MM-DD
-    time = Column(String(5), nullable=False)  # HH:MM
+    date = Column(Date, nullable=False)
+    time = Column(Time, nullable=False)
     guests = Column(Integer, nullable=False)
     user_name = Column(String(100), nullable=False)
     user_phone = Column(String(20), nullable=False)
@@ -45,4 +57,21 @@ class Reservation(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationship
-    restaurant = relationship("Restaurant", back_populates="reservations")
\ No newline at end of file
+    restaurant = relationship("Restaurant", back_populates="reservations")
+
+
+class SlotInventory(Base):
+    __tablename__ = "slot_inventory"
+    __table_args__ = (
+        CheckConstraint("remaining >= 0", name="ck_slot_inventory_remaining"),
+    )
+
+    restaurant_id = Column(String, ForeignKey("restaurants.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    time = Column(Time, primary_key=True)
+    capacity = Column(Integer, nullable=False)
+    remaining = Column(Integer, nullable=False)  # Seats left in this slot
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationship
+    restaurant = relationship("Restaurant", back_populates="slot_inventory")
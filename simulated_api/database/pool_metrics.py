@@ -0,0 +1,108 @@
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """Checkout wait histogram and timeout counter for one connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._bucket_counts = [0] * (len(WAIT_BUCKETS) + 1)
+        self._wait_sum = 0.0
+        self._wait_count = 0
+        self._timeouts = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._bucket_counts[self._bucket_index(seconds)] += 1
+            self._wait_sum += seconds
+            self._wait_count += 1
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Live pool state plus the wait histogram (cumulative, Prometheus style).
+
+        Pools left uninstrumented, such as SQLite's, report no wait histogram
+        or timeouts, since all zeros would read as "never waited".
+        """
+        stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+        if isinstance(pool, _InstrumentedPoolMixin):
+            with self._lock:
+                cumulative: List[int] = []
+                running = 0
+                for count in self._bucket_counts:
+                    running += count
+                    cumulative.append(running)
+
+                stats.update({
+                    "wait_seconds": {
+                        "buckets": {str(bound): cumulative[i] for i, bound in enumerate(WAIT_BUCKETS)} | {
+                            "+Inf": cumulative[-1]
+                        },
+                        "count": self._wait_count,
+                        "sum": round(self._wait_sum, 6)
+                    },
+                    "timeouts": self._timeouts
+                })
+
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow()
+            })
+        else:
+            stats["status"] = pool.status()
+
+        return stats
+
+    @staticmethod
+    def _bucket_index(seconds: float) -> int:
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if seconds <= bound:
+                return i
+        return len(WAIT_BUCKETS)
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout, including the wait for a free connection"""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        # Keep metrics across pool recreation (engine.dispose, invalidation)
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
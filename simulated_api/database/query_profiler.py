@@ -0,0 +1,161 @@
+import contextvars
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from sqlalchemy import Engine, event
+
+# Count statements per request and return them in X-DB-Statements / X-DB-Time-Ms
+QUERY_PROFILING_ENABLED = os.getenv("QUERY_PROFILING_ENABLED", "false").lower() == "true"
+# Statements at least this slow are logged with parameters and call site (negative disables)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# Most statements each repository operation may issue, checked by assert_max_statements
+# callers and benchmarks.api_benchmark --check-budgets
+STATEMENT_BUDGETS = {
+    "search_restaurants": 2,  # Candidates, then one grouped availability query
+    "reserve_table": 5,  # Restaurant, slot upsert, conditional claim, reservation insert, refresh
+    # Text searches: one UNION ALL of every search's candidates, one availability query for all dates
+    "search_restaurants_batch": 2,
+    # Batch of 10 (as benchmarked): restaurants, slot upsert, a claim each, one reservation insert,
+    # and one inventory read when any reservation is not seated
+    "reserve_tables": 14,
+    "availability_calendar": 2,  # Restaurants, then one inventory query for the whole date range
+    "listing.first_page": 1,
+    "listing.cursor_page": 1,
+}
+
+_APP_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+_REPO_ROOT = os.path.dirname(os.path.dirname(_APP_ROOT))
+_PARAMETERS_LOG_LENGTH = 500
+
+
+class QueryStats:
+    """Statements and database time seen while it was active"""
+
+    def __init__(self, record_statements: bool = False):
+        self.statements = 0
+        self.seconds = 0.0
+        self.recorded: Optional[List[str]] = [] if record_statements else None
+        self._lock = threading.Lock()
+
+    def add(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.statements += 1
+            self.seconds += seconds
+            if self.recorded is not None:
+                self.recorded.append(statement)
+
+
+# Stats of the request being served; copied into the greenlets run_sync spawns
+_request_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "query_profiler_request_stats", default=None
+)
+# Process-wide collectors, which also see statements from other threads (e.g. a TestClient's app)
+_collectors: List[QueryStats] = []
+_collectors_lock = threading.Lock()
+
+
+def install(bind: Engine) -> None:
+    """Attach the statement hooks to an engine; safe to call more than once"""
+    if event.contains(bind, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+    event.listen(bind, "after_cursor_execute", _after_cursor_execute)
+    event.listen(bind, "handle_error", _handle_error)
+
+
+@contextmanager
+def track_request() -> Iterator[QueryStats]:
+    """Count the statements issued by the current request, including its run_sync calls"""
+    stats = QueryStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+@contextmanager
+def profile_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """Count every statement issued in the process while the block runs"""
+    stats = QueryStats(record_statements)
+    with _collectors_lock:
+        _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        with _collectors_lock:
+            _collectors.remove(stats)
+
+
+@contextmanager
+def assert_max_statements(limit: int, label: str = "block", *binds: Engine) -> Iterator[QueryStats]:
+    """
+    Fail with AssertionError when the block issues more than limit statements.
+
+    For tests guarding against N+1 regressions, e.g.
+
+        with assert_max_statements(STATEMENT_BUDGETS["search_restaurants"], "search", engine):
+            client.post("/api/v1/restaurants/search", json=params)
+
+    Engines passed in are instrumented first, so profiling need not be enabled.
+    """
+    for bind in binds:
+        install(bind)
+
+    with profile_queries(record_statements=True) as stats:
+        yield stats
+
+    if stats.statements > limit:
+        listing = "\n".join(f"  {i}. {' '.join(statement.split())}" for i, statement in enumerate(stats.recorded, 1))
+        raise AssertionError(f"{label} issued {stats.statements} SQL statements, budget is {limit}:\n{listing}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._profiler_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _observe(statement, parameters, context)
+
+
+def _handle_error(exception_context) -> None:
+    # Failed statements still cost a round trip
+    if exception_context.statement is not None:
+        _observe(exception_context.statement, exception_context.parameters, exception_context.execution_context)
+
+
+def _observe(statement: str, parameters, context) -> None:
+    started = getattr(context, "_profiler_started", None)
+    if started is None:
+        return
+    context._profiler_started = None
+    elapsed = time.perf_counter() - started
+
+    request_stats = _request_stats.get()
+    if request_stats is not None:
+        request_stats.add(statement, elapsed)
+    if _collectors:
+        with _collectors_lock:
+            collectors = list(_collectors)
+        for stats in collectors:
+            stats.add(statement, elapsed)
+
+    if 0 <= SLOW_QUERY_MS <= elapsed * 1000:
+        print(
+            f"Slow query ({elapsed * 1000:.1f} ms) at {_call_site()}: {' '.join(statement.split())} "
+            f"parameters={repr(parameters)[:_PARAMETERS_LOG_LENGTH]}"
+        )
+
+
+def _call_site() -> str:
+    """Innermost application frame that led to the statement"""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(_APP_ROOT):
+            return f"{os.path.relpath(frame.filename, _REPO_ROOT)}:{frame.lineno} in {frame.name}"
+    return "unknown"
@@ -1,18 +1,84 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
+from simulated_api.database import query_profiler
+from simulated_api.database.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, PoolMetrics
+
 load_dotenv()
 
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """Swap the sync driver in a database URL for its async counterpart"""
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(hide_password=False)
+
+
 # Database URL
 DATABASE_URL = os.getenv("DATABASE_URL")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+# Connection pool configuration
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds, -1 disables
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+
+def pool_options(database_url: str, is_async: bool = False) -> dict:
+    """Engine pool arguments; SQLite keeps the dialect's own, uninstrumented pool since sizing does not apply"""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {"pool_pre_ping": DB_POOL_PRE_PING}
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
 
 # SQLAlchemy setup
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine for the request path; objects stay loaded after commit so they
+# can be serialized outside the session's greenlet
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL, is_async=True))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Pool metrics, keyed by engine
+POOL_METRICS = {
+    "sync": (engine, PoolMetrics("sync")),
+    "async": (async_engine.sync_engine, PoolMetrics("async")),
+}
+for _engine, _metrics in POOL_METRICS.values():
+    _engine.pool.metrics = _metrics
+
+# Statement counting and slow query log, opt-in
+if query_profiler.QUERY_PROFILING_ENABLED:
+    query_profiler.install(engine)
+    query_profiler.install(async_engine.sync_engine)
+
+
+def get_pool_stats() -> dict:
+    """Live statistics for every connection pool"""
+    return {name: metrics.snapshot(pool_engine.pool) for name, (pool_engine, metrics) in POOL_METRICS.items()}
+
 
 def get_db():
     """Dependency to get database session"""
@@ -22,3 +88,11 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    db: AsyncSession = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,28 @@
+import os
+
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+HUB_PROMPT = "hwchase17/openai-functions-agent"
+
+
+def get_agent_prompt() -> ChatPromptTemplate:
+    """
+    Prompt for the openai-functions agent.
+
+    Bundled copy of the hwchase17/openai-functions-agent hub prompt, so building
+    the agent needs no network call. Set AGENT_PROMPT_FROM_HUB=true to pull the
+    latest hub version instead; the bundled copy is used if the pull fails.
+    """
+    if os.getenv("AGENT_PROMPT_FROM_HUB", "false").lower() == "true":
+        try:
+            from langchain import hub
+            return hub.pull(HUB_PROMPT)
+        except Exception as e:
+            print(f"Could not pull {HUB_PROMPT}, using the bundled prompt: {e}")
+
+    return ChatPromptTemplate.from_messages([
+        ("system", "You are a helpful assistant"),
+        MessagesPlaceholder("chat_history", optional=True),
+        ("human", "{input}"),
+        MessagesPlaceholder("agent_scratchpad"),
+    ])